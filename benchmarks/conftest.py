@@ -0,0 +1,46 @@
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+
+import pytest
+import pandas as pd
+
+pd.set_option('mode.chained_assignment', None)
+
+
+def _copy(value: Any) -> Any:
+    return value.copy() if isinstance(value, pd.DataFrame) else value
+
+
+@pytest.fixture
+def measure(benchmark):
+    '''
+    Benchmarks func against fresh copies of any frames in args (as some helpers
+    change the frame in place) and records the throughput in rows per second
+    and the peak memory allocated by a single call in the extra info.
+
+    With --benchmark-disable, func is only called once (as a smoke test)
+    so there are no timings and the memory is not traced either.
+    '''
+    def _measure(rows: int, func: Callable, *args, rounds: int = 3, **kwargs) -> Any:
+        def setup() -> Tuple[Tuple, Dict[str, Any]]:
+            return tuple(_copy(arg) for arg in args), kwargs
+
+        benchmark.extra_info['rows'] = rows
+        if benchmark.disabled:
+            return benchmark.pedantic(func, setup=setup, rounds=1, iterations=1)
+
+        copied, _ = setup()
+        tracemalloc.start()
+        try:
+            result = func(*copied, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        benchmark.pedantic(func, setup=setup, rounds=rounds, iterations=1)
+        benchmark.extra_info['peak_bytes'] = peak
+        if benchmark.stats is not None:
+            benchmark.extra_info['rows_per_second'] = round(rows / benchmark.stats.stats.mean)
+        return result
+
+    return _measure
@@ -0,0 +1,97 @@
+import string
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+_dtypes = {
+    'int': 'int32',
+    'float': 'float32',
+    'str': 'str',
+    'bool': 'bool',
+    'date': 'datetime64',
+}
+
+
+def generate(
+        rows: int = 10_000,
+        columns: int = 10,
+        dtypes: Tuple[str, ...] = ('int', 'float', 'str', 'bool', 'date'),
+        na_ratio: float = 0.1,
+        key_fields: int = 1,
+        edges: int = 2,
+        csv_edges: int = 1,
+        csv_fan_out: int = 3,
+        override_edge_name: bool = False,
+        seed: int = 0) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    '''
+    Generates a horizontal frame and the configuration for it.
+
+    The frame has key_fields subject columns, edges edge columns (of which
+    csv_edges hold csv_fan_out comma separated values) and columns data fields
+    cycling through dtypes, with na_ratio of the non bool values missing.
+    The same seed always generates the same frame.
+    '''
+    if rows <= 0:
+        raise ValueError('rows')
+    if key_fields <= 0:
+        raise ValueError('key_fields')
+    if csv_edges > edges:
+        raise ValueError('csv_edges must not be more than edges')
+
+    random = np.random.default_rng(seed)
+    data: Dict[str, Any] = {}
+    type_overrides: Dict[str, str] = {}
+
+    subject_fields = [f'key_{i}' for i in range(key_fields)]
+    for i, field in enumerate(subject_fields):
+        data[field] = np.arange(rows) if i == 0 else random.integers(0, 10, rows)
+
+    edge_fields = [f'edge_{i}' for i in range(edges)]
+    for i, field in enumerate(edge_fields):
+        targets = random.integers(0, max(rows // 10, 1), (rows, csv_fan_out if i < csv_edges else 1))
+        data[field] = [','.join(str(target) for target in row) for row in targets]
+
+    for i in range(columns):
+        kind = dtypes[i % len(dtypes)]
+        field = f'{kind}_{i}'
+        if kind == 'int':
+            values = pd.Series(random.integers(0, 1_000_000, rows)).astype('Int32')
+        elif kind == 'float':
+            values = pd.Series(random.random(rows) * 1000)
+        elif kind == 'str':
+            letters = np.array(list(string.ascii_letters + ' '))
+            values = pd.Series([''.join(word) for word in random.choice(letters, (rows, 12))])
+        elif kind == 'bool':
+            values = pd.Series(random.random(rows) > 0.5)
+        elif kind == 'date':
+            values = pd.Series(pd.Timestamp('2000-01-01') + pd.to_timedelta(random.integers(0, 10_000, rows), unit='D'))
+        else:
+            raise ValueError(f'Unknown dtype {kind}')
+
+        if na_ratio and kind != 'bool':
+            values[random.random(rows) < na_ratio] = None
+        data[field] = values
+        type_overrides[field] = 'Int32' if kind == 'int' else _dtypes[kind]
+
+    file_config: Dict[str, Any] = {
+        'subject_fields': subject_fields,
+        'edge_fields': edge_fields,
+        'csv_edges': edge_fields[:csv_edges],
+        'type_overrides': type_overrides,
+    }
+    if override_edge_name and edge_fields:
+        file_config['override_edge_name'] = {edge_fields[-1]: {'predicate': 'related', 'target_node_type': 'synthetic'}}
+
+    config = {'transform': 'horizontal', 'files': {'synthetic': file_config}}
+    return pd.DataFrame(data), config
+
+
+def to_vertical(frame: pd.DataFrame, config: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    '''
+    Melts a generated frame into the vertical form and
+    returns the matching vertical configuration.
+    '''
+    subject_fields = config['files']['synthetic']['subject_fields']
+    vertical = frame.melt(id_vars=subject_fields, var_name='predicate', value_name='object')
+    return vertical, {**config, 'transform': 'vertical'}
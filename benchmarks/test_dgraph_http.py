@@ -0,0 +1,28 @@
+import pytest
+
+from dgraphpandas.dgraph_stub import DgraphStub
+from dgraphpandas.strategies.horizontal import horizontal_transform
+from dgraphpandas.writers.dgraph_http import DgraphHttpSink
+from dgraphpandas.writers.upserts import generate_upserts
+from benchmarks.synthetic import generate
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.fixture(scope='module')
+def statements():
+    frame, config = generate(rows=2_000, columns=5)
+    intrinsic, edges = horizontal_transform(frame, config, 'synthetic')
+    intrinsic_upserts, edges_upserts = generate_upserts(intrinsic, edges)
+    return intrinsic_upserts + edges_upserts
+
+
+@pytest.mark.parametrize('batch_size, concurrency', [(1000, 1), (1000, 4), (5000, 4)])
+def test_dgraph_http_sink(measure, statements, batch_size, concurrency):
+    '''
+    Times sending the statements to the local Dgraph stand in
+    for each batch size and concurrency
+    '''
+    with DgraphStub() as stub:
+        with DgraphHttpSink(stub.address, batch_size=batch_size, concurrency=concurrency) as sink:
+            measure(len(statements), sink.send, statements)
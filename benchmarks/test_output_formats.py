@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+from dgraphpandas.rdf import to_rdf
+from benchmarks.synthetic import generate
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.mark.parametrize('output_format', ['rdf', 'json', 'bulk', 'dql'])
+def test_output_format(measure, tmp_path, output_format):
+    '''
+    Times the full conversion of a synthetic file to exports in each output format
+    '''
+    frame, config = generate(rows=2_000, key_fields=2, csv_fan_out=5)
+    path = os.path.join(tmp_path, 'synthetic.csv')
+    frame.to_csv(path, index=False)
+    config['files']['synthetic']['read_csv_options'] = {'dtype': {col: 'object' for col in frame.columns if col.startswith('str_')}}
+
+    measure(len(frame), to_rdf, path, config, 'synthetic', str(tmp_path), export_rdf=True, output_format=output_format)
@@ -0,0 +1,45 @@
+import pytest
+
+from dgraphpandas.strategies.horizontal import horizontal_transform
+from dgraphpandas.strategies.vertical import vertical_transform
+from dgraphpandas.writers.upserts import generate_upserts
+from benchmarks.synthetic import generate, to_vertical
+
+pytest.importorskip('pytest_benchmark')
+
+_shapes = {
+    'narrow': {'rows': 2_000, 'columns': 5},
+    'wide': {'rows': 400, 'columns': 50},
+    'composite_keys': {'rows': 2_000, 'columns': 5, 'key_fields': 3},
+    'csv_fan_out': {'rows': 1_000, 'columns': 5, 'edges': 3, 'csv_edges': 2, 'csv_fan_out': 10},
+    'sparse': {'rows': 2_000, 'columns': 10, 'na_ratio': 0.6},
+    'override_edge_name': {'rows': 2_000, 'columns': 5, 'override_edge_name': True},
+}
+
+
+@pytest.mark.parametrize('shape', _shapes)
+def test_horizontal_transform(measure, shape):
+    '''
+    Times the horizontal transform for each synthetic shape
+    '''
+    frame, config = generate(**(_shapes[shape]))
+    measure(len(frame), horizontal_transform, frame, config, 'synthetic')
+
+
+@pytest.mark.parametrize('shape', _shapes)
+def test_vertical_transform(measure, shape):
+    '''
+    Times the vertical transform for each synthetic shape
+    '''
+    frame, config = to_vertical(*generate(**(_shapes[shape])))
+    measure(len(frame), vertical_transform, frame, config, 'synthetic')
+
+
+@pytest.mark.parametrize('shape', _shapes)
+def test_generate_upserts(measure, shape):
+    '''
+    Times generating the upserts from the transformed frames for each synthetic shape
+    '''
+    frame, config = generate(**(_shapes[shape]))
+    intrinsic, edges = horizontal_transform(frame, config, 'synthetic')
+    measure(len(intrinsic) + len(edges), generate_upserts, intrinsic, edges)
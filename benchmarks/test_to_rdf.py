@@ -0,0 +1,51 @@
+import os
+
+import pytest
+import pandas as pd
+
+from dgraphpandas.config import _get_config
+from dgraphpandas.rdf import to_rdf
+from benchmarks.synthetic import generate
+
+pytest.importorskip('pytest_benchmark')
+
+_samples = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'samples')
+
+'''
+The netflix and pokemon inputs are downloaded by the samples
+input/download_data.sh so they are skipped until they have been.
+'''
+_sample_files = [
+    ('planets', 'planet', 'solar_system.csv'),
+    ('netflix', 'title', os.path.join('input', 'netflix_titles.csv')),
+    ('pokemon', 'pokemon_species', os.path.join('input', 'pokemon_species.csv')),
+    ('pokemon', 'pokemon', os.path.join('input', 'pokemon.csv')),
+]
+
+
+@pytest.mark.parametrize('sample, config_key, file_name', _sample_files)
+def test_to_rdf_sample(measure, tmp_path, sample, config_key, file_name):
+    '''
+    Times the full conversion of each sample file to exports
+    '''
+    path = os.path.join(_samples, sample, file_name)
+    if not os.path.exists(path):
+        pytest.skip(f'{path} has not been downloaded')
+
+    config = _get_config(os.path.join(_samples, sample, 'dgraphpandas.json'))
+    rows = sum(1 for _ in open(path, 'rb')) - 1
+    measure(rows, to_rdf, path, config, config_key, str(tmp_path), export_rdf=True)
+
+
+@pytest.mark.parametrize('rows', [2_000, 10_000])
+def test_to_rdf_synthetic(measure, tmp_path, rows):
+    '''
+    Times the full conversion of a synthetic file to exports
+    '''
+    frame, config = generate(rows=rows, key_fields=2, csv_fan_out=5)
+    path = os.path.join(tmp_path, 'synthetic.csv')
+    frame.to_csv(path, index=False)
+    config['files']['synthetic']['read_csv_options'] = {'dtype': {col: 'object' for col in frame.columns if col.startswith('str_')}}
+
+    measure(rows, to_rdf, path, config, 'synthetic', str(tmp_path), export_rdf=True)
+    assert len(pd.read_csv(path, usecols=['key_0'])) == rows
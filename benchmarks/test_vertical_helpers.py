@@ -0,0 +1,71 @@
+import pytest
+import pandas as pd
+
+from dgraphpandas.strategies.vertical_helpers import (_expand_csv_edges, _join_key_fields, _add_dgraph_type_records,
+                                                      _break_up_intrinsic_and_edges, _apply_rdf_types, _format_date_fields,
+                                                      _remove_illegal_rdf_characters, _remove_na_objects, _override_edge_name,
+                                                      _ignore_fields, _rename_fields, _compile_illegal_characters_regex)
+from benchmarks.synthetic import generate, to_vertical
+
+pytest.importorskip('pytest_benchmark')
+
+ROWS = 2_000
+
+_stages = [
+    'rename_fields',
+    'ignore_fields',
+    'expand_csv_edges',
+    'join_key_fields',
+    'add_dgraph_type_records',
+    'break_up_intrinsic_and_edges',
+    'apply_rdf_types',
+    'format_date_fields',
+    'remove_illegal_rdf_characters_subject',
+    'remove_illegal_rdf_characters_object',
+    'remove_na_objects',
+    'override_edge_name',
+]
+
+
+@pytest.fixture(scope='module')
+def stage_inputs():
+    '''
+    Runs the synthetic frame through every helper in the order of the vertical
+    transform, keeping the arguments each helper was called with.
+    '''
+    frame, config = generate(rows=ROWS, key_fields=2, override_edge_name=True)
+    frame, config = to_vertical(frame, config)
+    file_config = config['files']['synthetic']
+    illegal_characters = _compile_illegal_characters_regex(['%', '\\.', '\\s', '\"', '\\n', '\\r\\n'])
+    illegal_characters_intrinsic_object = _compile_illegal_characters_regex(['\"', '\\n', '\\r\\n'])
+
+    inputs = {}
+
+    def run(stage, func, *args):
+        inputs[stage] = (func, args)
+        return func(*(arg.copy() if isinstance(arg, pd.DataFrame) else arg for arg in args))
+
+    frame = run('rename_fields', _rename_fields, frame, {'str_2': 'name'})
+    frame = run('ignore_fields', _ignore_fields, frame, ['str_7'])
+    frame = run('expand_csv_edges', _expand_csv_edges, frame, file_config['csv_edges'])
+    frame = run('join_key_fields', _join_key_fields, frame, file_config['subject_fields'], '_', 'synthetic')
+    frame = run('add_dgraph_type_records', _add_dgraph_type_records, frame, True, 'synthetic')
+    intrinsic, edges = run('break_up_intrinsic_and_edges', _break_up_intrinsic_and_edges, frame, file_config['edge_fields'])
+    intrinsic = run('apply_rdf_types', _apply_rdf_types, intrinsic, file_config['type_overrides'])
+    intrinsic = run('format_date_fields', _format_date_fields, intrinsic, {})
+    intrinsic = run('remove_illegal_rdf_characters_subject', _remove_illegal_rdf_characters, intrinsic, illegal_characters, 'subject')
+    intrinsic = run('remove_illegal_rdf_characters_object', _remove_illegal_rdf_characters, intrinsic, illegal_characters_intrinsic_object, 'object')
+    intrinsic = run('remove_na_objects', _remove_na_objects, intrinsic, True)
+    run('override_edge_name', _override_edge_name, edges, file_config['override_edge_name'], '_')
+
+    return inputs
+
+
+@pytest.mark.parametrize('stage', _stages)
+def test_vertical_helper(measure, stage_inputs, stage):
+    '''
+    Times each vertical helper against the frame it
+    receives in the vertical transform
+    '''
+    func, args = stage_inputs[stage]
+    measure(len(args[0]), func, *args)
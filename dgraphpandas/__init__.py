@@ -2,4 +2,25 @@ __name__ = 'dgraphpandas'
 __version__ = '0.1.5'
 __description__ = 'Transform Pandas DataFrames into Exports to be sent to DGraph'
 
-from dgraphpandas.rdf import to_rdf  # noqa
+'''
+Pandas is slow to import so the public api is imported on first access.
+This keeps `import dgraphpandas` and the command line help/version cheap.
+'''
+_lazy_attributes = {
+    'to_rdf': 'dgraphpandas.rdf',
+    'Transformer': 'dgraphpandas.strategies.transformer',
+}
+
+
+def __getattr__(name: str):
+    if name in _lazy_attributes:
+        import importlib
+        value = getattr(importlib.import_module(_lazy_attributes[name]), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + list(_lazy_attributes.keys()))
@@ -1,30 +1,83 @@
 import sys
 import os
 import logging
+import json
 import argparse
 
-import pandas as pd
+from dgraphpandas import __version__, __description__
+from dgraphpandas.config import _get_config
 
-from dgraphpandas import __version__, __description__, to_rdf
-from dgraphpandas.strategies.schema import create_schema
-from dgraphpandas.writers.schema import generate_schema
-from dgraphpandas.writers.types import generate_types
+'''
+Pandas and the transforms/writers are only imported once the arguments have been
+parsed and checked, and only the modules of the method being run, so --help, --version
+and bad arguments return quickly. Every method itself needs pandas.
+'''
 
-pd.set_option('mode.chained_assignment', None)
+
+def _import_pandas():
+    '''
+    Every method reads, converts or reports with pandas. serve and watch
+    only convert in their worker processes, which inherit this option.
+    '''
+    import pandas as pd
+    pd.set_option('mode.chained_assignment', None)
 
 
 def main():
     parser = argparse.ArgumentParser(description=__description__)
-    parser.add_argument('-x', '--method', choices=['upserts', 'schema', 'types'], default='upserts')
+    parser.add_argument(
+        '-x', '--method', choices=['upserts', 'schema', 'types', 'diff', 'validate', 'infer', 'advise', 'serve', 'watch', 'stream', 'load'], default='upserts')
     parser.add_argument('-f', '--file', required=False, help='The Data File (CSV) to convert into RDF.')
-    parser.add_argument('-c', '--config', required=True, help='The DgraphPandas Configuration. See Documentation for options/examples.')
+    parser.add_argument('--previous_file', required=False, help='The previous snapshot of the Data File (CSV) to compare against in diff mode.')
+    parser.add_argument('-c', '--config', required=False, help='The DgraphPandas Configuration. See Documentation for options/examples.')
     parser.add_argument('-ck', '--config_file_key', required=False, help='The Entry in the Configuration to use for this passed file.')
     parser.add_argument('-o', '--output_dir', default='.', help='The output directory to write files.')
+    parser.add_argument('--filter_dangling_edges', action='store_true', default=False, help='Remove edges which target an xid not produced by any export.')
+    parser.add_argument('--two_phase_schema', action='store_true', default=False, help='Write a load schema without indexes and a post load schema which adds them.')
+    parser.add_argument('--existing_schema', help='An existing schema (or Dgraph schema export) to diff against so only changed predicates are altered.')
     parser.add_argument('--console', action='store_true', default=False, help='Write the Preprocessed DataFrames to console (for debugging)')
     parser.add_argument('--export_csv', action='store_true', default=False, help='Write the Preprocessed DataFrame to CSV (for debugging)')
     parser.add_argument('--encoding', default=os.environ.get('DGRAPHPANDAS_ENCODING', 'utf-8'), help='The Encoding to write files.')
     parser.add_argument('--chunk_size', default=10_000_000, type=int, help='Process and output in chunks rather all at once')
     parser.add_argument('--gz_compression_level', default=9, type=int, help='Compression level to set output gzip files to')
+    parser.add_argument('--incremental_state', help='State store (sqlite) used to only export new or changed records since the last run.')
+    parser.add_argument('--dedup', action='store_true', default=False, help='Remove duplicate statements across chunks.')
+    parser.add_argument('--dedup_memory_limit', type=int, help='Bytes of statement hashes to hold in memory before spilling to disk.')
+    parser.add_argument('--memory_limit', type=int, help='Bytes of memory to stay under by adapting the rows read in each chunk (up to chunk_size).')
+    parser.add_argument('--spill_rows', type=int, help='Partition a chunk on disk by subject when it would expand beyond this many rows.')
+    parser.add_argument('--spill_dir', help='The directory to write spilled partitions to (defaults to the temp directory).')
+    parser.add_argument('--dedup_dir', help='Directory to keep spilled statement hashes in so that duplicates are removed across runs.')
+    parser.add_argument('--address', default=os.environ.get('DGRAPHPANDAS_ADDRESS', 'dgraphpandas.sock'), help='Unix socket path or host:port for serve mode.')
+    parser.add_argument('--serve_workers', default=0, type=int, help='Run serve mode jobs in a pool of this many processes.')
+    parser.add_argument('--watch_dir', help='The landing directory to watch for new files in watch mode.')
+    parser.add_argument('--watch_workers', type=int, help='The maximum number of files to convert concurrently in watch mode.')
+    parser.add_argument('--watch_ledger', help='The ledger (sqlite) of processed files in watch mode.')
+    parser.add_argument('--stream_format', choices=['csv', 'jsonl'], help='The format of the input in stream mode.')
+    parser.add_argument('--stream_batch_rows', type=int, help='The maximum rows in each batch in stream mode.')
+    parser.add_argument('--stream_batch_seconds', type=float, help='Cut a batch once this many seconds have passed since its first row in stream mode.')
+    parser.add_argument('--stream_flush_seconds', type=float, help='Write the exports every this many seconds in stream mode.')
+    parser.add_argument('--metrics_file', help='Append throughput metrics for every chunk to this file as JSON lines.')
+    parser.add_argument('--metrics_prometheus_file', help='Write throughput totals to this file in the Prometheus text format.')
+    parser.add_argument('--dgraph_address', help='Send upserts straight to this Dgraph alpha HTTP address (e.g http://localhost:8080) instead of writing exports.')
+    parser.add_argument('--dgraph_batch_size', type=int, help='Statements in each mutation sent to Dgraph.')
+    parser.add_argument('--dgraph_concurrency', type=int, help='Mutations in flight to Dgraph at once.')
+    parser.add_argument('--subject_batches', action='store_true', default=False,
+                        help='Keep the statements of each subject together in batches, with a disjoint set of subjects for each loader worker.')
+    parser.add_argument('--subject_batch_size', type=int, help='The statements in each subject batch.')
+    parser.add_argument('--subject_batch_workers', type=int, help='The loader workers (exports) to split subjects between.')
+    parser.add_argument('--output_format', choices=['rdf', 'json', 'bulk', 'dql'],
+                        help='Write the exports as RDF upserts (default), Dgraph JSON mutations, blank node RDF with a schema for dgraph bulk or DQL upsert blocks.')
+    parser.add_argument('--dql_batch_size', type=int, help='The subjects in each upsert block when the output_format is dql.')
+    parser.add_argument('--json_batch_size', type=int, help='The mutation objects in each JSON array when the output_format is json.')
+    parser.add_argument('--shards', type=int, help='Route statements by a stable hash of their subject into this many shard_<k> export directories, '
+                        'or with bulk cut them into this many evenly sized files.')
+    parser.add_argument('--manifest', action='store_true', default=False, help='Record every export written in the manifest.jsonl of the output_dir.')
+    parser.add_argument('--loader_command', help='The command run for every export in load mode, with {file} and {format} replaced.')
+    parser.add_argument('--loader_workers', type=int, help='The loader processes to run at once in load mode.')
+    parser.add_argument('--loader_retries', type=int, help='The times to retry an export which fails to load in load mode.')
+    parser.add_argument('--schema_file', action='append', help='A schema (or types) file to apply to the dgraph_address before loading. Can be repeated.')
+    parser.add_argument('--profile', action='store_true', default=False, help='Print the time and rows of every transform stage.')
+    parser.add_argument('--profile_dir', help='With --profile, write the cProfile stats of every stage to this directory.')
     parser.add_argument('--key_separator')
     parser.add_argument('--add_dgraph_type_records', default=True)
     parser.add_argument('--drop_na_intrinsic_objects', default=True)
@@ -37,6 +90,8 @@ def main():
                         default=os.environ.get('DGRAPHPANDAS_LOG', 'INFO'))
 
     args = parser.parse_args(sys.argv[1:])
+    if args.config is None and args.method not in ('validate', 'serve', 'load'):
+        parser.error('the following arguments are required: -c/--config')
 
     logging.basicConfig(level=args.verbosity)
     logger = logging.getLogger(__name__)
@@ -58,25 +113,158 @@ def main():
         'illegal_characters_intrinsic_object': args.illegal_characters_intrinsic_object,
         'console': args.console,
         'export_csv': args.export_csv,
-        'chunk_size': args.chunk_size
+        'chunk_size': args.chunk_size,
+        'incremental_state': args.incremental_state,
+        'dedup': args.dedup,
+        'dedup_memory_limit': args.dedup_memory_limit,
+        'memory_limit': args.memory_limit,
+        'spill_rows': args.spill_rows,
+        'spill_dir': args.spill_dir,
+        'dedup_dir': args.dedup_dir,
+        'two_phase_schema': args.two_phase_schema,
+        'watch_workers': args.watch_workers,
+        'watch_ledger': args.watch_ledger,
+        'stream_format': args.stream_format,
+        'stream_batch_rows': args.stream_batch_rows,
+        'stream_batch_seconds': args.stream_batch_seconds,
+        'stream_flush_seconds': args.stream_flush_seconds,
+        'metrics_file': args.metrics_file,
+        'metrics_prometheus_file': args.metrics_prometheus_file,
+        'dgraph_address': args.dgraph_address,
+        'dgraph_batch_size': args.dgraph_batch_size,
+        'dgraph_concurrency': args.dgraph_concurrency,
+        'subject_batches': args.subject_batches,
+        'subject_batch_size': args.subject_batch_size,
+        'subject_batch_workers': args.subject_batch_workers,
+        'shards': args.shards,
+        'output_format': args.output_format,
+        'json_batch_size': args.json_batch_size,
+        'dql_batch_size': args.dql_batch_size,
+        'manifest': args.manifest
     }
     options = {key: value for key, value in options.items() if value is not None and value is not False}
 
+    profiler = None
+    if args.profile:
+        from dgraphpandas.hooks import register_stage_hooks
+        from dgraphpandas.profiling import StageProfiler
+        profiler = StageProfiler(cprofile=args.profile_dir is not None)
+        register_stage_hooks(profiler)
+
     if args.method == 'upserts':
         if args.file is None:
             raise ValueError('file must be provided in upsert mode')
         elif args.config_file_key is None:
             raise ValueError('config_file_key must be provided in upsert mode')
-        to_rdf(args.file, args.config, args.config_file_key, args.output_dir, export_rdf=True, **(options))
+        _import_pandas()
+        from dgraphpandas.rdf import to_rdf
+        to_rdf(args.file, args.config, args.config_file_key, args.output_dir, export_rdf=args.dgraph_address is None, **(options))
 
     elif args.method == 'schema':
+        '''
+        The schema is built as a frame of the predicates from the config, so it needs pandas too
+        '''
+        _import_pandas()
+        from dgraphpandas.strategies.schema import create_schema
+        from dgraphpandas.writers.schema import generate_schema, generate_schema_diff
         schema_frame = create_schema(args.config, ensure_xid_predicate=True, **(options))
         generate_schema(schema_frame, export_schema=True, **(options))
+        if args.existing_schema:
+            generate_schema_diff(schema_frame, args.existing_schema, export_schema=True, **(options))
 
     elif args.method == 'types':
+        _import_pandas()
+        from dgraphpandas.strategies.schema import create_schema
+        from dgraphpandas.writers.types import generate_types
         schema_frame = create_schema(args.config, ensure_xid_predicate=True, **(options))
         generate_types(schema_frame, export_schema=True, **(options))
 
+    elif args.method == 'diff':
+        if args.file is None or args.previous_file is None:
+            raise ValueError('file and previous_file must be provided in diff mode')
+        elif args.config_file_key is None:
+            raise ValueError('config_file_key must be provided in diff mode')
+        _import_pandas()
+        from dgraphpandas.diff import diff_rdf
+        diff_rdf(args.previous_file, args.file, args.config, args.config_file_key, args.output_dir, **(options))
+
+    elif args.method == 'validate':
+        _import_pandas()
+        from dgraphpandas.validation import validate_edges
+        report = validate_edges(args.output_dir, filter_dangling_edges=args.filter_dangling_edges, **(options))
+        print(report.to_string(index=False))
+
+    elif args.method == 'infer':
+        if args.file is None:
+            raise ValueError('file must be provided in infer mode')
+        elif args.config_file_key is None:
+            raise ValueError('config_file_key must be provided in infer mode')
+        _import_pandas()
+        from dgraphpandas.strategies.inference import infer_schema
+        export_config = os.path.join(args.output_dir, 'inferred_' + os.path.basename(args.config))
+        infer_schema({args.config_file_key: args.file}, args.config, export_config=export_config, **(options))
+
+    elif args.method == 'advise':
+        if args.file is None:
+            raise ValueError('file must be provided in advise mode')
+        elif args.config_file_key is None:
+            raise ValueError('config_file_key must be provided in advise mode')
+        _import_pandas()
+        from dgraphpandas.strategies.index_advisor import advise_options
+        config = _get_config(args.config)
+        advised_options, advice = advise_options(args.file, config, args.config_file_key, **(options))
+        print(advice.to_string(index=False))
+
+        config['files'][args.config_file_key]['options'] = advised_options
+        export_config = os.path.join(args.output_dir, 'advised_' + os.path.basename(args.config))
+        logger.info(f'Writing advised configuration to {export_config}')
+        with open(export_config, 'w') as f:
+            json.dump(config, f, indent=4)
+
+    elif args.method == 'serve':
+        _import_pandas()
+        from dgraphpandas.server import serve
+        serve(args.address, args.serve_workers)
+
+    elif args.method == 'watch':
+        if args.watch_dir is None:
+            raise ValueError('watch_dir must be provided in watch mode')
+        _import_pandas()
+        from dgraphpandas.watch import watch
+        watch(args.watch_dir, args.config, args.output_dir, **(options))
+
+    elif args.method == 'stream':
+        if args.config_file_key is None:
+            raise ValueError('config_file_key must be provided in stream mode')
+        _import_pandas()
+        from dgraphpandas.stream import stream_rdf
+        summary = stream_rdf(args.file, args.config, args.config_file_key, args.output_dir, **(options))
+        logger.info(summary)
+
+    elif args.method == 'load':
+        _import_pandas()
+        from dgraphpandas.loader import load, LoadError
+        load_options = {
+            'loader_command': args.loader_command,
+            'workers': args.loader_workers,
+            'retries': args.loader_retries,
+            'schema_files': args.schema_file,
+            'dgraph_address': args.dgraph_address,
+        }
+        try:
+            report = load(args.output_dir, **{key: value for key, value in load_options.items() if value is not None})
+        except LoadError as e:
+            print(e.report.to_string(index=False))
+            raise
+        print(report.to_string(index=False))
+
+    if profiler is not None:
+        from dgraphpandas.hooks import unregister_stage_hooks
+        unregister_stage_hooks(profiler)
+        print(profiler.report().to_string(index=False))
+        if args.profile_dir:
+            profiler.dump(args.profile_dir)
+
 
 if __name__ == '__main__':
     main()  # pragma: no cover
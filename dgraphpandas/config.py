@@ -1,6 +1,5 @@
 import json
 import logging
-from pprint import pformat
 from typing import Dict, Any, Union
 
 logger = logging.getLogger(__name__)
@@ -30,6 +29,7 @@ def _get_config(config: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
         raise ValueError('config')
 
     if isinstance(config, str):
+        from pprint import pformat
         logger.info(f'Reading from configuration {config}')
         with open(config, 'r') as f:
             config: Dict[str, Any] = json.load(f)
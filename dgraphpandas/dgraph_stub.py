@@ -0,0 +1,136 @@
+import re
+import json
+import logging
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_query_pattern = re.compile(r'^(v\d+) as var\(func: eq\(([^,]+), "((?:[^"\\]|\\.)*)"\)\)$')
+_mutation_pattern = re.compile(r'^uid\((v\d+)\) <([^>]+)> (.+) \.$')
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _MutationHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+    def _respond(self, status: int, payload: Dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        if self.path.startswith('/alter'):
+            self._respond(200, self.server.stub.alter(body))
+            return
+        if not self.path.startswith('/mutate'):
+            self._respond(404, {'errors': [{'message': f'Unknown path {self.path}'}]})
+            return
+
+        try:
+            self._respond(200, self.server.stub.apply(body))
+        except ValueError as e:
+            self._respond(400, {'errors': [{'message': str(e)}]})
+
+
+class DgraphStub:
+    '''
+    A local stand in for the HTTP mutate endpoint of a Dgraph alpha, for tests and benchmarks.
+
+    It understands the upsert blocks sent by DgraphHttpSink: variables are matched
+    (or created) by their upsert predicate and every set or deleted triple is applied
+    to an in memory graph keyed by xid. The first abort_first requests are answered
+    with a transaction aborted error, as Dgraph does when concurrent transactions conflict.
+    Schemas posted to the alter endpoint are kept in schemas.
+    '''
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, abort_first: int = 0):
+        self.abort_first = abort_first
+        self.requests = 0
+        self.nodes: Dict[str, Dict[str, Set[str]]] = {}
+        self.schemas: List[str] = []
+        self._lock = threading.Lock()
+        self._server = _ThreadingHTTPServer((host, port), _MutationHandler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def triples(self) -> List[Tuple[str, str, str]]:
+        with self._lock:
+            return sorted((xid, predicate, value) for xid, predicates in self.nodes.items() for predicate, values in predicates.items() for value in values)
+
+    def apply(self, body: str) -> Dict:
+        lines = [line.strip() for line in body.split('\n')]
+        variables: Dict[str, str] = {}
+        section = None
+        mutations: List[Tuple[str, str, str]] = []
+
+        for line in lines:
+            if line in ('set {', 'delete {'):
+                section = line.split()[0]
+                continue
+            match = _query_pattern.match(line)
+            if match:
+                variable, _, xid = match.groups()
+                variables[variable] = xid.replace('\\"', '"').replace('\\\\', '\\')
+                continue
+            match = _mutation_pattern.match(line)
+            if match:
+                mutations.append(match.groups())
+            elif line.startswith('uid('):
+                raise ValueError(f'Could not parse {line}')
+
+        with self._lock:
+            self.requests += 1
+            if self.requests <= self.abort_first:
+                return {'errors': [{'message': 'Transaction has been aborted. Please retry', 'extensions': {'code': 'ErrorAborted'}}]}
+
+            for variable, predicate, obj in mutations:
+                if variable not in variables:
+                    raise ValueError(f'Unknown variable {variable}')
+                target = re.match(r'^uid\((v\d+)\)$', obj)
+                value = '<' + variables[target.group(1)] + '>' if target else obj
+
+                if section == 'set':
+                    self.nodes.setdefault(variables[variable], {}).setdefault(predicate, set()).add(value)
+                elif variables[variable] in self.nodes:
+                    values = self.nodes[variables[variable]].get(predicate, set())
+                    values.difference_update(values if value == '*' else {value})
+
+        return {'data': {'code': 'Success', 'message': 'Done', 'uids': {}}}
+
+    def alter(self, body: str) -> Dict:
+        with self._lock:
+            self.schemas.append(body)
+        return {'data': {'code': 'Success', 'message': 'Done'}}
+
+    def start(self) -> 'DgraphStub':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
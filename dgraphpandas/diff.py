@@ -0,0 +1,210 @@
+import os
+import gzip
+import heapq
+import itertools
+import logging
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+import pandas as pd
+
+from dgraphpandas.config import get_from_config, _get_config
+from dgraphpandas.rdf import to_rdf_from_frame
+from dgraphpandas.writers.subjects import statement_subject
+from dgraphpandas.strategies.transformer import Transformer
+
+logger = logging.getLogger(__name__)
+
+
+def _transformed_lines(file_path: str, config: Dict[str, Any], config_key: str, **kwargs) -> Iterator[str]:
+    '''
+    Runs the given file through the configured transform one chunk
+    at a time and yields every intrinsic and edge RDF line.
+    '''
+    file_config = config['files'][config_key]
+    transformer = Transformer(config, config_key, **(kwargs))
+    read_csv_options: Dict[str, Any] = get_from_config('read_csv_options', file_config, {}, **(kwargs))
+    chunk_size: int = get_from_config('chunk_size', config, 10_000_000, **(kwargs))
+
+    logger.info(f'Transforming {file_path}')
+    for frame in pd.read_csv(file_path, chunksize=chunk_size, **(read_csv_options)):
+        intrinsic_upserts, edges_upserts = to_rdf_from_frame(frame, config, config_key, transformer, config_key, None, **(kwargs))
+        yield from intrinsic_upserts
+        yield from edges_upserts
+
+
+def _read_run(path: str) -> Iterator[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
+def _external_sort(lines: Iterable[str], directory: str, run_size: int) -> Iterator[str]:
+    '''
+    Sorts the lines in bounded memory. At most run_size lines are held in memory,
+    each full run is sorted and written to disk and then all runs are lazily merged.
+    '''
+    if run_size <= 0:
+        raise ValueError('run_size')
+
+    run_paths: List[str] = []
+    run: List[str] = []
+    for line in lines:
+        run.append(line)
+        if len(run) >= run_size:
+            run_paths.append(_write_run(sorted(run), directory))
+            run = []
+
+    if not run_paths:
+        logger.debug('Sort fits within a single run, skipping disk')
+        return iter(sorted(run))
+
+    if run:
+        run_paths.append(_write_run(sorted(run), directory))
+
+    logger.debug(f'Merging {len(run_paths)} sorted runs')
+    return heapq.merge(*[_read_run(path) for path in run_paths])
+
+
+def _write_run(run: List[str], directory: str) -> str:
+    handle, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(handle, 'w', encoding='utf-8') as f:
+        for line in run:
+            f.write(line)
+            f.write('\n')
+    return path
+
+
+def _subject(line: str) -> str:
+    '''
+    The subject is kept within its brackets so the subjects
+    compare in the same order as the sorted lines.
+    '''
+    return '<' + statement_subject(line) + '>'
+
+
+def _predicate(line: str) -> str:
+    start = line.index('> ') + 2
+    return line[start:line.index('> ', start) + 1]
+
+
+def _object(line: str) -> str:
+    start = line.index('> ', line.index('> ') + 2) + 2
+    return line[start:line.rindex(' .')]
+
+
+def _merge_join(previous: Iterator[str], current: Iterator[str]) -> Iterator[Tuple[str, str]]:
+    '''
+    Merge joins two sorted streams of RDF lines subject by subject.
+    Yields ('add', line) for data only in the current stream and ('delete', line) for
+    the deletions required to remove data only in the previous stream.
+
+    - A subject which disappeared entirely is deleted with <s> * * .
+    - An intrinsic predicate which disappeared is deleted with <s> <p> * .
+      (changed intrinsic values are simply overwritten by the add)
+    - An edge which disappeared is deleted exactly, leaving other objects on the predicate intact
+    '''
+    sentinel = (None, None)
+    previous_groups = itertools.groupby(previous, key=_subject)
+    current_groups = itertools.groupby(current, key=_subject)
+    previous_subject, previous_lines = next(previous_groups, sentinel)
+    current_subject, current_lines = next(current_groups, sentinel)
+
+    while previous_subject is not None or current_subject is not None:
+        if current_subject is None or (previous_subject is not None and previous_subject < current_subject):
+            yield ('delete', previous_subject + ' * * .')
+            previous_subject, previous_lines = next(previous_groups, sentinel)
+
+        elif previous_subject is None or current_subject < previous_subject:
+            for line in current_lines:
+                yield ('add', line)
+            current_subject, current_lines = next(current_groups, sentinel)
+
+        else:
+            old = set(previous_lines)
+            new = list(current_lines)
+            new_set = set(new)
+            new_predicates = {_predicate(line) for line in new}
+            deleted_predicates = set()
+
+            for line in sorted(old.difference(new_set)):
+                predicate = _predicate(line)
+                if not _object(line).startswith('"'):
+                    yield ('delete', line)
+                elif predicate not in new_predicates and predicate not in deleted_predicates:
+                    deleted_predicates.add(predicate)
+                    yield ('delete', current_subject + ' ' + predicate + ' * .')
+
+            for line in new:
+                if line not in old:
+                    yield ('add', line)
+
+            previous_subject, previous_lines = next(previous_groups, sentinel)
+            current_subject, current_lines = next(current_groups, sentinel)
+
+
+def diff_rdf(
+        previous_file: str,
+        current_file: str,
+        config: Union[Dict[str, Any], str],
+        config_key: str,
+        output_dir: str = '.',
+        **kwargs) -> Tuple[int, int]:
+    '''
+    Compares two snapshots of the same input file and writes only the delta.
+
+    Both files are run through the configured transform, the resulting RDF is
+    externally sorted on disk in bounded memory and the sorted streams are merge joined.
+
+    Parameters:
+        previous_file: The previous snapshot (CSV)
+        current_file: The new snapshot (CSV)
+        config: A Configuration Dictionary or file path
+        config_key: The file (key) to use in the configuration
+        output_dir: The output directory to write the adds and deletes exports
+
+    Returns:
+        A tuple with the number of add and delete statements written
+    '''
+    if not previous_file:
+        raise ValueError('previous_file')
+    if not current_file:
+        raise ValueError('current_file')
+    if not config:
+        raise ValueError('config')
+    if not config_key:
+        raise ValueError('config_key')
+
+    config = _get_config(config)
+    file_config = config['files'][config_key]
+    encoding: str = get_from_config('encoding', file_config, 'utf-8', **(kwargs))
+    gz_compression_level: int = get_from_config('gz_compression_level', file_config, 9, **(kwargs))
+    diff_run_size: int = get_from_config('diff_run_size', config, 1_000_000, **(kwargs))
+    diff_temp_dir: str = get_from_config('diff_temp_dir', config, None, **(kwargs))
+
+    # The diff is computed from the full snapshots so any change tracking (from the kwargs or the config) must be bypassed
+    kwargs['incremental_state'] = None
+
+    source_file_name = os.path.basename(current_file).split('.')[0]
+    os.makedirs(output_dir, exist_ok=True)
+    adds_path = os.path.join(output_dir, source_file_name + '_diff_adds.gz')
+    deletes_path = os.path.join(output_dir, source_file_name + '_diff_deletes.gz')
+
+    with tempfile.TemporaryDirectory(dir=diff_temp_dir) as directory:
+        previous = _external_sort(_transformed_lines(previous_file, config, config_key, **(kwargs)), directory, diff_run_size)
+        current = _external_sort(_transformed_lines(current_file, config, config_key, **(kwargs)), directory, diff_run_size)
+
+        counts = {'add': 0, 'delete': 0}
+        with gzip.open(adds_path, mode='wb', compresslevel=gz_compression_level) as adds, \
+                gzip.open(deletes_path, mode='wb', compresslevel=gz_compression_level) as deletes:
+            outputs = {'add': adds, 'delete': deletes}
+            for operation, line in _merge_join(previous, current):
+                output = outputs[operation]
+                if counts[operation]:
+                    output.write(b'\n')
+                output.write(line.encode(encoding=encoding))
+                counts[operation] += 1
+
+    logger.info(f'Writing {counts["add"]} adds to {adds_path}')
+    logger.info(f'Writing {counts["delete"]} deletes to {deletes_path}')
+    return counts['add'], counts['delete']
@@ -0,0 +1,21 @@
+import os
+import hashlib
+
+_fingerprint_head_bytes = 64 * 1024
+
+
+def file_fingerprint(path: str) -> str:
+    '''
+    A cheap fingerprint for a (potentially huge) file based on its
+    size, modification time and the first 64KB of content.
+    '''
+    if not path:
+        raise ValueError('path')
+
+    stat = os.stat(path)
+    digest = hashlib.sha1()
+    digest.update(f'{stat.st_size}:{stat.st_mtime_ns}:'.encode('utf-8'))
+    with open(path, 'rb') as f:
+        digest.update(f.read(_fingerprint_head_bytes))
+
+    return digest.hexdigest()
@@ -0,0 +1,99 @@
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, List, Union
+
+logger = logging.getLogger(__name__)
+
+
+class StageHooks:
+    '''
+    Receives a callback before and after every stage of a transform
+    (each helper, the melt, the upserts writer and the export write)
+    along with the number of rows going in and coming out of the stage.
+
+    Subclass and override the callbacks which are needed, then register
+    the instance with register_stage_hooks (or the stage_hooks context manager).
+
+    Hooks are registered for the whole process (e.g a profiler of the command line)
+    or, with thread_local, only receive the stages run on the thread which registered
+    them so conversions running on other threads (e.g jobs of the server) are not mixed in.
+    '''
+
+    def on_stage_start(self, stage: str, rows: Union[int, None]):
+        pass
+
+    def on_stage_end(self, stage: str, rows: Union[int, None]):
+        pass
+
+
+_registered: List[StageHooks] = []
+_local = threading.local()
+
+
+def _thread_registered() -> List[StageHooks]:
+    if not hasattr(_local, 'registered'):
+        _local.registered = []
+    return _local.registered
+
+
+def register_stage_hooks(hooks: StageHooks, thread_local: bool = False):
+    if hooks is None:
+        raise ValueError('hooks')
+    (_thread_registered() if thread_local else _registered).append(hooks)
+
+
+def unregister_stage_hooks(hooks: StageHooks):
+    for registered in [_registered, _thread_registered()]:
+        if hooks in registered:
+            registered.remove(hooks)
+
+
+@contextmanager
+def stage_hooks(hooks: StageHooks, thread_local: bool = False):
+    register_stage_hooks(hooks, thread_local)
+    try:
+        yield hooks
+    finally:
+        unregister_stage_hooks(hooks)
+
+
+def _count_rows(value: Any) -> Union[int, None]:
+    '''
+    Rows of a frame, list of statements or a tuple of them (e.g intrinsic and edges).
+    '''
+    if isinstance(value, tuple):
+        counts = [_count_rows(item) for item in value]
+        return None if None in counts else sum(counts)
+    if hasattr(value, 'shape') or isinstance(value, list):
+        return len(value)
+    return None
+
+
+def _run_stage(stage: str, func: Callable, *args, **kwargs) -> Any:
+    '''
+    Calls func(*args, **kwargs) as a named stage. The rows going in are the rows of the
+    frames passed (or the first list of statements when there are none). When no hooks
+    are registered this is just the call so there is no cost to an unprofiled run.
+
+    The end of the stage is reported even when it raises, with the rows going in.
+    '''
+    thread_registered = getattr(_local, 'registered', None)
+    if not _registered and not thread_registered:
+        return func(*args, **kwargs)
+
+    hooks = _registered + (thread_registered or [])
+    frames = tuple(arg for arg in args if hasattr(arg, 'shape'))
+    rows = _count_rows(frames) if frames else _count_rows(next((arg for arg in args if isinstance(arg, list)), None))
+    for hook in hooks:
+        hook.on_stage_start(stage, rows)
+
+    result = None
+    try:
+        result = func(*args, **kwargs)
+        return result
+    finally:
+        if result is not None:
+            rows = _count_rows(result)
+        for hook in reversed(hooks):
+            hook.on_stage_end(stage, rows)
@@ -0,0 +1,195 @@
+import logging
+import sqlite3
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _open_state(path: str) -> sqlite3.Connection:
+    '''
+    Opens (and creates if required) the local state store which holds a content
+    hash for every value of a (subject, predicate) previously exported from each source.
+    The object of edges is kept too so an edge which was removed can be deleted on its own.
+    '''
+    if not path:
+        raise ValueError('path')
+
+    logger.debug(f'Opening incremental state store {path}')
+    connection = sqlite3.connect(path)
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS source_triples (
+            source TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            predicate TEXT NOT NULL,
+            hash INTEGER NOT NULL,
+            object TEXT,
+            PRIMARY KEY (source, subject, predicate, hash)
+        ) WITHOUT ROWID
+    ''')
+
+    '''
+    The values seen so far in the run are staged in a temporary table
+    so removals are only decided once every chunk has been seen.
+    '''
+    connection.execute('''
+        CREATE TEMP TABLE IF NOT EXISTS seen_triples (
+            source TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            predicate TEXT NOT NULL,
+            hash INTEGER NOT NULL,
+            object TEXT,
+            PRIMARY KEY (source, subject, predicate, hash)
+        ) WITHOUT ROWID
+    ''')
+    connection.execute('CREATE TEMP TABLE IF NOT EXISTS current_triples (subject TEXT, predicate TEXT, hash INTEGER)')
+    return connection
+
+
+def _hash_triples(frame: pd.DataFrame) -> pd.MultiIndex:
+    '''
+    Bulk hashes every row of the given triples into a (subject, predicate, hash)
+    key where the hash is a content hash of its object and type.
+    '''
+    if frame is None:
+        raise ValueError('frame')
+
+    return pd.MultiIndex.from_arrays([
+        frame['subject'].astype(str).values,
+        frame['predicate'].astype(str).values,
+        pd.util.hash_pandas_object(frame[['object', 'type']].astype(str), index=False).values.view(np.int64)
+    ], names=['subject', 'predicate', 'hash'])
+
+
+def _generate_deletes(deletes: pd.DataFrame) -> List[str]:
+    '''
+    Generates RDF delete statements which remove every value
+    of a predicate from a node:
+
+    <sloth> <color> * .
+
+    or only the edge to the object when there is one:
+
+    <sloth> <country> <africa> .
+    '''
+    if deletes.empty:
+        return []
+
+    objects = deletes['object'] if 'object' in deletes else pd.Series(None, index=deletes.index, dtype=object)
+    objects = ('<' + objects + '>').fillna('*')
+    return ('<' + deletes['subject'] + '> <' + deletes['predicate'] + '> ' + objects + ' .').values.tolist()
+
+
+def _apply_incremental_state(
+        connection: sqlite3.Connection,
+        source: str,
+        intrinsic: pd.DataFrame,
+        edges: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    '''
+    Compares the transformed frames (a chunk of the run) against the state store
+    of the source and filters them down to only the values which are new. A value
+    which is repeated, within the chunk or earlier in the run, is only kept once.
+
+    Values which are no longer present are only known once every chunk
+    has been seen so they are left to _finish_incremental_state.
+    '''
+    if connection is None:
+        raise ValueError('connection')
+    if not source:
+        raise ValueError('source')
+    if intrinsic is None:
+        raise ValueError('intrinsic')
+    if edges is None:
+        raise ValueError('edges')
+
+    intrinsic = intrinsic.loc[intrinsic['object'].notna()]
+    edges = edges.loc[edges['object'].notna()]
+    intrinsic_keys = _hash_triples(intrinsic)
+    edges_keys = _hash_triples(edges)
+
+    current = pd.concat([
+        intrinsic_keys.to_frame(index=False).assign(object=None),
+        edges_keys.to_frame(index=False).assign(object=edges['object'].astype(str).values)
+    ]).drop_duplicates(['subject', 'predicate', 'hash'])
+
+    connection.execute('DELETE FROM current_triples')
+    connection.executemany(
+        'INSERT INTO current_triples VALUES (?, ?, ?)',
+        zip(current['subject'].tolist(), current['predicate'].tolist(), current['hash'].tolist()))
+
+    known = pd.read_sql_query(
+        '''
+        SELECT c.subject, c.predicate, c.hash
+        FROM current_triples c
+        WHERE EXISTS (SELECT 1 FROM source_triples t WHERE t.source = ? AND t.subject = c.subject AND t.predicate = c.predicate AND t.hash = c.hash)
+        OR EXISTS (SELECT 1 FROM seen_triples s WHERE s.source = ? AND s.subject = c.subject AND s.predicate = c.predicate AND s.hash = c.hash)
+        ''',
+        connection,
+        params=(source, source))
+    known_keys = pd.MultiIndex.from_frame(known.astype({'hash': np.int64}))
+
+    connection.executemany(
+        'INSERT OR IGNORE INTO seen_triples (source, subject, predicate, hash, object) VALUES (?, ?, ?, ?, ?)',
+        zip([source] * len(current), current['subject'].tolist(), current['predicate'].tolist(), current['hash'].tolist(), current['object'].tolist()))
+
+    intrinsic = intrinsic.loc[~intrinsic_keys.duplicated() & ~intrinsic_keys.isin(known_keys)]
+    edges = edges.loc[~edges_keys.duplicated() & ~edges_keys.isin(known_keys)]
+
+    logger.info(f'Incremental export: {len(intrinsic) + len(edges)} new values from {source}, {len(known)} unchanged')
+    return intrinsic, edges
+
+
+def _finish_incremental_state(connection: sqlite3.Connection, source: str) -> List[str]:
+    '''
+    Ends the run of the source once every chunk has been applied.
+
+    Values which were previously exported for a subject seen in the run but
+    were not seen for it this time produce a delete: of the whole predicate when
+    none of its values were seen (for example, it became null) or of the edge to an
+    object which was removed from a list edge. An intrinsic value which changed was
+    replaced when the new value was set so does not need one.
+
+    The state of the source is then replaced with what was seen in the run.
+    The updates are staged on the connection and only become
+    permanent when the caller commits.
+    '''
+    if connection is None:
+        raise ValueError('connection')
+    if not source:
+        raise ValueError('source')
+
+    removed = pd.read_sql_query(
+        '''
+        SELECT t.subject, t.predicate, t.hash, t.object, EXISTS (
+            SELECT 1 FROM seen_triples s
+            WHERE s.source = t.source AND s.subject = t.subject AND s.predicate = t.predicate) AS predicate_seen
+        FROM source_triples t
+        WHERE t.source = ?
+        AND t.subject IN (SELECT subject FROM seen_triples WHERE source = ?)
+        AND NOT EXISTS (
+            SELECT 1 FROM seen_triples s
+            WHERE s.source = t.source AND s.subject = t.subject AND s.predicate = t.predicate AND s.hash = t.hash)
+        ''',
+        connection,
+        params=(source, source))
+
+    predicates = removed.loc[removed['predicate_seen'] == 0, ['subject', 'predicate']].drop_duplicates()
+    objects = removed.loc[(removed['predicate_seen'] != 0) & removed['object'].notna(), ['subject', 'predicate', 'object']]
+    deletes = _generate_deletes(predicates) + _generate_deletes(objects)
+
+    logger.info(f'Incremental export: {len(removed)} values removed from {source}, {len(deletes)} deletes')
+
+    connection.executemany(
+        'DELETE FROM source_triples WHERE source = ? AND subject = ? AND predicate = ? AND hash = ?',
+        zip([source] * len(removed), removed['subject'].tolist(), removed['predicate'].tolist(), removed['hash'].tolist()))
+    connection.execute(
+        '''
+        INSERT OR IGNORE INTO source_triples (source, subject, predicate, hash, object)
+        SELECT source, subject, predicate, hash, object FROM seen_triples WHERE source = ?
+        ''',
+        (source,))
+    connection.execute('DELETE FROM seen_triples WHERE source = ?', (source,))
+
+    return deletes
@@ -0,0 +1,185 @@
+import os
+import gzip
+import time
+import shlex
+import logging
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+
+from dgraphpandas.manifest import read_manifest
+from dgraphpandas.writers.dgraph_http import DgraphHttpSink, alter_schema
+
+logger = logging.getLogger(__name__)
+
+default_loader_command = 'dgraph live --upsertPredicate xid --format {format} --files {file}'
+
+'''
+Deletes are applied before anything is set, then the values of nodes (or every
+statement of a subject together) before the edges which point between them.
+'''
+_phases = {'deletes': 0, 'intrinsic': 1, 'subjects': 1, 'mutations': 1, 'edges': 2}
+_loader_formats = ['rdf', 'json']
+
+_report_columns = ['path', 'kind', 'phase', 'statements', 'bytes', 'attempts', 'seconds', 'statements_per_second', 'succeeded']
+
+
+class LoadError(Exception):
+    '''
+    Raised when an export still fails to load after the retries.
+    The report holds every export attempted so far.
+    '''
+
+    def __init__(self, message: str, report: pd.DataFrame):
+        super().__init__(message)
+        self.report = report
+
+
+def _row(entry: Dict[str, Any], path: str, attempts: int, seconds: float, succeeded: bool) -> Dict[str, Any]:
+    return {
+        'path': entry['path'],
+        'kind': entry['kind'],
+        'phase': _phases[entry['kind']],
+        'statements': entry['statements'],
+        'bytes': os.path.getsize(path),
+        'attempts': attempts,
+        'seconds': seconds,
+        'statements_per_second': entry['statements'] / seconds if seconds else None,
+        'succeeded': succeeded,
+    }
+
+
+def _json_array(path: str, directory: str) -> str:
+    '''
+    JSON mutation exports hold an array of objects on every line, but dgraph live reads
+    a single JSON value from a file. The arrays are joined (a line at a time) into
+    one array in a file within the directory, whose path is returned.
+    '''
+    handle, array_path = tempfile.mkstemp(suffix='.json.gz', dir=directory)
+    os.close(handle)
+
+    with gzip.open(path, 'rt', encoding='utf-8') as source, gzip.open(array_path, 'wt', encoding='utf-8', compresslevel=1) as target:
+        target.write('[')
+        first = True
+        for line in source:
+            objects = line.strip()[1:-1]
+            if objects:
+                if not first:
+                    target.write(',')
+                target.write(objects)
+                first = False
+        target.write(']')
+
+    return array_path
+
+
+def _load_file(entry: Dict[str, Any], output_dir: str, loader_command: str, retries: int, backoff: float) -> Dict[str, Any]:
+    '''
+    Runs the loader on an export, retrying with exponential backoff when it fails.
+    The seconds (and throughput) are of the last attempt.
+    '''
+    path = os.path.join(output_dir, entry['path'])
+
+    with tempfile.TemporaryDirectory() as directory:
+        load_path = _json_array(path, directory) if entry['format'] == 'json' else path
+        args = [token.replace('{file}', load_path).replace('{format}', entry['format']) for token in shlex.split(loader_command)]
+
+        for attempt in range(retries + 1):
+            started = time.perf_counter()
+            result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            seconds = time.perf_counter() - started
+
+            if result.returncode == 0:
+                logger.info(f'Loaded {entry["statements"]} statements from {path} in {seconds:.2f}s')
+                break
+
+            output = result.stdout.decode('utf-8', 'replace').strip()
+            logger.warning(f'Loading {path} failed with exit code {result.returncode} (attempt {attempt + 1} of {retries + 1}): {output}')
+            if attempt < retries:
+                time.sleep(backoff * (2 ** attempt))
+
+    return _row(entry, path, attempt + 1, seconds, result.returncode == 0)
+
+
+def _delete_file(entry: Dict[str, Any], output_dir: str, sink: DgraphHttpSink) -> Dict[str, Any]:
+    '''
+    dgraph live only sets statements so deletes are sent
+    to Dgraph through the sink (which retries them) instead.
+    '''
+    path = os.path.join(output_dir, entry['path'])
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        statements = [line for line in f.read().split('\n') if line]
+
+    started = time.perf_counter()
+    sink.send(statements, delete=True)
+    seconds = time.perf_counter() - started
+
+    logger.info(f'Deleted {len(statements)} statements from {path} in {seconds:.2f}s')
+    return _row(entry, path, 1, seconds, True)
+
+
+def load(
+        output_dir: str,
+        loader_command: str = default_loader_command,
+        workers: int = 4,
+        retries: int = 2,
+        backoff: float = 1.0,
+        schema_files: Union[List[str], None] = None,
+        dgraph_address: Union[str, None] = None) -> pd.DataFrame:
+    '''
+    Loads the exports recorded in the manifest of the output_dir.
+
+    The schema_files (e.g the schema and the types) are applied to dgraph_address first.
+    Then the exports are loaded a phase at a time: deletes, the values of nodes and then
+    the edges. Within a phase up to workers loader processes run at once, each on an
+    export of its own, largest first. The loader_command is run for every export with
+    {file} and {format} replaced, and an export which fails is retried up to retries times.
+    JSON exports are given to the loader as a single array.
+
+    Returns a report of the statements, time taken and throughput of every export.
+    '''
+    if output_dir is None:
+        raise ValueError('output_dir')
+    if not loader_command:
+        raise ValueError('loader_command')
+    if not workers or workers <= 0:
+        raise ValueError('workers')
+
+    entries = [entry for entry in read_manifest(output_dir) if entry['statements']]
+
+    unsupported = [entry['path'] for entry in entries if entry['kind'] not in _phases or entry['format'] not in _loader_formats]
+    if unsupported:
+        raise ValueError(f'{unsupported} cannot be loaded with dgraph live, only the {_loader_formats} formats can')
+    if any(entry['kind'] == 'deletes' for entry in entries) and not dgraph_address:
+        raise ValueError('dgraph_address must be provided to apply deletes')
+    if schema_files and not dgraph_address:
+        raise ValueError('dgraph_address must be provided to apply the schema')
+
+    if schema_files:
+        schema = []
+        for schema_file in schema_files:
+            with open(schema_file, 'r') as f:
+                schema.append(f.read())
+        logger.info(f'Applying {schema_files} to {dgraph_address}')
+        alter_schema(dgraph_address, '\n'.join(schema))
+
+    rows: List[Dict[str, Any]] = []
+    for phase in sorted(set(_phases[entry['kind']] for entry in entries)):
+        phase_entries = sorted((entry for entry in entries if _phases[entry['kind']] == phase), key=lambda entry: -entry['statements'])
+        logger.info(f'Loading {len(phase_entries)} exports in phase {phase}')
+
+        if phase == _phases['deletes']:
+            with DgraphHttpSink(dgraph_address) as sink:
+                rows.extend(_delete_file(entry, output_dir, sink) for entry in phase_entries)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='loader') as executor:
+                rows.extend(executor.map(lambda entry: _load_file(entry, output_dir, loader_command, retries, backoff), phase_entries))
+
+        failed = [row['path'] for row in rows if not row['succeeded']]
+        if failed:
+            raise LoadError(f'{failed} failed to load after {retries} retries', pd.DataFrame(rows, columns=_report_columns))
+
+    return pd.DataFrame(rows, columns=_report_columns)
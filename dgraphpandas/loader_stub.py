@@ -0,0 +1,54 @@
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+from typing import List
+
+
+def main(argv: List[str] = None):
+    '''
+    A stand in for dgraph live, for testing the loader.
+
+    It reads the export (so a missing or corrupt file fails, as does a JSON export which is not
+    a single value) and appends what it loaded, and when, to the log. The first fail_first attempts for every file exit with an error.
+    '''
+    parser = argparse.ArgumentParser(description='Stand in for dgraph live')
+    parser.add_argument('-f', '--files', required=True)
+    parser.add_argument('--format', default='rdf')
+    parser.add_argument('--log', required=True, help='The file to append a line of json to for every attempt.')
+    parser.add_argument('--fail_first', type=int, default=0, help='The attempts for every file which fail.')
+    parser.add_argument('--seconds', type=float, default=0, help='How long every load takes.')
+    args, _ = parser.parse_known_args(argv)
+
+    attempts = 0
+    if os.path.exists(args.log):
+        with open(args.log, 'r') as f:
+            attempts = sum(1 for line in f if json.loads(line)['file'] == args.files)
+
+    started = time.time()
+    with gzip.open(args.files, 'rt') as f:
+        if args.format == 'json':
+            statements = len(json.load(f))
+        else:
+            statements = sum(1 for line in f if line.strip())
+    time.sleep(args.seconds)
+    failed = attempts < args.fail_first
+
+    with open(args.log, 'a') as f:
+        f.write(json.dumps({
+            'file': args.files,
+            'format': args.format,
+            'statements': statements,
+            'started': started,
+            'ended': time.time(),
+            'failed': failed}) + '\n')
+
+    if failed:
+        print(f'Failing attempt {attempts + 1} of {args.files}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()  # pragma: no cover
@@ -0,0 +1,92 @@
+import os
+import json
+import uuid
+import logging
+import threading
+from typing import Any, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+manifest_file_name = 'manifest.jsonl'
+
+_lock = threading.Lock()
+
+
+def manifest_entry(
+        output_dir: str,
+        path: str,
+        kind: str,
+        output_format: str,
+        statements: int,
+        source: str,
+        chunk: Union[int, None],
+        shard: Union[int, None] = None,
+        run: Union[str, None] = None) -> Dict[str, Any]:
+    '''
+    Describes an export written to the output_dir. The path is
+    relative to the output_dir so the exports can be moved together.
+    The run is the conversion (see new_run) the export was written by.
+    '''
+    return {
+        'path': os.path.relpath(path, output_dir),
+        'kind': kind,
+        'format': output_format,
+        'statements': statements,
+        'source': source,
+        'chunk': chunk,
+        'shard': shard,
+        'run': run,
+    }
+
+
+def new_run() -> str:
+    '''
+    An id for a conversion, which every export it writes is recorded with.
+    '''
+    return uuid.uuid4().hex
+
+
+def append_manifest(output_dir: str, entries: List[Dict[str, Any]]):
+    '''
+    Appends entries to the manifest (a line of json for each) in the output_dir.
+    Every entry is written in one write so concurrent conversions do not interleave.
+    '''
+    if output_dir is None:
+        raise ValueError('output_dir')
+    if not entries:
+        return
+
+    path = os.path.join(output_dir, manifest_file_name)
+    lines = ''.join(json.dumps(entry) + '\n' for entry in entries)
+    with _lock:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+    logger.debug(f'Recorded {len(entries)} exports in {path}')
+
+
+def read_manifest(output_dir: str) -> List[Dict[str, Any]]:
+    '''
+    Reads the manifest in the output_dir. When an export was written more than once
+    (e.g the same file converted again) only the last entry for it is kept.
+
+    When a source was converted more than once, only the exports of its latest run are kept
+    so exports which that run did not write again (e.g the removed predicates of an
+    earlier incremental run, or chunks beyond the end of a smaller file) are not loaded.
+    '''
+    if output_dir is None:
+        raise ValueError('output_dir')
+
+    path = os.path.join(output_dir, manifest_file_name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f'{path} does not exist, convert with manifest enabled to write it')
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    runs: Dict[str, Union[str, None]] = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entries.pop(entry['path'], None)
+                entries[entry['path']] = entry
+                runs[entry.get('source')] = entry.get('run')
+    return [entry for entry in entries.values() if entry.get('run') == runs[entry.get('source')]]
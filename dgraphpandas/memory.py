@@ -0,0 +1,181 @@
+import os
+import logging
+import threading
+import tracemalloc
+from typing import Dict, Iterator, Union
+
+import pandas as pd
+
+from dgraphpandas.hooks import StageHooks
+
+logger = logging.getLogger(__name__)
+
+'''
+tracemalloc is global to the process, so the chunkers of concurrent conversions
+(e.g jobs of the server) share it. It is started by the first and only stopped
+once the last has finished (and only if it was not already tracing before them).
+'''
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+
+
+def _current_rss() -> Union[int, None]:
+    '''
+    Resident set size of this process in bytes
+    or None where /proc is not available.
+    '''
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _start_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if not _tracing_users:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if not _tracing_users and _started_tracing:
+            tracemalloc.stop()
+
+
+def _reset_peak():
+    '''
+    tracemalloc.reset_peak is only available from python 3.9,
+    clearing the traces also resets the peak on older versions.
+
+    While other chunkers are tracing the peak is left alone as resetting it would
+    lose theirs, so it is the highest of any of them and the chunks are sized conservatively.
+    '''
+    with _tracing_lock:
+        if _tracing_users > 1:
+            return
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.clear_traces()  # pragma: no cover
+
+
+class AdaptiveChunker(StageHooks):
+    '''
+    Reads a file in chunks sized to stay under a memory budget.
+
+    The first chunk is read with initial_rows. While a chunk is converted the peak
+    memory allocated (tracemalloc) is measured in total and for every stage, giving an
+    estimate of the bytes needed per input row. The next chunk is then sized so that
+    the resident memory before the chunk plus the estimated peak stays within
+    the memory_limit (with some headroom), growing at most by growth each time
+    and never beyond max_rows.
+
+    Register the chunker as stage hooks while converting so the peak of each stage is recorded.
+    '''
+
+    def __init__(
+            self,
+            memory_limit: int,
+            max_rows: int,
+            initial_rows: int = 10_000,
+            min_rows: int = 100,
+            growth: float = 2.0,
+            headroom: float = 0.8):
+        if not memory_limit or memory_limit <= 0:
+            raise ValueError('memory_limit')
+        if not max_rows or max_rows <= 0:
+            raise ValueError('max_rows')
+
+        self.memory_limit = memory_limit
+        self.max_rows = max_rows
+        self.min_rows = min(min_rows, max_rows)
+        self.rows = max(self.min_rows, min(initial_rows, max_rows))
+        self.growth = growth
+        self.headroom = headroom
+
+        self.peak = 0
+        self.stage_bytes_per_row: Dict[str, float] = {}
+        self._chunk_rows = 0
+        self._chunk_peak = 0
+        self._stage_started = 0
+
+    def on_stage_start(self, stage: str, rows: Union[int, None]):
+        if not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        self._chunk_peak = max(self._chunk_peak, peak)
+        self._stage_started = current
+        _reset_peak()
+
+    def on_stage_end(self, stage: str, rows: Union[int, None]):
+        if not tracemalloc.is_tracing() or not self._chunk_rows:
+            return
+        _, peak = tracemalloc.get_traced_memory()
+        self._chunk_peak = max(self._chunk_peak, peak)
+
+        bytes_per_row = max(peak - self._stage_started, 0) / self._chunk_rows
+        self.stage_bytes_per_row[stage] = max(self.stage_bytes_per_row.get(stage, 0.0), bytes_per_row)
+
+    def next_rows(self, rows: int, peak: int, rss: Union[int, None]) -> int:
+        '''
+        The rows to read in the next chunk after a chunk of rows
+        which peaked at peak bytes with rss resident before it was read.
+        '''
+        bytes_per_row = peak / rows if rows else 0
+        available = self.memory_limit * self.headroom - (rss or 0)
+
+        if not bytes_per_row:
+            target = self.max_rows
+        elif available <= 0:
+            logger.warning(f'{rss} bytes are already resident which is over the memory_limit {self.memory_limit}')
+            target = self.min_rows
+        else:
+            target = int(available / bytes_per_row)
+
+        target = min(target, int(rows * self.growth), self.max_rows)
+        return max(target, self.min_rows)
+
+    def chunks(self, reader: pd.io.parsers.TextFileReader) -> Iterator[pd.DataFrame]:
+        '''
+        Reads chunks from a reader opened with iterator=True,
+        adapting the rows of each chunk to the memory measured for the last.
+        '''
+        _start_tracing()
+        try:
+            index = 0
+            while True:
+                rss = _current_rss()
+                _reset_peak()
+                self._chunk_peak = 0
+                self._chunk_rows = 0
+
+                try:
+                    frame = reader.get_chunk(self.rows)
+                except StopIteration:
+                    return
+
+                self._chunk_rows = len(frame)
+                yield frame
+
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(self._chunk_peak, peak)
+                self.peak = max(self.peak, peak)
+
+                rows = self.rows
+                self.rows = self.next_rows(self._chunk_rows, peak, rss)
+                logger.info(
+                    f'Chunk {index} of {self._chunk_rows} rows (asked for {rows}) peaked at {peak} bytes '
+                    f'with {rss} bytes resident before it, reading {self.rows} rows next')
+                logger.debug(f'Bytes per row for each stage {self.stage_bytes_per_row}')
+                index += 1
+        finally:
+            _stop_tracing()
+            logger.info(f'Peak of {self.peak} bytes across chunks, bytes per row for each stage: {self.stage_bytes_per_row}')
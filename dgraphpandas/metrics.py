@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+_counters = ['rows', 'intrinsic', 'edges', 'deletes', 'bytes_uncompressed', 'bytes_compressed']
+
+
+class RunMetrics:
+    '''
+    Records throughput for every chunk of a run: rows read, triples emitted,
+    bytes before and after compression and the seconds spent in each stage.
+
+    Each chunk is appended as a JSON line to metrics_file once it has finished
+    and the totals can be written as a Prometheus text format file
+    (e.g for the node exporter textfile collector).
+    '''
+
+    def __init__(self, metrics_file: Union[str, None] = None, prometheus_file: Union[str, None] = None):
+        self.metrics_file = metrics_file
+        self.prometheus_file = prometheus_file
+        self.current: Union[Dict[str, Any], None] = None
+        self.totals: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def in_chunk(self) -> bool:
+        return self.current is not None
+
+    def start_chunk(self, source: str, index: int, rows: int, read_seconds: float = 0.0):
+        self.current = {
+            'source': source,
+            'chunk': index,
+            'started': time.time(),
+            'seconds': {'read': read_seconds} if read_seconds else {},
+            **{counter: 0 for counter in _counters}
+        }
+        self.current['rows'] = rows
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.current is not None:
+                seconds = self.current['seconds']
+                seconds[name] = seconds.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, counter: str, value: int):
+        if self.current is not None:
+            self.current[counter] += value
+
+    def end_chunk(self) -> Dict[str, Any]:
+        '''
+        Finishes the current chunk, appending it to the metrics file and the totals.
+        '''
+        chunk, self.current = self.current, None
+        if chunk is None:
+            return None
+
+        total_seconds = sum(chunk['seconds'].values())
+        chunk['rows_per_second'] = chunk['rows'] / total_seconds if total_seconds else None
+
+        totals = self.totals.setdefault(chunk['source'], {'chunks': 0, 'seconds': {}, **{counter: 0 for counter in _counters}})
+        totals['chunks'] += 1
+        for counter in _counters:
+            totals[counter] += chunk[counter]
+        for stage, seconds in chunk['seconds'].items():
+            totals['seconds'][stage] = totals['seconds'].get(stage, 0.0) + seconds
+
+        logger.debug(f'Chunk metrics {chunk}')
+        if self.metrics_file:
+            with open(self.metrics_file, 'a') as f:
+                f.write(json.dumps(chunk) + '\n')
+
+        return chunk
+
+    def timed(self, frames: Iterable, source: str) -> Iterator:
+        '''
+        Wraps a chunked reader so the time spent reading each chunk is recorded
+        and every chunk is started with its row count.
+        '''
+        frames = iter(frames)
+        index = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                frame = next(frames)
+            except StopIteration:
+                return
+
+            self.start_chunk(source, index, len(frame), time.perf_counter() - started)
+            yield frame
+            index += 1
+
+    def write_prometheus(self):
+        '''
+        Writes the totals in the Prometheus text format. The file is written
+        to a temporary path first so a scrape never sees a partial file.
+        '''
+        if not self.prometheus_file:
+            return
+
+        lines = [
+            '# HELP dgraphpandas_rows_total Rows read from the input.',
+            '# TYPE dgraphpandas_rows_total counter',
+        ]
+        lines += [f'dgraphpandas_rows_total{{source="{source}"}} {totals["rows"]}' for source, totals in self.totals.items()]
+
+        lines += ['# HELP dgraphpandas_triples_total Triples emitted.', '# TYPE dgraphpandas_triples_total counter']
+        for source, totals in self.totals.items():
+            for kind in ['intrinsic', 'edges', 'deletes']:
+                lines.append(f'dgraphpandas_triples_total{{source="{source}",kind="{kind}"}} {totals[kind]}')
+
+        lines += ['# HELP dgraphpandas_bytes_total Bytes of exports written before and after compression.', '# TYPE dgraphpandas_bytes_total counter']
+        for source, totals in self.totals.items():
+            lines.append(f'dgraphpandas_bytes_total{{source="{source}",compression="before"}} {totals["bytes_uncompressed"]}')
+            lines.append(f'dgraphpandas_bytes_total{{source="{source}",compression="after"}} {totals["bytes_compressed"]}')
+
+        lines += ['# HELP dgraphpandas_stage_seconds_total Seconds spent in each stage.', '# TYPE dgraphpandas_stage_seconds_total counter']
+        for source, totals in self.totals.items():
+            for stage, seconds in totals['seconds'].items():
+                lines.append(f'dgraphpandas_stage_seconds_total{{source="{source}",stage="{stage}"}} {seconds:.6f}')
+
+        lines += ['# HELP dgraphpandas_rows_per_second Rows processed per second across all stages.', '# TYPE dgraphpandas_rows_per_second gauge']
+        for source, totals in self.totals.items():
+            total_seconds = sum(totals['seconds'].values())
+            if total_seconds:
+                lines.append(f'dgraphpandas_rows_per_second{{source="{source}"}} {totals["rows"] / total_seconds:.3f}')
+
+        logger.info(f'Writing metrics to {self.prometheus_file}')
+        with open(self.prometheus_file + '.tmp', 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(self.prometheus_file + '.tmp', self.prometheus_file)
+
+
+@contextmanager
+def _time_stage(metrics: Union[RunMetrics, None], name: str):
+    if metrics is None:
+        yield
+    else:
+        with metrics.stage(name):
+            yield
@@ -0,0 +1,86 @@
+import os
+import time
+import cProfile
+import logging
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+
+from dgraphpandas.hooks import StageHooks
+
+logger = logging.getLogger(__name__)
+
+
+class StageProfiler(StageHooks):
+    '''
+    Stage hooks which time every stage of a transform and total the rows
+    going in and coming out of it.
+
+    When cprofile is set, each stage also gets its own cProfile.Profile so
+    the functions within a single stage can be inspected with pstats.
+    '''
+
+    def __init__(self, cprofile: bool = False):
+        self.cprofile = cprofile
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self._started: List[float] = []
+
+    def on_stage_start(self, stage: str, rows: Union[int, None]):
+        record = self.stages.setdefault(stage, {'calls': 0, 'seconds': 0.0, 'rows_in': 0, 'rows_out': 0})
+        record['calls'] += 1
+        record['rows_in'] += rows or 0
+
+        if self.cprofile:
+            self.profiles.setdefault(stage, cProfile.Profile()).enable()
+        self._started.append(time.perf_counter())
+
+    def on_stage_end(self, stage: str, rows: Union[int, None]):
+        seconds = time.perf_counter() - self._started.pop()
+        if self.cprofile:
+            self.profiles[stage].disable()
+
+        record = self.stages[stage]
+        record['seconds'] += seconds
+        record['rows_out'] += rows or 0
+
+    def report(self) -> pd.DataFrame:
+        '''
+        A row per stage with its calls, seconds, share of the total time
+        and rows, slowest stage first.
+        '''
+        columns = ['stage', 'calls', 'seconds', 'percent', 'rows_in', 'rows_out', 'rows_per_second']
+        total_seconds = sum(record['seconds'] for record in self.stages.values())
+
+        rows = []
+        for stage, record in self.stages.items():
+            seconds = record['seconds']
+            rows.append({
+                'stage': stage,
+                'calls': record['calls'],
+                'seconds': round(seconds, 6),
+                'percent': round(100 * seconds / total_seconds, 2) if total_seconds else 0.0,
+                'rows_in': record['rows_in'],
+                'rows_out': record['rows_out'],
+                'rows_per_second': round(record['rows_in'] / seconds) if seconds else None
+            })
+
+        report = pd.DataFrame(rows, columns=columns)
+        return report.sort_values(by='seconds', ascending=False).reset_index(drop=True)
+
+    def dump(self, directory: str) -> List[str]:
+        '''
+        Writes the cProfile stats of every stage to <directory>/<stage>.prof
+        '''
+        if not directory:
+            raise ValueError('directory')
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for stage, profile in self.profiles.items():
+            path = os.path.join(directory, stage + '.prof')
+            logger.info(f'Writing {stage} profile to {path}')
+            profile.dump_stats(path)
+            paths.append(path)
+
+        return paths
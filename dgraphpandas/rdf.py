@@ -1,17 +1,36 @@
 import os
+import glob
 import logging
 import gzip
+import sqlite3
 from typing import Any, Dict, Union, Tuple, List, Callable
 
 import pandas as pd
 
 from dgraphpandas.config import get_from_config, _get_config
+from dgraphpandas.incremental import _open_state, _apply_incremental_state, _finish_incremental_state
 from dgraphpandas.writers.upserts import generate_upserts
+from dgraphpandas.writers.batching import subject_batches
+from dgraphpandas.writers.sharding import shard_of, shard_statements, even_shards
+from dgraphpandas.writers.schema import generate_schema
+from dgraphpandas.writers.json_mutations import generate_json_mutations, generate_json_mutations_from_frames, write_json_mutations
+from dgraphpandas.writers.dql import generate_upsert_blocks, write_upsert_blocks
+from dgraphpandas.writers.dedup import TripleDeduplicator
+from dgraphpandas.writers.dgraph_http import DgraphHttpSink, create_sink
+from dgraphpandas.metrics import RunMetrics, _time_stage
+from dgraphpandas.manifest import manifest_entry, append_manifest, new_run
+from dgraphpandas.hooks import _run_stage, register_stage_hooks, unregister_stage_hooks
+from dgraphpandas.memory import AdaptiveChunker
+from dgraphpandas.spill import FrameSpiller
 from dgraphpandas.strategies.vertical import vertical_transform
 from dgraphpandas.strategies.horizontal import horizontal_transform
+from dgraphpandas.strategies.transformer import Transformer
+from dgraphpandas.strategies.schema import create_schema
 
 logger = logging.getLogger(__name__)
 
+_output_formats = ['rdf', 'json', 'bulk', 'dql']
+
 
 def _resolve_transform(config: Dict[str, Any]):
     '''
@@ -53,6 +72,8 @@ def to_rdf(
         If chunking was applied then a list of tuples
         If no chunking then just a tuple
         Each tuple has two items: intrinsic and edges
+        These are empty when the exports are written without making them all
+        (json mutations or a spilled chunk), see Working with Larger Files
     '''
     if frame is None:
         raise ValueError('frame')
@@ -62,34 +83,301 @@ def to_rdf(
         raise ValueError('config_key')
 
     config = _get_config(config)
-    transform_func = _resolve_transform(config)
 
     '''
-    The Frame may be a file path or already loaded DataFrame.
-    If it's a string then attempt to load the file.
+    The built in transforms are compiled once so that settings and callables
+    are not resolved again for every chunk of the file. An already compiled
+    Transformer can be passed in to reuse it across calls.
     '''
-    if isinstance(frame, str):
-        file_config = config['files'][config_key]
-        read_csv_options: Dict[str, Any] = get_from_config('read_csv_options', file_config, {}, **(kwargs))
-        chunk_size: int = get_from_config('chunk_size', config, 10_000_000, **(kwargs))
-        source_file_name = os.path.basename(frame).split('.')[0]
+    transform_func: Union[Callable, Transformer] = kwargs.pop('transformer', None) or _resolve_transform(config)
+    if transform_func is horizontal_transform or transform_func is vertical_transform:
+        transform_func = Transformer(config, config_key, **(kwargs))
 
-        result = []
-        for index, frame in enumerate(pd.read_csv(frame, chunksize=chunk_size, **(read_csv_options))):
-            result.append(to_rdf_from_frame(frame, config, config_key, transform_func, source_file_name, output_dir, index, **(kwargs)))
-        return result
-    else:
-        return to_rdf_from_frame(frame, config, config_key, transform_func, config_key, output_dir, 0, **(kwargs))
+    '''
+    on_chunk is called with the chunk index and its (intrinsic, edges) upserts
+    after each chunk of a file has been written, e.g for reporting progress.
+    '''
+    on_chunk: Callable[[int, Tuple[List[str], List[str]]], None] = kwargs.pop('on_chunk', None)
+
+    '''
+    The exports of a file are named after it up to the first dot (titles.csv becomes titles_intrinsic.gz)
+    unless an output_prefix is passed in, e.g so files which only differ after a dot do not overwrite each other.
+    '''
+    output_prefix: str = kwargs.pop('output_prefix', None)
+
+    '''
+    Duplicate statements can be removed across every chunk (and across calls
+    if the same deduplicator is passed in) after the upserts have been generated.
+    '''
+    dedup: bool = get_from_config('dedup', config, False, **(kwargs))
+    deduplicator: TripleDeduplicator = kwargs.pop('deduplicator', None)
+    owns_deduplicator = dedup and deduplicator is None
+    if owns_deduplicator:
+        dedup_memory_limit: int = get_from_config('dedup_memory_limit', config, 256 * 1024 * 1024, **(kwargs))
+        dedup_dir: str = get_from_config('dedup_dir', config, None, **(kwargs))
+        deduplicator = TripleDeduplicator(dedup_memory_limit, dedup_dir)
+
+    '''
+    Throughput metrics for every chunk are recorded when a metrics_file or
+    metrics_prometheus_file is configured (or a RunMetrics is passed in to share across calls).
+    '''
+    metrics: RunMetrics = kwargs.pop('metrics', None)
+    metrics_file: str = get_from_config('metrics_file', config, None, **(kwargs))
+    metrics_prometheus_file: str = get_from_config('metrics_prometheus_file', config, None, **(kwargs))
+    owns_metrics = metrics is None and bool(metrics_file or metrics_prometheus_file)
+    if owns_metrics:
+        metrics = RunMetrics(metrics_file, metrics_prometheus_file)
+
+    '''
+    When a dgraph_address is configured (or a sink is passed in) every chunk
+    is also sent straight to Dgraph as upsert mutations.
+    '''
+    sink: DgraphHttpSink = kwargs.pop('sink', None)
+    owns_sink = sink is None
+    if owns_sink:
+        sink = create_sink(config, **(kwargs))
+
+    '''
+    With incremental_state, every chunk of a file is compared against the same state
+    store and predicates which were removed are only decided once all of them have been seen.
+    '''
+    incremental_state: str = get_from_config('incremental_state', config, None, **(kwargs))
+    state: sqlite3.Connection = None
+
+    '''
+    Every export of this conversion is recorded in the manifest with
+    the same run, so a loader only takes the latest run of a file.
+    '''
+    manifest_run = new_run()
+
+    chunker: AdaptiveChunker = None
+    try:
+        '''
+        The Frame may be a file path or already loaded DataFrame.
+        If it's a string then attempt to load the file.
+        '''
+        if isinstance(frame, str):
+            file_config = config['files'][config_key]
+            read_csv_options: Dict[str, Any] = get_from_config('read_csv_options', file_config, {}, **(kwargs))
+            chunk_size: int = get_from_config('chunk_size', config, 10_000_000, **(kwargs))
+            source_file_name = output_prefix or os.path.basename(frame).split('.')[0]
+
+            '''
+            With a memory_limit the rows of each chunk are adapted to the
+            memory measured while converting the last one (up to chunk_size).
+            '''
+            memory_limit: int = get_from_config('memory_limit', config, None, **(kwargs))
+            if memory_limit:
+                chunker = AdaptiveChunker(memory_limit, chunk_size)
+                register_stage_hooks(chunker, thread_local=True)
+                chunks = chunker.chunks(pd.read_csv(frame, iterator=True, **(read_csv_options)))
+            else:
+                chunks = pd.read_csv(frame, chunksize=chunk_size, **(read_csv_options))
+            if metrics is not None:
+                chunks = metrics.timed(chunks, source_file_name)
+
+            if incremental_state:
+                state = _open_state(incremental_state)
+
+            result = []
+            for index, frame in enumerate(chunks):
+                result.append(to_rdf_from_frame(
+                    frame, config, config_key, transform_func, source_file_name, output_dir, index,
+                    deduplicator=deduplicator, metrics=metrics, sink=sink, state=state, manifest_run=manifest_run, **(kwargs)))
+                if on_chunk:
+                    on_chunk(index, result[-1])
+
+            if state is not None:
+                removed = _finish_incremental_state(state, config_key)
+                _export_removed(removed, config, config_key, source_file_name, output_dir, sink, manifest_run, **(kwargs))
+                logger.debug('Committing incremental state')
+                state.commit()
+            return result
+        else:
+            return to_rdf_from_frame(
+                frame, config, config_key, transform_func, output_prefix or config_key, output_dir, 0,
+                deduplicator=deduplicator, metrics=metrics, sink=sink, manifest_run=manifest_run, **(kwargs))
+    finally:
+        if chunker is not None:
+            unregister_stage_hooks(chunker)
+        if state is not None:
+            state.close()
+        if owns_deduplicator:
+            deduplicator.close()
+        if owns_sink and sink is not None:
+            sink.close()
+        if owns_metrics:
+            metrics.write_prometheus()
+
+
+def _write_gz(path: str, lines: List[str], encoding: str, compresslevel: int, metrics: Union[RunMetrics, None] = None):
+    with gzip.open(path, mode='wb', compresslevel=compresslevel) as zip_file:
+        s = '\n'.join(lines)
+        s = s.encode(encoding=encoding)
+        zip_file.write(s)
+
+    if metrics is not None:
+        metrics.count('bytes_uncompressed', len(s))
+        metrics.count('bytes_compressed', os.path.getsize(path))
+
+
+class _PartitionExports:
+    '''
+    The intrinsic and edge exports of a spilled chunk (one of each for every shard) kept
+    open so the statements of each partition are written as soon as it has been converted
+    rather than being gathered for the whole chunk.
+    '''
+
+    def __init__(
+            self,
+            exports: List[Tuple[str, Union[int, None]]],
+            intrinsic_name: str,
+            edges_name: str,
+            encoding: str,
+            compresslevel: int):
+        self.encoding = encoding
+        self.shards = len(exports) if exports[0][1] is not None else None
+        self.files: List[Dict[str, Any]] = []
+        for kind, name in [('intrinsic', intrinsic_name), ('edges', edges_name)]:
+            for directory, shard in exports:
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, name + '.gz')
+                self.files.append({
+                    'path': path,
+                    'kind': kind,
+                    'shard': shard,
+                    'file': gzip.open(path, mode='wb', compresslevel=compresslevel),
+                    'statements': 0,
+                    'bytes': 0
+                })
+
+    def write(self, kind: str, statements: List[str]):
+        routed = shard_statements(statements, self.shards) if self.shards else [statements]
+        files = [f for f in self.files if f['kind'] == kind]
+        for export, lines in zip(files, routed):
+            if not lines:
+                continue
+            s = ('\n' if export['statements'] else '') + '\n'.join(lines)
+            s = s.encode(encoding=self.encoding)
+            export['file'].write(s)
+            export['statements'] += len(lines)
+            export['bytes'] += len(s)
+
+    def close(self, metrics: Union[RunMetrics, None] = None) -> List[Dict[str, Any]]:
+        for export in self.files:
+            if not export['file'].closed:
+                export['file'].close()
+                if metrics is not None:
+                    metrics.count('bytes_uncompressed', export['bytes'])
+                    metrics.count('bytes_compressed', os.path.getsize(export['path']))
+        return self.files
+
+
+def _write_json_gz(
+        path: str,
+        mutations: List[Dict[str, Any]],
+        encoding: str,
+        compresslevel: int,
+        batch_size: int,
+        metrics: Union[RunMetrics, None] = None):
+    written = write_json_mutations(path, mutations, encoding, compresslevel, batch_size)
+
+    if metrics is not None:
+        metrics.count('bytes_uncompressed', written)
+        metrics.count('bytes_compressed', os.path.getsize(path))
+
+
+def _write_dql_gz(path: str, blocks: List[str], encoding: str, compresslevel: int, metrics: Union[RunMetrics, None] = None):
+    written = write_upsert_blocks(path, blocks, encoding, compresslevel)
+
+    if metrics is not None:
+        metrics.count('bytes_uncompressed', written)
+        metrics.count('bytes_compressed', os.path.getsize(path))
+
+
+def _export_removed(
+        deletes: List[str],
+        config: Dict[str, Any],
+        config_key: str,
+        source_file_name: str,
+        output_dir: Union[str, None],
+        sink: Union[DgraphHttpSink, None],
+        manifest_run: Union[str, None] = None,
+        **kwargs):
+    '''
+    Writes (and sends) the deletes for predicates removed since the last
+    incremental run, which are only known once every chunk has been converted.
+
+    The removed exports of an earlier run are deleted first, as their
+    predicates are already gone and loading them again would delete current data.
+    '''
+    file_config = config['files'][config_key]
+    export_rdf: bool = get_from_config('export_rdf', file_config, False, **(kwargs))
+
+    if output_dir is not None and export_rdf:
+        for directory in ['', 'shard_*']:
+            for extension in ['.gz', '.dql.gz']:
+                for stale_path in glob.glob(os.path.join(output_dir, directory, glob.escape(source_file_name) + '_removed' + extension)):
+                    logger.info(f'Removing {stale_path} of an earlier run')
+                    os.remove(stale_path)
+
+    if not deletes:
+        return
+
+    encoding: str = get_from_config('encoding', file_config, 'utf-8', **(kwargs))
+    gz_compression_level: int = get_from_config('gz_compression_level', file_config, 9, **(kwargs))
+    output_format: str = get_from_config('output_format', config, 'rdf', **(kwargs))
+    dql_batch_size: int = get_from_config('dql_batch_size', config, 100, **(kwargs))
+    upsert_predicate: str = get_from_config('dgraph_upsert_predicate', config, 'xid', **(kwargs))
+
+    if output_dir is not None and export_rdf:
+        shards: int = get_from_config('shards', config, None, **(kwargs))
+        if shards and output_format != 'bulk':
+            exports = [
+                (os.path.join(output_dir, f'shard_{shard}'), shard, shard_deletes)
+                for shard, shard_deletes in enumerate(shard_statements(deletes, shards))]
+        else:
+            exports = [(output_dir, None, deletes)]
+
+        written: List[Dict[str, Any]] = []
+        for directory, shard, statements in exports:
+            if not statements:
+                continue
+            os.makedirs(directory, exist_ok=True)
+            removed_base_path = os.path.join(directory, source_file_name + '_removed')
+            if output_format == 'dql':
+                removed_path = removed_base_path + '.dql.gz'
+                _write_dql_gz(removed_path, generate_upsert_blocks(statements, dql_batch_size, upsert_predicate, delete=True), encoding, gz_compression_level)
+            else:
+                removed_path = removed_base_path + '.gz'
+                _write_gz(removed_path, statements, encoding, gz_compression_level)
+            logger.info(f'Writing {len(statements)} deletes of removed predicates to {removed_path}')
+            written.append(manifest_entry(
+                output_dir, removed_path, 'deletes', 'dql' if output_format == 'dql' else 'rdf', len(statements), source_file_name, None, shard, manifest_run))
+
+        if get_from_config('manifest', config, False, **(kwargs)):
+            append_manifest(output_dir, written)
+
+    if sink is not None:
+        if output_format == 'dql':
+            _run_stage('sink', sink.send_blocks, generate_upsert_blocks(deletes, dql_batch_size, sink.upsert_predicate, delete=True))
+        else:
+            _run_stage('sink', sink.send, deletes, delete=True)
 
 
 def to_rdf_from_frame(
         frame: pd.DataFrame,
         config: Dict[str, Any],
         config_key,
-        transform_func: Callable,
+        transform_func: Union[Callable, Transformer],
         source_file_name: str,
         output_dir: str,
         index: int = 0,
+        deduplicator: Union[TripleDeduplicator, None] = None,
+        metrics: Union[RunMetrics, None] = None,
+        sink: Union[DgraphHttpSink, None] = None,
+        state: Union[sqlite3.Connection, None] = None,
+        manifest_run: Union[str, None] = None,
         **kwargs):
 
     file_config = config['files'][config_key]
@@ -98,48 +386,305 @@ def to_rdf_from_frame(
     export_rdf: bool = get_from_config('export_rdf', file_config, False, **(kwargs))
     encoding: str = get_from_config('encoding', file_config, 'utf-8', **(kwargs))
     gz_compression_level: int = get_from_config('gz_compression_level', file_config, 9, **(kwargs))
+    incremental_state: str = get_from_config('incremental_state', config, None, **(kwargs))
+    batch_by_subject: bool = get_from_config('subject_batches', config, False, **(kwargs))
+    output_format: str = get_from_config('output_format', config, 'rdf', **(kwargs))
+    if output_format not in _output_formats:
+        raise ValueError(f'output_format {output_format} is not one of {_output_formats}')
+    blank_nodes = output_format == 'bulk'
+    if blank_nodes and sink is not None:
+        raise ValueError('output_format bulk writes blank nodes for dgraph bulk which cannot be sent to Dgraph as upserts')
+    if output_format == 'dql':
+        dql_batch_size: int = get_from_config('dql_batch_size', config, 100, **(kwargs))
+        upsert_predicate: str = get_from_config('dgraph_upsert_predicate', config, 'xid', **(kwargs))
 
-    logger.info('Transforming Source Frame to Rdf Frame')
-    intrinsic, edges = transform_func(frame, config, config_key, **(kwargs))
-    if console:
-        print('Intrinsic \n', intrinsic)
-        print('Edges \n', edges)
+    if metrics is not None and not metrics.in_chunk:
+        metrics.start_chunk(source_file_name, index, len(frame))
 
-    intrinsic_upserts, edges_upserts = generate_upserts(intrinsic, edges)
     if output_dir is not None:
         os.makedirs(output_dir, exist_ok=True)
         if index == 0:
             intrinsic_base_path = os.path.join(output_dir, source_file_name + '_intrinsic')
             edges_base_path = os.path.join(output_dir, source_file_name + '_edges')
+            deletes_base_path = os.path.join(output_dir, source_file_name + '_deletes')
+            subjects_base_path = os.path.join(output_dir, source_file_name + '_subjects')
+            bulk_base_path = os.path.join(output_dir, source_file_name + '_bulk')
+            upserts_base_path = os.path.join(output_dir, source_file_name + '_upserts')
+            mutations_base_path = os.path.join(output_dir, source_file_name + '_mutations')
         else:
             intrinsic_base_path = os.path.join(output_dir, source_file_name + '_intrinsic_' + str(index+1))
             edges_base_path = os.path.join(output_dir, source_file_name + '_edges_' + str(index+1))
+            deletes_base_path = os.path.join(output_dir, source_file_name + '_deletes_' + str(index+1))
+            subjects_base_path = os.path.join(output_dir, source_file_name + '_subjects_' + str(index+1))
+            bulk_base_path = os.path.join(output_dir, source_file_name + '_bulk_' + str(index+1))
+            upserts_base_path = os.path.join(output_dir, source_file_name + '_upserts_' + str(index+1))
+            mutations_base_path = os.path.join(output_dir, source_file_name + '_mutations_' + str(index+1))
+
+    '''
+    When spill_rows is set and the frame would expand (melt and csv_edges) beyond it,
+    the frame is partitioned by subject on disk and each partition is transformed
+    and turned into upserts on its own so the long frames stay bounded.
+    '''
+    spill_rows: int = get_from_config('spill_rows', config, None, **(kwargs))
+    if spill_rows:
+        spill_dir: str = get_from_config('spill_dir', config, None, **(kwargs))
+        frames = FrameSpiller(spill_rows, spill_dir).split(frame, config, config_key, **(kwargs))
+    else:
+        frames = [frame]
+
+    '''
+    With shards, every statement is routed by a stable hash of its subject into a
+    shard_<k> directory, so a subject lands in the same shard across every file and chunk.
+    '''
+    shards: int = get_from_config('shards', config, None, **(kwargs))
+
+    '''
+    The intrinsic and edge exports of a spilled chunk are written (and sent) a partition at a time
+    so the statements of the whole chunk are never held together. They are then not returned.
+    The other formats group or cut the statements of the whole chunk so still gather them.
+    '''
+    partition_exports: Union[_PartitionExports, None] = None
+    if spill_rows and output_dir is not None and export_rdf and output_format == 'rdf' and not batch_by_subject:
+        partition_directories = [(os.path.join(output_dir, f'shard_{shard}'), shard) for shard in range(shards)] if shards else [(output_dir, None)]
+        partition_exports = _PartitionExports(
+            partition_directories, os.path.basename(intrinsic_base_path), os.path.basename(edges_base_path), encoding, gz_compression_level)
 
-        if export_csv:
-            intrinsic_csv_path = intrinsic_base_path + '.csv'
-            edges_csv_path = edges_base_path + '.csv'
+    '''
+    JSON mutations are built straight from the transformed frames so no statements are made for them
+    (and none are returned), unless the statements are needed to be deduplicated or sent to Dgraph.
+    '''
+    frame_mutations: Union[List[Dict[str, Any]], None] = None
+    if output_format == 'json' and output_dir is not None and export_rdf and deduplicator is None and sink is None:
+        frame_mutations = []
+
+    '''
+    Without a state (shared by every chunk of a run), the frame is the whole run.
+    '''
+    owns_state = state is None and bool(incremental_state)
+    if owns_state:
+        state = _open_state(incremental_state)
+
+    try:
+        intrinsic_upserts: List[str] = []
+        edges_upserts: List[str] = []
+        deletes: List[str] = []
+        intrinsic_count = 0
+        edges_count = 0
+        try:
+            for partition, frame in enumerate(frames):
+                logger.info('Transforming Source Frame to Rdf Frame')
+                with _time_stage(metrics, 'transform'):
+                    if isinstance(transform_func, Transformer):
+                        intrinsic, edges = transform_func.transform(frame)
+                    else:
+                        intrinsic, edges = transform_func(frame, config, config_key, **(kwargs))
+                if console:
+                    print('Intrinsic \n', intrinsic)
+                    print('Edges \n', edges)
+
+                if state is not None:
+                    logger.info(f'Filtering unchanged records against {incremental_state}')
+                    with _time_stage(metrics, 'incremental'):
+                        intrinsic, edges = _apply_incremental_state(state, config_key, intrinsic, edges)
 
-            logger.info(f'Writing to {intrinsic_csv_path}')
-            intrinsic.to_csv(intrinsic_csv_path, index=False, encoding=encoding)
+                if frame_mutations is not None:
+                    with _time_stage(metrics, 'upserts'):
+                        frame_mutations.extend(_run_stage('json_mutations', generate_json_mutations_from_frames, intrinsic, edges))
+                    intrinsic_count += int(intrinsic['object'].notna().sum())
+                    edges_count += len(edges)
+                else:
+                    with _time_stage(metrics, 'upserts'):
+                        partition_intrinsic_upserts, partition_edges_upserts = _run_stage(
+                            'generate_upserts', generate_upserts, intrinsic, edges, blank_nodes=blank_nodes)
+                    if deduplicator is not None:
+                        logger.info('Removing duplicate upserts')
+                        with _time_stage(metrics, 'dedup'):
+                            partition_intrinsic_upserts = deduplicator.deduplicate(partition_intrinsic_upserts)
+                            partition_edges_upserts = deduplicator.deduplicate(partition_edges_upserts)
+                    intrinsic_count += len(partition_intrinsic_upserts)
+                    edges_count += len(partition_edges_upserts)
 
-            logger.info(f'Writing to {edges_csv_path}')
-            edges.to_csv(edges_csv_path, index=False, encoding=encoding)
+                    if partition_exports is not None:
+                        with _time_stage(metrics, 'write'):
+                            _run_stage('write_gz', partition_exports.write, 'intrinsic', partition_intrinsic_upserts)
+                            _run_stage('write_gz', partition_exports.write, 'edges', partition_edges_upserts)
+                        if sink is not None:
+                            with _time_stage(metrics, 'sink'):
+                                _run_stage('sink', sink.send, partition_intrinsic_upserts + partition_edges_upserts)
+                    else:
+                        intrinsic_upserts.extend(partition_intrinsic_upserts)
+                        edges_upserts.extend(partition_edges_upserts)
 
-        if export_rdf:
+                if output_dir is not None and export_csv:
+                    intrinsic_csv_path = intrinsic_base_path + '.csv'
+                    edges_csv_path = edges_base_path + '.csv'
+                    append: Dict[str, Any] = {} if partition == 0 else {'mode': 'a', 'header': False}
+
+                    logger.info(f'Writing to {intrinsic_csv_path}')
+                    intrinsic.to_csv(intrinsic_csv_path, index=False, encoding=encoding, **(append))
+
+                    logger.info(f'Writing to {edges_csv_path}')
+                    edges.to_csv(edges_csv_path, index=False, encoding=encoding, **(append))
+        except BaseException:
+            if partition_exports is not None:
+                partition_exports.close()
+            raise
+
+        if owns_state:
+            with _time_stage(metrics, 'incremental'):
+                deletes.extend(_finish_incremental_state(state, config_key))
+
+        if output_dir is not None and export_rdf:
             logger.info('Generating Rdf Upserts from Frames')
 
-            intrinsic_gz_path = intrinsic_base_path + '.gz'
-            logger.info(f'Writing to {len(intrinsic_upserts)} upserts to {intrinsic_gz_path}')
-            with gzip.open(intrinsic_gz_path, mode='wb', compresslevel=gz_compression_level) as zip_file:
-                s = '\n'.join(intrinsic_upserts)
-                s = s.encode(encoding=encoding)
-                zip_file.write(s)
-
-            edges_gz_path = edges_base_path + '.gz'
-            logger.info(f'Writing to {len(edges_upserts)} upserts to {edges_gz_path}')
-            with gzip.open(edges_gz_path, mode='wb', compresslevel=gz_compression_level) as zip_file:
-                s = '\n'.join(edges_upserts)
-                s = s.encode(encoding=encoding)
-                zip_file.write(s)
+            if shards and not blank_nodes:
+                exports = [
+                    (os.path.join(output_dir, f'shard_{shard}'), shard, shard_intrinsic, shard_edges, shard_deletes)
+                    for shard, (shard_intrinsic, shard_edges, shard_deletes)
+                    in enumerate(zip(*(_run_stage('shard_statements', shard_statements, statements, shards)
+                                       for statements in [intrinsic_upserts, edges_upserts, deletes])))]
+            else:
+                exports = [(output_dir, None, intrinsic_upserts, edges_upserts, deletes)]
+
+            if frame_mutations is not None and shards:
+                mutation_shards = shard_of([mutation['uid'][2:] for mutation in frame_mutations], shards)
+
+            '''
+            With manifest, every export written is recorded in the manifest of the output_dir
+            so that a loader knows what each file holds and the order to load them in.
+            '''
+            manifest: bool = get_from_config('manifest', config, False, **(kwargs))
+            written: List[Dict[str, Any]] = []
+            if manifest_run is None:
+                manifest_run = new_run()
+
+            def _written(path: str, kind: str, statements: int, shard: Union[int, None], file_format: str = output_format):
+                written.append(manifest_entry(output_dir, path, kind, file_format, statements, source_file_name, index, shard, manifest_run))
+
+            with _time_stage(metrics, 'write'):
+                if partition_exports is not None:
+                    for export in partition_exports.close(metrics):
+                        logger.info(f'Written {export["statements"]} upserts to {export["path"]}')
+                        _written(export['path'], export['kind'], export['statements'], export['shard'])
+
+                for directory, export_shard, export_intrinsic, export_edges, export_deletes in exports:
+                    os.makedirs(directory, exist_ok=True)
+
+                    if blank_nodes:
+                        '''
+                        dgraph bulk maps every file of its input directory in parallel so rather than being routed
+                        by subject, the statements are cut into shards of the same size. The schema it needs
+                        (with the xid predicate for --store_xids) is written alongside the first chunk.
+                        '''
+                        for shard, statements in enumerate(_run_stage('even_shards', even_shards, export_intrinsic + export_edges, shards or 1)):
+                            bulk_gz_path = bulk_base_path + f'_{shard}.rdf.gz'
+                            logger.info(f'Writing {len(statements)} statements to {bulk_gz_path}')
+                            _run_stage('write_gz', _write_gz, bulk_gz_path, statements, encoding, gz_compression_level, metrics)
+                            _written(bulk_gz_path, 'bulk', len(statements), shard)
+
+                        if index == 0:
+                            bulk_schema_file = source_file_name + '_bulk.schema'
+                            generate_schema(create_schema(config, ensure_xid_predicate=True), export_schema=True, output_dir=directory, export_file=bulk_schema_file)
+                    elif output_format == 'dql':
+                        '''
+                        Upsert blocks which each look up and set dql_batch_size subjects (with all
+                        of their statements) so they can be posted to a live cluster without dgraph live.
+                        '''
+                        upserts_dql_path = os.path.join(directory, os.path.basename(upserts_base_path) + '.dql.gz')
+                        blocks = _run_stage('upsert_blocks', generate_upsert_blocks, export_intrinsic + export_edges, dql_batch_size, upsert_predicate)
+                        logger.info(f'Writing {len(blocks)} upsert blocks to {upserts_dql_path}')
+                        _run_stage('write_dql', _write_dql_gz, upserts_dql_path, blocks, encoding, gz_compression_level, metrics)
+                        _written(upserts_dql_path, 'upserts', len(export_intrinsic) + len(export_edges), export_shard)
+
+                        if export_deletes:
+                            deletes_dql_path = os.path.join(directory, os.path.basename(deletes_base_path) + '.dql.gz')
+                            blocks = _run_stage('upsert_blocks', generate_upsert_blocks, export_deletes, dql_batch_size, upsert_predicate, delete=True)
+                            logger.info(f'Writing {len(blocks)} delete blocks to {deletes_dql_path}')
+                            _run_stage('write_dql', _write_dql_gz, deletes_dql_path, blocks, encoding, gz_compression_level, metrics)
+                            _written(deletes_dql_path, 'deletes', len(export_deletes), export_shard)
+                    elif output_format == 'json':
+                        '''
+                        Dgraph JSON groups the intrinsic and edge statements of every subject into one
+                        object so they are written together rather than as separate exports.
+                        '''
+                        json_batch_size: int = get_from_config('json_batch_size', config, 1000, **(kwargs))
+                        mutations_json_path = os.path.join(directory, os.path.basename(mutations_base_path) + '.json.gz')
+                        if frame_mutations is None:
+                            mutations = _run_stage('json_mutations', generate_json_mutations, export_intrinsic + export_edges)
+                            statements = len(export_intrinsic) + len(export_edges)
+                        elif export_shard is None:
+                            mutations = frame_mutations
+                            statements = intrinsic_count + edges_count
+                        else:
+                            mutations = [mutation for mutation, shard in zip(frame_mutations, mutation_shards) if shard == export_shard]
+                            statements = sum(len(value) if isinstance(value, list) else 1 for mutation in mutations for value in mutation.values()) - len(mutations)
+                        logger.info(f'Writing {len(mutations)} JSON mutations to {mutations_json_path}')
+                        _run_stage('write_json', _write_json_gz, mutations_json_path, mutations, encoding, gz_compression_level, json_batch_size, metrics)
+                        _written(mutations_json_path, 'mutations', statements, export_shard)
+                    elif batch_by_subject:
+                        '''
+                        Rather than separate intrinsic and edge exports, the statements of every subject
+                        are kept together in batches and each loader worker gets an export with
+                        a disjoint set of subjects so concurrent batches do not conflict.
+                        '''
+                        subject_batch_size: int = get_from_config('subject_batch_size', config, 1000, **(kwargs))
+                        subject_batch_workers: int = get_from_config('subject_batch_workers', config, 1, **(kwargs))
+                        worker_batches = _run_stage(
+                            'subject_batches', subject_batches, export_intrinsic + export_edges, subject_batch_size, subject_batch_workers)
+                        for worker, batches in enumerate(worker_batches):
+                            subjects_gz_path = os.path.join(directory, os.path.basename(subjects_base_path) + f'_worker_{worker}.gz')
+                            worker_statements = [statement for batch in batches for statement in batch]
+                            logger.info(f'Writing {len(batches)} batches of subjects to {subjects_gz_path}')
+                            _run_stage('write_gz', _write_gz, subjects_gz_path, worker_statements, encoding, gz_compression_level, metrics)
+                            _written(subjects_gz_path, 'subjects', len(worker_statements), export_shard)
+                    elif partition_exports is None:
+                        intrinsic_gz_path = os.path.join(directory, os.path.basename(intrinsic_base_path) + '.gz')
+                        logger.info(f'Writing to {len(export_intrinsic)} upserts to {intrinsic_gz_path}')
+                        _run_stage('write_gz', _write_gz, intrinsic_gz_path, export_intrinsic, encoding, gz_compression_level, metrics)
+                        _written(intrinsic_gz_path, 'intrinsic', len(export_intrinsic), export_shard)
+
+                        edges_gz_path = os.path.join(directory, os.path.basename(edges_base_path) + '.gz')
+                        logger.info(f'Writing to {len(export_edges)} upserts to {edges_gz_path}')
+                        _run_stage('write_gz', _write_gz, edges_gz_path, export_edges, encoding, gz_compression_level, metrics)
+                        _written(edges_gz_path, 'edges', len(export_edges), export_shard)
+
+                    if export_deletes and output_format != 'dql':
+                        deletes_gz_path = os.path.join(directory, os.path.basename(deletes_base_path) + '.gz')
+                        logger.info(f'Writing to {len(export_deletes)} deletes to {deletes_gz_path}')
+                        _run_stage('write_gz', _write_gz, deletes_gz_path, export_deletes, encoding, gz_compression_level, metrics)
+                        _written(deletes_gz_path, 'deletes', len(export_deletes), export_shard, 'rdf')
+
+            if manifest:
+                append_manifest(output_dir, written)
+
+        if sink is not None:
+            with _time_stage(metrics, 'sink'):
+                if output_format == 'dql':
+                    if deletes:
+                        _run_stage('sink', sink.send_blocks, generate_upsert_blocks(deletes, dql_batch_size, sink.upsert_predicate, delete=True))
+                    _run_stage('sink', sink.send_blocks, generate_upsert_blocks(intrinsic_upserts + edges_upserts, dql_batch_size, sink.upsert_predicate))
+                else:
+                    if deletes:
+                        _run_stage('sink', sink.send, deletes, delete=True)
+                    if partition_exports is None:
+                        _run_stage('sink', sink.send, intrinsic_upserts + edges_upserts)
+
+        if owns_state:
+            logger.debug('Committing incremental state')
+            state.commit()
+    finally:
+        if owns_state:
+            '''
+            When the conversion fails the state is rolled back, so
+            the values which were not exported are exported by a rerun.
+            '''
+            state.rollback()
+            state.close()
+
+    if metrics is not None:
+        metrics.count('intrinsic', intrinsic_count)
+        metrics.count('edges', edges_count)
+        metrics.count('deletes', len(deletes))
+        metrics.end_chunk()
 
     return intrinsic_upserts, edges_upserts
@@ -0,0 +1,287 @@
+import os
+import json
+import time
+import queue
+import socket
+import logging
+import threading
+import socketserver
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+'''
+Parsed configurations and compiled Transformers are cached per process
+(the server process, or each worker process when a pool is used) and
+are invalidated when the configuration file changes.
+'''
+_cache_lock = threading.Lock()
+_config_cache: Dict[Tuple[str, int], Dict[str, Any]] = {}
+_transformer_cache: Dict[Tuple[str, int, str, str], Tuple[Any, threading.Lock]] = {}
+
+
+def _cached_config(config_path: str) -> Tuple[Dict[str, Any], int]:
+    from dgraphpandas.config import _get_config
+
+    modified = os.stat(config_path).st_mtime_ns
+    with _cache_lock:
+        if (config_path, modified) not in _config_cache:
+            logger.debug(f'Caching configuration {config_path}')
+            _config_cache[(config_path, modified)] = _get_config(config_path)
+        return _config_cache[(config_path, modified)], modified
+
+
+def _cached_transformer(config_path: str, config_key: str, options: Dict[str, Any]) -> Tuple[Dict[str, Any], Any, threading.Lock]:
+    from dgraphpandas.strategies.transformer import Transformer
+
+    config, modified = _cached_config(config_path)
+    key = (config_path, modified, config_key, json.dumps(options, sort_keys=True, default=str))
+    with _cache_lock:
+        if key not in _transformer_cache:
+            logger.debug(f'Compiling transformer for {config_key} in {config_path}')
+            _transformer_cache[key] = (Transformer(config, config_key, **(options)), threading.Lock())
+        transformer, lock = _transformer_cache[key]
+
+    return config, transformer, lock
+
+
+def _run_job(job: Dict[str, Any], events) -> None:
+    '''
+    Converts the job's input file into RDF exports, putting a progress
+    event on the events queue for every chunk and finally a result (or error) event.
+
+    A job is a dictionary with config (path), config_file_key, file, output_dir (default .)
+    and options which are passed through as keyword arguments to to_rdf.
+
+    Anything raised (including SystemExit) becomes an error event so neither
+    the server nor a pool worker is taken down by a job.
+    '''
+    started = time.monotonic()
+    try:
+        for field in ['config', 'config_file_key', 'file']:
+            if not job.get(field):
+                raise ValueError(field)
+
+        from dgraphpandas.rdf import to_rdf
+
+        options: Dict[str, Any] = job.get('options', {})
+        config, transformer, lock = _cached_transformer(job['config'], job['config_file_key'], options)
+        totals = {'chunks': 0, 'intrinsic': 0, 'edges': 0}
+
+        def on_chunk(index: int, upserts):
+            intrinsic_upserts, edges_upserts = upserts
+            totals['chunks'] += 1
+            totals['intrinsic'] += len(intrinsic_upserts)
+            totals['edges'] += len(edges_upserts)
+            events.put({'event': 'progress', 'chunk': index, 'intrinsic': len(intrinsic_upserts), 'edges': len(edges_upserts)})
+
+        with lock:
+            to_rdf(
+                job['file'], config, job['config_file_key'], job.get('output_dir', '.'),
+                transformer=transformer, on_chunk=on_chunk, **{'export_rdf': True, **options})
+
+        events.put({'event': 'result', 'status': 'ok', 'file': job['file'], 'seconds': round(time.monotonic() - started, 3), **totals})
+    except BaseException as e:
+        logger.exception(f'Job failed {job}')
+        events.put(_error_event(job, e))
+        if isinstance(e, KeyboardInterrupt):
+            raise
+
+
+def _error_event(job: Dict[str, Any], error: Union[BaseException, str]) -> Dict[str, Any]:
+    message = error if isinstance(error, str) else f'{type(error).__name__}: {error}'
+    return {'event': 'error', 'status': 'failed', 'file': job.get('file'), 'message': message}
+
+
+def _run_job_thread(job: Dict[str, Any], events, future: Future):
+    try:
+        future.set_result(_run_job(job, events))
+    except BaseException as e:  # pragma: no cover
+        future.set_exception(e)
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    '''
+    Reads one job per line (JSON) and streams back
+    its events as JSON lines until the job has finished.
+    '''
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                self._send({'event': 'error', 'status': 'failed', 'message': f'Invalid job: {e}'})
+                continue
+
+            for event in self.server.submit(job):
+                self._send(event)
+
+    def _send(self, event: Dict[str, Any]):
+        self.wfile.write((json.dumps(event) + '\n').encode('utf-8'))
+        self.wfile.flush()
+
+
+class _JobServerMixin:
+
+    daemon_threads = True
+
+    '''
+    How often (seconds) a job which has not sent an event
+    is checked on, in case its worker has died.
+    '''
+    poll_interval = 0.5
+
+    def start_workers(self, workers: int):
+        self.workers = workers
+        self.manager = None
+        self.executor = None
+        self.executor_lock = threading.Lock()
+        if workers:
+            logger.info(f'Starting {workers} workers')
+            self.manager = multiprocessing.Manager()
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+
+    def _submit_to_pool(self, job: Dict[str, Any], events) -> Future:
+        '''
+        A worker which died breaks the whole pool so it is
+        replaced before the job is submitted to it.
+        '''
+        with self.executor_lock:
+            try:
+                return self.executor.submit(_run_job, job, events)
+            except BrokenProcessPool:
+                logger.warning(f'Restarting the broken pool of {self.workers} workers')
+                self.executor.shutdown(wait=False)
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+                return self.executor.submit(_run_job, job, events)
+
+    def submit(self, job: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        '''
+        Runs the job and yields its events until the result or error. The job is
+        watched alongside its events so if it ends without one (e.g the worker
+        process died) its exception is turned into an error event instead.
+        '''
+        if self.executor is None:
+            events = queue.Queue()
+            future = Future()
+            threading.Thread(target=_run_job_thread, args=(job, events, future), daemon=True).start()
+        else:
+            events = self.manager.Queue()
+            future = self._submit_to_pool(job, events)
+
+        while True:
+            try:
+                event = events.get(timeout=self.poll_interval)
+            except queue.Empty:
+                if not future.done():
+                    continue
+                try:
+                    event = events.get_nowait()
+                except queue.Empty:
+                    error = future.exception() or 'The job ended without a result'
+                    logger.error(f'Job ended without a result {job}: {error}')
+                    yield _error_event(job, error)
+                    return
+            except (EOFError, OSError) as e:
+                logger.exception(f'Lost the events of job {job}')
+                yield _error_event(job, e)
+                return
+
+            yield event
+            if event['event'] != 'progress':
+                return
+
+    def server_close(self):
+        super().server_close()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.manager.shutdown()
+
+
+class _TCPJobServer(_JobServerMixin, socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixJobServer(_JobServerMixin, socketserver.ThreadingUnixStreamServer):
+        pass
+
+
+def _parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    '''
+    host:port (or just a port) listens on TCP otherwise
+    the address is treated as a Unix socket path.
+    '''
+    host, _, port = address.rpartition(':')
+    if port.isdigit() and os.sep not in address:
+        return (host or '127.0.0.1', int(port))
+    return address
+
+
+def create_server(address: str, workers: int = 0):
+    '''
+    Creates (but does not start) a job server listening on a Unix socket path or
+    a local host:port. When workers is set, jobs are run in a pool of that many processes.
+    '''
+    if not address:
+        raise ValueError('address')
+    if workers < 0:
+        raise ValueError('workers')
+
+    parsed = _parse_address(address)
+    if isinstance(parsed, tuple):
+        server = _TCPJobServer(parsed, _JobHandler)
+    else:
+        if os.path.exists(parsed):
+            os.remove(parsed)
+        server = _UnixJobServer(parsed, _JobHandler)
+
+    server.start_workers(workers)
+    return server
+
+
+def serve(address: str, workers: int = 0):
+    '''
+    Runs a job server until interrupted. See create_server.
+    '''
+    server = create_server(address, workers)
+    logger.info(f'Listening for jobs on {address}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover
+        logger.info('Shutting down')
+    finally:
+        server.server_close()
+        if not isinstance(server.server_address, tuple) and os.path.exists(server.server_address):
+            os.remove(server.server_address)
+
+
+def submit_job(address: str, job: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    '''
+    Sends a job to a running server and yields its events
+    as they arrive. The last event is the result or error.
+    '''
+    if not address:
+        raise ValueError('address')
+    if not job:
+        raise ValueError('job')
+
+    parsed = _parse_address(address)
+    family = socket.AF_INET if isinstance(parsed, tuple) else socket.AF_UNIX
+    with socket.socket(family, socket.SOCK_STREAM) as connection:
+        connection.connect(parsed)
+        connection.sendall((json.dumps(job) + '\n').encode('utf-8'))
+        with connection.makefile('r', encoding='utf-8') as f:
+            for line in f:
+                event = json.loads(line)
+                yield event
+                if event['event'] != 'progress':
+                    return
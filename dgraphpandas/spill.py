@@ -0,0 +1,109 @@
+import os
+import math
+import shutil
+import logging
+import tempfile
+from typing import Any, Dict, Iterator, List, Union
+
+import pandas as pd
+
+from dgraphpandas.config import get_from_config
+
+logger = logging.getLogger(__name__)
+
+
+def _estimate_rows(frame: pd.DataFrame, config: Dict[str, Any], config_key: str, **kwargs) -> int:
+    '''
+    Estimates the rows of the long (vertical) frame once the input has been melted
+    and the csv_edges have been expanded, without doing either.
+    '''
+    if frame is None:
+        raise ValueError('frame')
+
+    file_config: Dict[str, Any] = config['files'][config_key]
+    csv_edges: List[str] = get_from_config('csv_edges', file_config, [], **(kwargs))
+    csv_edges_seperator: str = get_from_config('csv_edges_seperator', file_config, ',', **(kwargs))
+
+    if config.get('transform', 'horizontal') == 'vertical':
+        predicate_field = get_from_config('predicate_field', file_config, 'predicate', **(kwargs))
+        object_field = get_from_config('object_field', file_config, 'object', **(kwargs))
+        rows = len(frame)
+        if not csv_edges or callable(predicate_field) or callable(object_field) or predicate_field not in frame or object_field not in frame:
+            return rows
+        csv_objects = frame.loc[frame[predicate_field].isin(csv_edges), object_field]
+    else:
+        subject_fields = get_from_config('subject_fields', file_config, [], **(kwargs))
+        rows = len(frame) * max(frame.shape[1] - len(subject_fields), 0)
+        columns = [col for col in csv_edges if col in frame]
+        if not columns:
+            return rows
+        csv_objects = pd.concat([frame[col] for col in columns])
+
+    return rows + int(csv_objects.astype(str).str.count(csv_edges_seperator).sum())
+
+
+def _subject_columns(frame: pd.DataFrame, config: Dict[str, Any], config_key: str, **kwargs) -> List[str]:
+    file_config: Dict[str, Any] = config['files'][config_key]
+    subject_fields = get_from_config('subject_fields', file_config, [], **(kwargs))
+    if callable(subject_fields):
+        subject_fields = subject_fields(frame)
+    return [col for col in subject_fields if col in frame]
+
+
+class FrameSpiller:
+    '''
+    Splits a frame which would be too long once melted and expanded
+    into partitions by a hash of its subject, written to disk.
+
+    Every row of a subject lands in the same partition so each partition can go
+    through the transform and the upserts on its own and the output stays the same
+    (only the order of the statements changes). The partitions are pickled so the
+    dtypes read back are the same as the input.
+    '''
+
+    def __init__(self, spill_rows: int, spill_dir: Union[str, None] = None):
+        if not spill_rows or spill_rows <= 0:
+            raise ValueError('spill_rows')
+
+        self.spill_rows = spill_rows
+        self.spill_dir = spill_dir
+
+    def partitions(self, frame: pd.DataFrame, config: Dict[str, Any], config_key: str, **kwargs) -> int:
+        '''
+        The number of partitions needed to keep every
+        partition under spill_rows once expanded.
+        '''
+        estimated = _estimate_rows(frame, config, config_key, **(kwargs))
+        return max(1, math.ceil(estimated / self.spill_rows))
+
+    def split(self, frame: pd.DataFrame, config: Dict[str, Any], config_key: str, **kwargs) -> Iterator[pd.DataFrame]:
+        '''
+        Yields the frame itself when it is small enough,
+        else each partition in turn read back from disk.
+        '''
+        partitions = self.partitions(frame, config, config_key, **(kwargs))
+        subject_columns = _subject_columns(frame, config, config_key, **(kwargs))
+        if partitions == 1 or not subject_columns:
+            yield frame
+            return
+
+        directory = tempfile.mkdtemp(prefix='dgraphpandas_spill_', dir=self.spill_dir)
+        try:
+            logger.info(f'Spilling {len(frame)} rows into {partitions} partitions in {directory}')
+            assignments = pd.util.hash_pandas_object(frame[subject_columns], index=False).values % partitions
+
+            paths = []
+            for partition in range(partitions):
+                part = frame[assignments == partition]
+                if len(part):
+                    path = os.path.join(directory, f'{partition}.pkl')
+                    part.to_pickle(path)
+                    paths.append(path)
+
+            for path in paths:
+                logger.debug(f'Reading partition {path}')
+                part = pd.read_pickle(path)
+                os.remove(path)
+                yield part
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
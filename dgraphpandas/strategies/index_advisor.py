@@ -0,0 +1,235 @@
+import logging
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from dgraphpandas.config import get_from_config, _get_config
+from dgraphpandas.strategies.transformer import Transformer
+
+logger = logging.getLogger(__name__)
+
+_posting_bytes = 8
+_hash_key_bytes = 8
+
+
+class _HyperLogLog:
+    '''
+    A HyperLogLog distinct count estimator with 2^precision registers
+    which is updated with whole arrays of 64 bit hashes at a time.
+    '''
+
+    def __init__(self, precision: int = 12):
+        if precision < 4 or precision > 16:
+            raise ValueError('precision')
+
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        if not len(hashes):
+            return
+
+        hashes = hashes.astype(np.uint64)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remaining = (hashes << np.uint64(self.precision)) | np.uint64(1 << (self.precision - 1))
+        np.maximum.at(self.registers, index, _leading_zeros(remaining) + 1)
+
+    def count(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+
+        return float(estimate)
+
+
+def _leading_zeros(values: np.ndarray) -> np.ndarray:
+    '''
+    Counts the leading zero bits of 64 bit integers. Each 32 bit half is
+    small enough to be represented exactly as a float so log2 is exact.
+    '''
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+
+    with np.errstate(divide='ignore'):
+        high_zeros = 31 - np.floor(np.log2(high))
+        low_zeros = 63 - np.floor(np.log2(low))
+
+    zeros = np.where(high > 0, high_zeros, np.where(low > 0, low_zeros, 64))
+    return zeros.astype(np.uint8)
+
+
+class _PredicateProfile:
+
+    def __init__(self, rdf_type: str, precision: int):
+        self.rdf_type = rdf_type
+        self.count = 0
+        self.total_length = 0
+        self.total_tokens = 0
+        self.total_token_length = 0
+        self.values = _HyperLogLog(precision)
+        self.tokens = _HyperLogLog(precision)
+
+
+def profile_predicates(frames: Iterable[pd.DataFrame], precision: int = 12) -> pd.DataFrame:
+    '''
+    Profiles transformed intrinsic frames in a single streaming pass.
+    For every predicate this estimates the distinct value count (HyperLogLog),
+    the average value length and the average number of (whitespace separated) tokens.
+    '''
+    if frames is None:
+        raise ValueError('frames')
+
+    profiles: Dict[str, _PredicateProfile] = {}
+    for frame in frames:
+        if frame.empty:
+            continue
+
+        frame = frame.loc[frame['predicate'] != 'dgraph.type']
+        values = frame['object'].astype(str)
+        lengths = values.str.len()
+        tokens = values.str.split()
+        token_counts = tokens.str.len()
+        value_hashes = pd.util.hash_pandas_object(values, index=False).values
+
+        exploded = tokens.explode().dropna().astype(str).str.lower()
+        token_frame = pd.DataFrame({
+            'predicate': frame['predicate'].reindex(exploded.index).values,
+            'hash': pd.util.hash_pandas_object(exploded, index=False).values,
+            'length': exploded.str.len().values
+        })
+        token_positions = token_frame.groupby('predicate', sort=False).indices
+
+        for predicate, positions in frame.groupby('predicate', sort=False).indices.items():
+            if predicate not in profiles:
+                profiles[predicate] = _PredicateProfile(frame['type'].iloc[positions[0]], precision)
+
+            profile = profiles[predicate]
+            profile.count += len(positions)
+            profile.total_length += int(lengths.values[positions].sum())
+            profile.total_tokens += int(token_counts.values[positions].sum())
+            profile.values.update(value_hashes[positions])
+
+            if predicate in token_positions:
+                predicate_tokens = token_positions[predicate]
+                profile.tokens.update(token_frame['hash'].values[predicate_tokens])
+                profile.total_token_length += int(token_frame['length'].values[predicate_tokens].sum())
+
+    rows = []
+    for predicate, profile in profiles.items():
+        rows.append({
+            'predicate': predicate,
+            'type': profile.rdf_type,
+            'count': profile.count,
+            'distinct': min(round(profile.values.count()), profile.count),
+            'distinct_tokens': round(profile.tokens.count()),
+            'average_length': profile.total_length / profile.count,
+            'average_tokens': profile.total_tokens / profile.count,
+            'average_token_length': profile.total_token_length / profile.total_tokens if profile.total_tokens else 0.0,
+        })
+
+    return pd.DataFrame(rows, columns=[
+        'predicate', 'type', 'count', 'distinct', 'distinct_tokens', 'average_length', 'average_tokens', 'average_token_length'])
+
+
+def _estimate_index_bytes(profile: Dict[str, Any]) -> Dict[str, int]:
+    '''
+    Rough index size estimates per tokenizer: one key per distinct token
+    and one posting per (token, node) pair.
+    '''
+    count = profile['count']
+    distinct = profile['distinct']
+    return {
+        'exact': int(distinct * (profile['average_length'] + _posting_bytes) + count * _posting_bytes),
+        'hash': int(distinct * (_hash_key_bytes + _posting_bytes) + count * _posting_bytes),
+        'term': int(profile['distinct_tokens'] * (profile['average_token_length'] + _posting_bytes) + count * profile['average_tokens'] * _posting_bytes),
+        'trigram': int(distinct * max(profile['average_length'] - 2, 1) * 3 + count * max(profile['average_length'] - 2, 1) * _posting_bytes),
+    }
+
+
+def _suggest_index(profile: Dict[str, Any]) -> Tuple[str, int]:
+    '''
+    Suggests a tokenizer for the profiled predicate along with its estimated size.
+
+    - Non string types use their type tokenizer
+    - Free text (several tokens per value) uses term
+    - Long, mostly unique values use hash as keys stay a fixed size
+    - Everything else uses exact which also supports sorting and inequality
+    '''
+    rdf_type = profile['type']
+    numeric_tokenizers = {'<xs:int>': 'int', '<xs:float>': 'float', '<xs:boolean>': 'bool', '<xs:dateTime>': 'year'}
+    if rdf_type in numeric_tokenizers:
+        tokenizer = numeric_tokenizers[rdf_type]
+        return f'@index({tokenizer})', int(profile['distinct'] * (8 + _posting_bytes) + profile['count'] * _posting_bytes)
+
+    sizes = _estimate_index_bytes(profile)
+    if profile['average_tokens'] > 3:
+        tokenizer = 'term'
+    elif profile['average_length'] > 32 and profile['distinct'] > 0.5 * profile['count']:
+        tokenizer = 'hash'
+    else:
+        tokenizer = 'exact'
+
+    return f'@index({tokenizer})', sizes[tokenizer]
+
+
+def advise_indexes(frames: Iterable[pd.DataFrame], precision: int = 12) -> pd.DataFrame:
+    '''
+    Profiles the transformed intrinsic frames and suggests an index
+    for every predicate with the estimated index sizes for each tokenizer.
+    '''
+    profile = profile_predicates(frames, precision)
+    if profile.empty:
+        return profile
+
+    suggestions = [_suggest_index(row) for row in profile.to_dict(orient='records')]
+    profile['suggested'] = [suggestion for suggestion, _ in suggestions]
+    profile['estimated_index_bytes'] = [size for _, size in suggestions]
+
+    estimates = pd.DataFrame([_estimate_index_bytes(row) for row in profile.to_dict(orient='records')])
+    for tokenizer in estimates.columns:
+        profile[f'{tokenizer}_bytes'] = estimates[tokenizer].values
+
+    return profile
+
+
+def advise_options(
+        file_path: str,
+        config: Union[str, Dict[str, Any]],
+        config_key: str,
+        **kwargs) -> Tuple[Dict[str, List[str]], pd.DataFrame]:
+    '''
+    Runs the input file through the configured transform and returns suggested
+    options (in the same form as the options configuration) for create_schema,
+    alongside the full profile. Options which are already configured are kept.
+    '''
+    if not file_path:
+        raise ValueError('file_path')
+    if not config:
+        raise ValueError('config')
+    if not config_key:
+        raise ValueError('config_key')
+
+    config = _get_config(config)
+    file_config = config['files'][config_key]
+    transformer = Transformer(config, config_key, **(kwargs))
+    read_csv_options: Dict[str, Any] = get_from_config('read_csv_options', file_config, {}, **(kwargs))
+    chunk_size: int = get_from_config('chunk_size', config, 10_000_000, **(kwargs))
+    precision: int = get_from_config('advisor_precision', config, 12, **(kwargs))
+    existing_options: Dict[str, List[str]] = get_from_config('options', file_config, {}, **(kwargs))
+
+    def intrinsic_frames():
+        for frame in pd.read_csv(file_path, chunksize=chunk_size, **(read_csv_options)):
+            intrinsic, _ = transformer.transform(frame)
+            yield intrinsic
+
+    logger.info(f'Profiling {file_path} for index suggestions')
+    advice = advise_indexes(intrinsic_frames(), precision)
+
+    options: Dict[str, List[str]] = {predicate: [suggested] for predicate, suggested in zip(advice.get('predicate', []), advice.get('suggested', []))}
+    options.update(existing_options)
+    return options, advice
@@ -0,0 +1,238 @@
+import os
+import json
+import hashlib
+import time
+import logging
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from dgraphpandas.config import get_from_config, _get_config
+from dgraphpandas.fingerprint import file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+_date_formats = [
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y/%m/%d',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+    '%d-%m-%Y',
+    '%B %d, %Y',
+    '%b %d, %Y',
+    '%d %B %Y',
+    '%d %b %Y',
+]
+
+
+def _reservoir_sample(
+        path: str,
+        read_csv_options: Dict[str, Any],
+        sample_size: int,
+        byte_budget: int,
+        time_budget: float,
+        seed: int = 0) -> pd.DataFrame:
+    '''
+    Reads the file in chunks and keeps a uniform random sample of sample_size rows (Algorithm R).
+    Reading stops early once byte_budget bytes of the file have been read
+    or time_budget seconds have elapsed so huge files are never fully scanned.
+    '''
+    if sample_size <= 0:
+        raise ValueError('sample_size')
+
+    random = np.random.default_rng(seed)
+    options = {**read_csv_options, 'dtype': str}
+    started = time.monotonic()
+    columns: List[str] = []
+    reservoir: Union[np.ndarray, None] = None
+    seen = 0
+
+    with open(path, 'rb') as f:
+        for chunk in pd.read_csv(f, chunksize=max(sample_size, 1000), **(options)):
+            if reservoir is None:
+                columns = chunk.columns.tolist()
+                reservoir = np.empty((sample_size, len(columns)), dtype=object)
+
+            values = chunk.values
+            positions = seen + np.arange(len(values))
+
+            fill = positions < sample_size
+            reservoir[positions[fill]] = values[fill]
+
+            slots = random.integers(0, positions + 1)
+            replace = (~fill) & (slots < sample_size)
+            if replace.any():
+                # Later rows win when several rows land on the same slot, as they would sequentially
+                last = pd.Series(np.flatnonzero(replace), index=slots[replace]).groupby(level=0).last()
+                reservoir[last.index.values] = values[last.values]
+
+            seen += len(values)
+            if f.tell() >= byte_budget or time.monotonic() - started >= time_budget:
+                logger.debug(f'Sampling budget reached after {seen} rows of {path}')
+                break
+
+    if reservoir is None:
+        return pd.DataFrame()
+
+    return pd.DataFrame(reservoir[:min(seen, sample_size)], columns=columns)
+
+
+def _infer_column(values: pd.Series) -> Union[Dict[str, Any], None]:
+    '''
+    Suggests a type (and date format if applicable) for a sample of string values.
+    Nullable types are always chosen as rows outside of the sample may be
+    missing and the type_overrides conversion would fail on NA.
+
+    Values with leading zeros (e.g 00123) are codes rather than numbers
+    so are kept as strings which would otherwise lose the zeros.
+    '''
+    values = values.dropna()
+    values = values[values.str.strip() != '']
+    if values.empty:
+        return None
+
+    stripped = values.str.strip()
+    if stripped.str.lower().isin(['true', 'false']).all():
+        return {'type': 'boolean'}
+
+    if stripped.str.match(r'^[-+]?0\d').any():
+        return {'type': 'object'}
+
+    numeric = pd.to_numeric(values, errors='coerce')
+    if numeric.notna().all():
+        if (numeric % 1 == 0).all():
+            return {'type': 'Int64'}
+        return {'type': 'float64'}
+
+    for date_format in _date_formats:
+        for exact in (True, False):
+            parsed = pd.to_datetime(values, format=date_format, exact=exact, errors='coerce')
+            if parsed.notna().all():
+                options = {'format': date_format} if exact else {'format': date_format, 'exact': False}
+                return {'type': 'datetime64', 'date_format': options}
+
+    return {'type': 'object'}
+
+
+def _infer_frame(sample: pd.DataFrame, vertical: bool, predicate_field: str, object_field: str) -> Dict[str, Dict[str, Any]]:
+    inferred: Dict[str, Dict[str, Any]] = {}
+    if vertical:
+        if sample.empty:
+            return inferred
+        for predicate, values in sample.groupby(predicate_field)[object_field]:
+            inferred[predicate] = _infer_column(values)
+    else:
+        for column in sample.columns:
+            inferred[column] = _infer_column(sample[column])
+
+    return {column: result for column, result in inferred.items() if result is not None}
+
+
+def _skipped_columns(file_config: Dict[str, Any], **kwargs) -> set:
+    '''
+    Columns which should never receive an inferred type, either because
+    they are keys/edges or because the user has already declared them.
+    '''
+    skipped = set()
+    for option in ['subject_fields', 'edge_fields', 'csv_edges', 'ignore_fields']:
+        value = get_from_config(option, file_config, [], **(kwargs))
+        if not callable(value):
+            skipped.update(value)
+
+    for option in ['type_overrides', 'date_fields', 'override_edge_name']:
+        skipped.update(get_from_config(option, file_config, {}, **(kwargs)).keys())
+
+    return skipped
+
+
+def _cache_key(path: str, read_csv_options: Dict[str, Any], *settings) -> str:
+    '''
+    Cached inference is only reused for the same file read
+    with the same options and sampled with the same settings.
+    '''
+    options = json.dumps([read_csv_options, *settings], sort_keys=True, default=str)
+    return file_fingerprint(path) + '_' + hashlib.sha1(options.encode('utf-8')).hexdigest()
+
+
+def infer_schema(
+        files: Dict[str, str],
+        config: Union[str, Dict[str, Any]],
+        **kwargs) -> Dict[str, Any]:
+    '''
+    Samples the input of each file and suggests dgraph types and date formats,
+    writing them back into the type_overrides and date_fields of the configuration.
+    Declared type_overrides and date_fields are never replaced.
+
+    Parameters:
+        files: mapping of configuration file key to the input file (CSV) for that key
+        config: a file path or already materialized dictionary
+
+    Returns:
+        The updated configuration
+    '''
+    if not files:
+        raise ValueError('files')
+    if not config:
+        raise ValueError('config')
+
+    config = _get_config(config)
+    sample_size: int = get_from_config('inference_sample_size', config, 10_000, **(kwargs))
+    byte_budget: int = get_from_config('inference_byte_budget', config, 64 * 1024 * 1024, **(kwargs))
+    time_budget: float = get_from_config('inference_time_budget', config, 10.0, **(kwargs))
+    cache_dir: str = get_from_config('inference_cache_dir', config, os.path.join(os.path.expanduser('~'), '.cache', 'dgraphpandas'), **(kwargs))
+    vertical = config.get('transform') == 'vertical'
+
+    for config_key, path in files.items():
+        file_config: Dict[str, Any] = config['files'][config_key]
+        read_csv_options: Dict[str, Any] = get_from_config('read_csv_options', file_config, {}, **(kwargs))
+        predicate_field: str = get_from_config('predicate_field', file_config, 'predicate', **(kwargs))
+        object_field: str = get_from_config('object_field', file_config, 'object', **(kwargs))
+
+        inferred = None
+        cache_path = None
+        if cache_dir:
+            cache_key = _cache_key(path, read_csv_options, sample_size, byte_budget, time_budget, vertical, predicate_field, object_field)
+            cache_path = os.path.join(cache_dir, cache_key + '.json')
+            if os.path.exists(cache_path):
+                logger.info(f'Using cached inference for {path}')
+                with open(cache_path, 'r') as f:
+                    inferred = json.load(f)
+
+        if inferred is None:
+            logger.info(f'Inferring types for {config_key} from {path}')
+            sample = _reservoir_sample(path, read_csv_options, sample_size, byte_budget, time_budget)
+            inferred = _infer_frame(sample, vertical, predicate_field, object_field)
+            if cache_path:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(cache_path, 'w') as f:
+                    json.dump(inferred, f)
+
+        type_overrides, date_fields = _apply_inferred(inferred, _skipped_columns(file_config, **(kwargs)))
+        logger.debug(f'Inferred {type_overrides} and date fields {date_fields} for {config_key}')
+        file_config['type_overrides'] = {**type_overrides, **file_config.get('type_overrides', {})}
+        if date_fields:
+            file_config['date_fields'] = {**date_fields, **file_config.get('date_fields', {})}
+
+    export_config: str = kwargs.get('export_config', None)
+    if export_config:
+        logger.info(f'Writing inferred configuration to {export_config}')
+        with open(export_config, 'w') as f:
+            json.dump(config, f, indent=4)
+
+    return config
+
+
+def _apply_inferred(inferred: Dict[str, Dict[str, Any]], skipped: set) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    type_overrides: Dict[str, str] = {}
+    date_fields: Dict[str, Any] = {}
+    for column, result in inferred.items():
+        if column in skipped:
+            continue
+        type_overrides[column] = result['type']
+        if 'date_format' in result:
+            date_fields[column] = result['date_format']
+
+    return type_overrides, date_fields
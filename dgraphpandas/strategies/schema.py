@@ -138,7 +138,8 @@ def create_schema(source_config: Union[str, Dict[str, Any]], output_dir='.', **k
     logger.debug('Appending xid declaration')
     if ensure_xid_predicate:
         # Create a new DataFrame for the row to be added
-        new_row = pd.DataFrame([{'column': 'xid', 'type': 'string', 'table': None, 'options': '@index(exact)'}])
+        # @upsert so concurrent upserts on an xid conflict (and are retried) rather than creating duplicate nodes
+        new_row = pd.DataFrame([{'column': 'xid', 'type': 'string', 'table': None, 'options': '@index(exact) @upsert'}])
         # Use pd.concat to add the new row
         frame = pd.concat([frame, new_row], ignore_index=True)
 
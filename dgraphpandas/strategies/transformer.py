@@ -0,0 +1,205 @@
+import logging
+from typing import Any, Callable, Dict, List, Pattern, Set, Union
+
+import pandas as pd
+
+from dgraphpandas.config import get_from_config
+from dgraphpandas.hooks import _run_stage
+from dgraphpandas.strategies.vertical_helpers import (_expand_csv_edges, _join_key_fields, _add_dgraph_type_records,
+                                                      _break_up_intrinsic_and_edges, _apply_rdf_types, _format_date_fields,
+                                                      _remove_illegal_rdf_characters, _remove_na_objects, _override_edge_name,
+                                                      _ignore_fields, _resolve_potential_callables, _rename_fields,
+                                                      _find_id_edges, _compile_illegal_characters_regex)
+
+logger = logging.getLogger(__name__)
+
+
+class Transformer:
+    '''
+    A compiled horizontal or vertical transform for a single file in the configuration.
+
+    Settings are read and validated once when the Transformer is created and the
+    illegal character expressions are compiled up front. Callable settings (subject_fields,
+    edge_fields, dgraph_type, predicate_field, object_field) and the edge_id_convention
+    are resolved from the first frame transformed and reused for every following frame,
+    so a file read in chunks only pays for them once.
+
+    When edge_id_convention is used on a vertical file, predicates which were not in the
+    first frame are still checked for the _id suffix as a later chunk may introduce them.
+    '''
+
+    def __init__(self, config: Dict[str, Any], config_file_key: str, **kwargs):
+        if not config:
+            raise ValueError('config')
+        if not config_file_key:
+            raise ValueError('config_file_key')
+
+        try:
+            file_config: Dict[str, Any] = config['files'][config_file_key]
+        except KeyError:
+            logger.exception(f'Ensure that {config_file_key} is within the files object in config')
+            raise
+
+        self.config_file_key = config_file_key
+        self.horizontal: bool = get_from_config('transform', config, 'horizontal', **(kwargs)) != 'vertical'
+
+        self.subject_fields: Union[List[str], Callable[..., List[str]]] = get_from_config('subject_fields', file_config, **(kwargs))
+        self.edge_fields: Union[List[str], Callable[..., List[str]]] = get_from_config('edge_fields', file_config, [], **(kwargs))
+        self.dgraph_type: Union[str, Callable[..., str]] = get_from_config('dgraph_type', file_config, config_file_key, **(kwargs))
+        self.predicate_field: Union[str, Callable[..., str]] = get_from_config('predicate_field', file_config, 'predicate', **(kwargs))
+        self.object_field: Union[str, Callable[..., str]] = get_from_config('object_field', file_config, 'object', **(kwargs))
+
+        self.key_seperator: str = get_from_config('key_separator', config, '_', **(kwargs))
+        self.add_dgraph_type_records: bool = get_from_config('add_dgraph_type_records', config, True, **(kwargs))
+        self.strip_id_from_edge_names: bool = get_from_config('strip_id_from_edge_names', config, True, **(kwargs))
+        self.drop_na_intrinsic_objects: bool = get_from_config('drop_na_intrinsic_objects', config, True, **(kwargs))
+        self.drop_na_edge_objects: bool = get_from_config('drop_na_edge_objects', config, True, **(kwargs))
+        self.csv_edges: List[str] = get_from_config('csv_edges', file_config, [], **(kwargs))
+        self.csv_edges_seperator: str = get_from_config('csv_edges_seperator', file_config, ',', **(kwargs))
+        self.ignore_fields: List[str] = get_from_config('ignore_fields', file_config, [], **(kwargs))
+        self.override_edge_name: Dict[str, Any] = get_from_config('override_edge_name', file_config, {}, **(kwargs))
+        self.pre_rename: Dict[str, str] = get_from_config('pre_rename', file_config, {}, **(kwargs))
+        self.date_fields: Dict[str, Any] = get_from_config('date_fields', file_config, {}, **(kwargs))
+        self.edge_id_convention: bool = get_from_config('edge_id_convention', file_config, False, **(kwargs))
+
+        illegal_characters: List[str] = get_from_config('illegal_characters', config, ['%', '\\.', '\\s', '\"', '\\n', '\\r\\n'], **(kwargs))
+        illegal_characters_intrinsic_object: List[str] = get_from_config(
+            'illegal_characters_intrinsic_object', config, ['\"', '\\n', '\\r\\n'], **(kwargs))
+        self.illegal_characters: Union[Pattern, None] = _compile_illegal_characters_regex(illegal_characters)
+        self.illegal_characters_intrinsic_object: Union[Pattern, None] = _compile_illegal_characters_regex(illegal_characters_intrinsic_object)
+
+        '''
+        The horizontal transform converts date_fields to datetimes before melting
+        so they also need a datetime64 type (unless one was declared).
+        A copy is taken so that the configuration itself is never changed.
+        '''
+        self.type_overrides: Dict[str, str] = dict(get_from_config('type_overrides', file_config, {}, **(kwargs)))
+        if self.horizontal:
+            if not self.subject_fields:
+                raise ValueError('subject_fields')
+            if callable(self.subject_fields):
+                raise ValueError('subject_fields must be a list for a horizontal transform')
+            for col in self.date_fields:
+                self.type_overrides.setdefault(col, 'datetime64')
+
+        if self.edge_id_convention:
+            logger.debug('Override edge_fields with _id convention')
+            self.edge_fields = _find_id_edges
+
+        self._resolved: Union[Dict[str, Any], None] = None
+        self._seen_predicates: Set[str] = set()
+
+    def transform(self, frame: pd.DataFrame):
+        '''
+        Transforms the frame into Intrinsic and Edge DataFrames
+        exactly as the horizontal or vertical transform would.
+        '''
+        if frame is None:
+            raise ValueError('frame')
+
+        if self.horizontal:
+            frame = self._melt(frame)
+
+        return self._transform_vertical(frame)
+
+    def _melt(self, frame: pd.DataFrame) -> pd.DataFrame:
+        if frame.shape[1] <= len(self.subject_fields):
+            raise ValueError(f'''
+                It looks like there are no data fields.
+                The subject_fields are {self.subject_fields}
+                The frame columns are {frame.columns}
+            ''')
+
+        '''
+        Date Fields get special treatment as they can be represented in many different ways
+        from different sources. Therefore if the column has been defined in date_fields
+        then apply those options to that column.
+        '''
+        for col, date_format in self.date_fields.items():
+            logger.debug(f'Converting {col} to datetime: {date_format}')
+            frame[col] = pd.to_datetime(frame[col], **(date_format))
+
+        '''
+        Ensure that object values have the correct type according to type_overrides.
+        For example, when pandas reads a csv and detects a numerical value it may decide to
+        represent them as a float e.g 10.0 so when it's melted into a string it will show as such
+        But we really want the value to be just 10 so it matches the corresponding rdf type.
+        Therefore before we melt the frame, we enforce these columns have the correct form.
+        '''
+        for col, current_type in self.type_overrides.items():
+            try:
+                frame[col] = frame[col].astype(current_type)
+            except (ValueError, TypeError) as e:
+                raise ValueError(
+                    f'Could not convert {col} to {current_type}. '
+                    f'Please confirm that the values in the {col} series are convertable to {current_type}. '
+                    'A common scenario here is when we have NA values but the target type does not support them.') from e
+
+        logger.debug(f'Melting frame with subject: {self.subject_fields}')
+        return _run_stage('melt', pd.DataFrame.melt, frame, id_vars=self.subject_fields, var_name='predicate', value_name='object')
+
+    def _resolve(self, frame: pd.DataFrame) -> Dict[str, Any]:
+        '''
+        Resolves the callable settings against the first frame
+        and reuses them for every following frame.
+        '''
+        if self._resolved is None:
+            self._resolved = _resolve_potential_callables(frame, {
+                'subject_fields': self.subject_fields,
+                'edge_fields': self.edge_fields,
+                'dgraph_type': self.dgraph_type,
+                'predicate_field': self.predicate_field,
+                'object_field': self.object_field
+            })
+            if not self._resolved['subject_fields']:
+                raise ValueError('subject_fields must be defined')
+            if self.edge_id_convention and not self.horizontal:
+                self._seen_predicates = set(frame['predicate'].unique())
+
+        elif self.edge_id_convention and not self.horizontal:
+            new_predicates = set(frame['predicate'].unique()) - self._seen_predicates
+            if new_predicates:
+                self._seen_predicates.update(new_predicates)
+                self._resolved['edge_fields'] = self._resolved['edge_fields'] + sorted(p for p in new_predicates if p.endswith('_id'))
+
+        return self._resolved
+
+    def _transform_vertical(self, frame: pd.DataFrame):
+        resolved = self._resolve(frame)
+        key = resolved['subject_fields']
+        edges = resolved['edge_fields']
+        dgraph_type = resolved['dgraph_type']
+        predicate_resolved = resolved['predicate_field']
+        object_resolved = resolved['object_field']
+
+        if predicate_resolved not in frame.columns:
+            raise KeyError(f'predicate column {predicate_resolved} must be defined on vertical frame')
+        if object_resolved not in frame.columns:
+            raise KeyError(f'object column {object_resolved} must be defined on vertical frame')
+
+        frame = frame.rename(columns={predicate_resolved: 'predicate', object_resolved: 'object'})
+        frame = _run_stage('rename_fields', _rename_fields, frame, self.pre_rename)
+        frame = _run_stage('ignore_fields', _ignore_fields, frame, self.ignore_fields)
+        frame = _run_stage('expand_csv_edges', _expand_csv_edges, frame, self.csv_edges, seperator=self.csv_edges_seperator)
+        frame = _run_stage('join_key_fields', _join_key_fields, frame, key, self.key_seperator, dgraph_type)
+        frame = _run_stage('add_dgraph_type_records', _add_dgraph_type_records, frame, self.add_dgraph_type_records, dgraph_type)
+
+        intrinsic, edges = _run_stage('break_up_intrinsic_and_edges', _break_up_intrinsic_and_edges, frame, edges, self.strip_id_from_edge_names)
+        intrinsic = _run_stage('apply_rdf_types', _apply_rdf_types, intrinsic, self.type_overrides)
+        edges['type'] = None
+
+        intrinsic = _run_stage('format_date_fields', _format_date_fields, intrinsic, self.date_fields)
+        intrinsic = _run_stage('remove_illegal_rdf_characters', _remove_illegal_rdf_characters, intrinsic, self.illegal_characters, 'subject')
+        intrinsic = _run_stage('remove_illegal_rdf_characters', _remove_illegal_rdf_characters, intrinsic, self.illegal_characters_intrinsic_object, 'object')
+        edges = _run_stage('remove_illegal_rdf_characters', _remove_illegal_rdf_characters, edges, self.illegal_characters, 'subject')
+        edges = _run_stage('remove_illegal_rdf_characters', _remove_illegal_rdf_characters, edges, self.illegal_characters, 'object')
+
+        intrinsic = _run_stage('remove_na_objects', _remove_na_objects, intrinsic, self.drop_na_intrinsic_objects)
+        edges = _run_stage('remove_na_objects', _remove_na_objects, edges, self.drop_na_edge_objects)
+
+        _run_stage('override_edge_name', _override_edge_name, edges, self.override_edge_name, self.key_seperator)
+
+        intrinsic = intrinsic[['subject', 'predicate', 'object', 'type']]
+        edges = edges[['subject', 'predicate', 'object', 'type']]
+
+        return intrinsic, edges
@@ -0,0 +1,284 @@
+import io
+import os
+import re
+import sys
+import sqlite3
+import json
+import time
+import gzip
+import queue
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+import pandas as pd
+
+from dgraphpandas.config import get_from_config, _get_config
+from dgraphpandas.rdf import to_rdf_from_frame
+from dgraphpandas.incremental import _open_state, _finish_incremental_state
+from dgraphpandas.strategies.transformer import Transformer
+
+logger = logging.getLogger(__name__)
+
+_end_of_stream = object()
+
+
+def _read_lines(source: Iterable[str], lines: queue.Queue):
+    '''
+    Reads the (potentially unbounded) source on a background thread
+    so that batches can be cut on a deadline even when the source is idle.
+    When reading fails, the error is passed on to be raised by the reader of the lines.
+    '''
+    try:
+        for line in source:
+            if line.strip():
+                lines.put(line if line.endswith('\n') else line + '\n')
+    except BaseException as e:
+        lines.put(e)
+    else:
+        lines.put(_end_of_stream)
+
+
+def _next_batch(lines: queue.Queue, batch_rows: int, batch_seconds: float, wait: Union[float, None]) -> Tuple[List[str], bool]:
+    '''
+    Waits up to wait seconds (forever if None) for the first line and then collects lines
+    until there are batch_rows or batch_seconds have passed since the first line arrived.
+    Returns the batch and whether the end of the stream was reached.
+    '''
+    batch: List[str] = []
+    deadline = None if wait is None else time.monotonic() + wait
+    while len(batch) < batch_rows:
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            line = lines.get(timeout=timeout)
+        except queue.Empty:
+            break
+
+        if line is _end_of_stream:
+            return batch, True
+        if isinstance(line, BaseException):
+            raise line
+
+        if not batch:
+            deadline = time.monotonic() + batch_seconds
+        batch.append(line)
+
+    return batch, False
+
+
+class _BatchParser:
+    '''
+    Parses batches of CSV or JSON lines into frames. The columns and dtypes of the first
+    batch are kept for every later batch so a batch of values which happen to look
+    different (e.g all numeric codes) does not change how they are transformed.
+    '''
+
+    def __init__(self, stream_format: str, read_csv_options: Dict[str, Any]):
+        if stream_format not in ('csv', 'jsonl'):
+            raise ValueError(f'stream_format {stream_format} must be csv or jsonl')
+
+        self.stream_format = stream_format
+        self.read_csv_options = read_csv_options
+        self.header: Union[str, None] = None
+        self.dtypes: Union[pd.Series, None] = None
+
+    def parse(self, batch: List[str]) -> pd.DataFrame:
+        if self.stream_format == 'csv':
+            if self.header is None:
+                self.header, batch = batch[0], batch[1:]
+            if not batch:
+                return pd.DataFrame()
+
+            if self.dtypes is None:
+                frame = pd.read_csv(io.StringIO(self.header + ''.join(batch)), **(self.read_csv_options))
+            else:
+                text_columns = {column: str for column, dtype in self.dtypes.items() if dtype == object}
+                frame = pd.read_csv(io.StringIO(self.header + ''.join(batch)), **{**self.read_csv_options, 'dtype': text_columns})
+        else:
+            frame = pd.DataFrame.from_records([json.loads(line) for line in batch])
+            if self.dtypes is not None:
+                frame = frame.reindex(columns=self.dtypes.index)
+
+        if self.dtypes is None:
+            self.dtypes = frame.dtypes
+            return frame
+
+        for column, dtype in self.dtypes.items():
+            if frame[column].dtype != dtype:
+                try:
+                    frame[column] = frame[column].astype(dtype)
+                except (ValueError, TypeError):
+                    logger.warning(f'Could not keep {column} as {dtype} in this batch, it will be {frame[column].dtype}')
+
+        return frame
+
+
+def _write_part(output_dir: str, name: str, part: int, upserts: List[str], encoding: str, compression_level: int) -> str:
+    '''
+    Writes to a temporary file and renames it so that consumers
+    watching the output directory never see a partially written export.
+    '''
+    path = os.path.join(output_dir, f'{name}_{part}.gz')
+    with gzip.open(path + '.tmp', mode='wb', compresslevel=compression_level) as zip_file:
+        zip_file.write('\n'.join(upserts).encode(encoding=encoding))
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def _last_part(output_dir: str, config_key: str) -> int:
+    '''
+    The highest part already exported for the config_key so that a new
+    run carries on numbering from it rather than overwriting earlier exports.
+    '''
+    pattern = re.compile(re.escape(config_key) + r'_(?:intrinsic|edges|deletes)_(\d+)\.gz$')
+    parts = [int(match.group(1)) for match in map(pattern.match, os.listdir(output_dir)) if match]
+    return max(parts, default=0)
+
+
+def stream_rdf(
+        source: Union[str, Iterable[str], None],
+        config: Union[str, Dict[str, Any]],
+        config_key: str,
+        output_dir: str,
+        **kwargs) -> Dict[str, int]:
+    '''
+    Converts an unbounded stream of CSV (with a header line) or JSON lines into rolling RDF exports.
+
+    Lines are cut into micro batches of stream_batch_rows rows or whatever arrived within
+    stream_batch_seconds of the first line of the batch. Each batch is run through the compiled
+    transform and the upserts are written to numbered exports every stream_flush_seconds
+    (and when the stream ends). The numbering carries on from the exports already in the output_dir.
+
+    With incremental_state (horizontal transforms only), predicates removed from the subjects
+    seen since the last flush are written as deletes alongside the upserts of every flush.
+
+    Parameters:
+        source: an iterable of lines (e.g an open file), a path (e.g a FIFO) or None / - for stdin
+        config: A Configuration Dictionary or file path
+        config_key: The file (key) to use in the configuration
+        output_dir: The output directory to write exports to
+
+    Returns:
+        A summary of the batches, rows, upserts and exports written
+    '''
+    if not config:
+        raise ValueError('config')
+    if not config_key:
+        raise ValueError('config_key')
+    if output_dir is None:
+        raise ValueError('output_dir')
+
+    config = _get_config(config)
+    file_config = config['files'][config_key]
+    stream_format: str = get_from_config('stream_format', file_config, 'csv', **(kwargs))
+    batch_rows: int = get_from_config('stream_batch_rows', config, 10_000, **(kwargs))
+    batch_seconds: float = get_from_config('stream_batch_seconds', config, 1.0, **(kwargs))
+    flush_seconds: float = get_from_config('stream_flush_seconds', config, 10.0, **(kwargs))
+    read_csv_options: Dict[str, Any] = get_from_config('read_csv_options', file_config, {}, **(kwargs))
+    encoding: str = get_from_config('encoding', file_config, 'utf-8', **(kwargs))
+    gz_compression_level: int = get_from_config('gz_compression_level', file_config, 9, **(kwargs))
+    incremental_state: str = get_from_config('incremental_state', config, None, **(kwargs))
+
+    if batch_rows <= 0:
+        raise ValueError('stream_batch_rows')
+
+    '''
+    A stream is always written as numbered RDF exports in the output_dir
+    so options for any other output are rejected rather than dropped.
+    '''
+    output_format: str = get_from_config('output_format', config, 'rdf', **(kwargs))
+    if output_format != 'rdf':
+        raise ValueError(f'output_format {output_format} is not supported by stream, only rdf')
+    for option in ['shards', 'manifest', 'sink', 'dgraph_address']:
+        if get_from_config(option, config, None, **(kwargs)):
+            raise ValueError(f'{option} is not supported by stream')
+
+    '''
+    Removals are decided from the rows seen since the last flush which is only
+    sound when every row is a complete subject. A vertical change event only
+    carries the predicates which changed so the others would be deleted.
+    '''
+    if incremental_state and get_from_config('transform', config, 'horizontal', **(kwargs)) == 'vertical':
+        raise ValueError('incremental_state is not supported by stream with a vertical transform')
+
+    opened = None
+    if source is None or source == '-':
+        source = sys.stdin
+    elif isinstance(source, str):
+        opened = source = open(source, 'r', encoding=encoding)
+
+    lines: queue.Queue = queue.Queue(maxsize=batch_rows * 4)
+    reader = threading.Thread(target=_read_lines, args=(source, lines), daemon=True)
+    reader.start()
+
+    os.makedirs(output_dir, exist_ok=True)
+    first_part = _last_part(output_dir, config_key) + 1
+    transformer = Transformer(config, config_key, **(kwargs))
+    parser = _BatchParser(stream_format, read_csv_options)
+    summary = {'batches': 0, 'rows': 0, 'intrinsic': 0, 'edges': 0, 'deletes': 0, 'exports': 0}
+    intrinsic_buffer: List[str] = []
+    edges_buffer: List[str] = []
+    last_flush = time.monotonic()
+
+    '''
+    The state is shared by every batch and the predicates which were
+    removed are decided at every flush from the batches seen since the last one.
+    '''
+    state: Union[sqlite3.Connection, None] = _open_state(incremental_state) if incremental_state else None
+
+    def flush():
+        deletes: List[str] = []
+        if state is not None:
+            deletes = _finish_incremental_state(state, config_key)
+
+        if intrinsic_buffer or edges_buffer or deletes:
+            part = first_part + summary['exports']
+            logger.info(f'Flushing {len(intrinsic_buffer)} intrinsic and {len(edges_buffer)} edge upserts and {len(deletes)} deletes')
+            if deletes:
+                _write_part(output_dir, f'{config_key}_deletes', part, deletes, encoding, gz_compression_level)
+            _write_part(output_dir, f'{config_key}_intrinsic', part, intrinsic_buffer, encoding, gz_compression_level)
+            _write_part(output_dir, f'{config_key}_edges', part, edges_buffer, encoding, gz_compression_level)
+            summary['exports'] += 1
+            summary['deletes'] += len(deletes)
+            intrinsic_buffer.clear()
+            edges_buffer.clear()
+
+        if state is not None:
+            state.commit()
+
+    try:
+        finished = False
+        while not finished:
+            wait = max(flush_seconds - (time.monotonic() - last_flush), 0) if intrinsic_buffer or edges_buffer else None
+            try:
+                batch, finished = _next_batch(lines, batch_rows, batch_seconds, wait)
+            except BaseException:
+                logger.exception('Reading the stream failed, flushing the batches converted so far')
+                flush()
+                raise
+            frame = parser.parse(batch) if batch else None
+
+            if frame is not None and not frame.empty:
+                intrinsic_upserts, edges_upserts = to_rdf_from_frame(
+                    frame, config, config_key, transformer, config_key, None, summary['batches'], state=state, **(kwargs))
+                intrinsic_buffer.extend(intrinsic_upserts)
+                edges_buffer.extend(edges_upserts)
+
+                summary['batches'] += 1
+                summary['rows'] += len(frame)
+                summary['intrinsic'] += len(intrinsic_upserts)
+                summary['edges'] += len(edges_upserts)
+
+            if time.monotonic() - last_flush >= flush_seconds:
+                flush()
+                last_flush = time.monotonic()
+
+        flush()
+    finally:
+        if opened is not None:
+            opened.close()
+        if state is not None:
+            state.close()
+
+    logger.info(f'Stream finished {summary}')
+    return summary
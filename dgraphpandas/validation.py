@@ -0,0 +1,174 @@
+import os
+import glob
+import gzip
+import logging
+from typing import Any, Dict, Iterable, List, Union
+
+import numpy as np
+import pandas as pd
+
+from dgraphpandas.manifest import manifest_file_name, read_manifest, manifest_entry, append_manifest
+from dgraphpandas.writers.subjects import statement_subjects
+
+logger = logging.getLogger(__name__)
+
+_edge_object_pattern = r'<([^>]*)> \.$'
+_edge_pattern = r'^<[^>]*> <[^>]*> <[^>]*> \.$'
+
+
+def _read_rdf_lines(path: str, encoding: str = 'utf-8') -> pd.Series:
+    with gzip.open(path, mode='rt', encoding=encoding) as f:
+        content = f.read()
+
+    if not content:
+        return pd.Series([], dtype=object)
+    return pd.Series(content.split('\n'), dtype=object)
+
+
+def _hash_xids(xids: pd.Series) -> np.ndarray:
+    '''
+    Hashes xids into 64 bit integers so the index stays compact
+    (8 bytes per xid) regardless of how long the xids are.
+    '''
+    return pd.util.hash_array(xids.values.astype(object))
+
+
+def build_xid_index(paths: Iterable[str], index_path: Union[str, None] = None, encoding: str = 'utf-8') -> np.ndarray:
+    '''
+    Builds a sorted array of hashed subject xids from the given RDF exports.
+
+    If index_path is provided then the index is saved there and
+    memory mapped back rather than being held in memory.
+    '''
+    if paths is None:
+        raise ValueError('paths')
+
+    hashes: List[np.ndarray] = []
+    for path in paths:
+        logger.debug(f'Indexing subjects from {path}')
+        lines = _read_rdf_lines(path, encoding)
+        subjects = statement_subjects(lines).dropna()
+        hashes.append(np.unique(_hash_xids(subjects)))
+
+    index = np.unique(np.concatenate(hashes)) if hashes else np.array([], dtype=np.uint64)
+    logger.info(f'Built xid index with {len(index)} subjects')
+
+    if index_path:
+        logger.debug(f'Writing xid index to {index_path}')
+        np.save(index_path, index)
+        index = np.load(index_path, mmap_mode='r')
+
+    return index
+
+
+def find_dangling_edges(edges: pd.Series, index: np.ndarray) -> np.ndarray:
+    '''
+    Returns a boolean mask over the given edge lines which is True
+    when the target xid of the edge is not within the index.
+    '''
+    if edges is None:
+        raise ValueError('edges')
+    if index is None:
+        raise ValueError('index')
+
+    if edges.empty:
+        return np.zeros(0, dtype=bool)
+
+    objects = edges.str.extract(_edge_object_pattern, expand=False).fillna('')
+    hashes = _hash_xids(objects)
+
+    if len(index) == 0:
+        return np.ones(len(hashes), dtype=bool)
+
+    positions = np.searchsorted(index, hashes)
+    positions[positions == len(index)] = 0
+    return np.asarray(index[positions] != hashes)
+
+
+def _find_exports(output_dir: str) -> List[Dict[str, Any]]:
+    '''
+    The RDF exports (intrinsic, edges and subject batches) within the output_dir. When the
+    output_dir has a manifest, it is read as it knows every export and what it holds.
+    Otherwise the output_dir and its shard_<k> directories are searched by name.
+    '''
+    if os.path.exists(os.path.join(output_dir, manifest_file_name)):
+        return [
+            {**entry, 'file': os.path.join(output_dir, entry['path'])}
+            for entry in read_manifest(output_dir)
+            if entry['format'] == 'rdf' and entry['kind'] in ('intrinsic', 'edges', 'subjects')]
+
+    exports = []
+    for kind in ['intrinsic', 'edges', 'subjects']:
+        for directory in ['', 'shard_*']:
+            for path in sorted(glob.glob(os.path.join(output_dir, directory, f'*_{kind}*.gz'))):
+                if not path.endswith(('.dql.gz', '.json.gz')):
+                    exports.append({'file': path, 'kind': kind})
+    return exports
+
+
+def validate_edges(output_dir: str, filter_dangling_edges: bool = False, **kwargs) -> pd.DataFrame:
+    '''
+    Checks that every edge within the exports in output_dir targets
+    a subject which is produced by one of the exports. The exports are read from the
+    manifest when there is one, else from the output_dir and its shard directories.
+
+    Dgraph will silently create an empty placeholder node for an edge
+    which points to an xid that is never loaded.
+
+    Parameters:
+        output_dir: The directory containing the intrinsic and edge exports
+        filter_dangling_edges: Rewrite the edge exports without the dangling edges
+
+    Returns:
+        A DataFrame with the number of edges and dangling edges per export with edges
+    '''
+    if not output_dir:
+        raise ValueError('output_dir')
+
+    encoding: str = kwargs.get('encoding', 'utf-8')
+    gz_compression_level: int = kwargs.get('gz_compression_level', 9)
+    xid_index_path: str = kwargs.get('xid_index_path', None)
+
+    exports = _find_exports(output_dir)
+    index = build_xid_index([export['file'] for export in exports], xid_index_path, encoding)
+
+    '''
+    Subject batches hold the intrinsic statements of their subjects
+    too so only the statements with a node as the object are checked.
+    '''
+    report = []
+    rewritten = []
+    for export in exports:
+        if export['kind'] == 'intrinsic':
+            continue
+
+        path = export['file']
+        lines = _read_rdf_lines(path, encoding)
+        is_edge = lines.str.match(_edge_pattern).fillna(False).values.astype(bool)
+        dangling = np.zeros(len(lines), dtype=bool)
+        dangling[is_edge] = find_dangling_edges(lines[is_edge], index)
+        dangling_count = int(dangling.sum())
+        report.append({'file': path, 'edges': int(is_edge.sum()), 'dangling': dangling_count})
+
+        if dangling_count:
+            logger.warning(f'{path} has {dangling_count} dangling edges e.g {lines[dangling].head(3).tolist()}')
+
+            if filter_dangling_edges:
+                logger.info(f'Removing {dangling_count} dangling edges from {path}')
+                with gzip.open(path, mode='wb', compresslevel=gz_compression_level) as zip_file:
+                    s = '\n'.join(lines[~dangling].tolist())
+                    s = s.encode(encoding=encoding)
+                    zip_file.write(s)
+
+                if 'path' in export:
+                    rewritten.append(manifest_entry(
+                        output_dir, path, export['kind'], export['format'], export['statements'] - dangling_count,
+                        export['source'], export['chunk'], export['shard'], export.get('run')))
+
+    '''
+    The manifest keeps the last entry for an export so the
+    statements left in the rewritten exports are appended.
+    '''
+    append_manifest(output_dir, rewritten)
+
+    return pd.DataFrame(report, columns=['file', 'edges', 'dangling'])
@@ -0,0 +1,222 @@
+import os
+import time
+import fnmatch
+import sqlite3
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple, Union
+
+from dgraphpandas.config import get_from_config, _get_config
+from dgraphpandas.fingerprint import file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def _open_ledger(path: str) -> sqlite3.Connection:
+    '''
+    The ledger records every file (by path and fingerprint) which has been
+    picked up so that each version of a file is only processed once, even across restarts.
+    '''
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(path)
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS processed (
+            path TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            config_key TEXT NOT NULL,
+            status TEXT NOT NULL,
+            processed_at REAL,
+            seconds REAL,
+            error TEXT,
+            PRIMARY KEY (path, fingerprint)
+        )''')
+    connection.commit()
+    return connection
+
+
+def _match_config_key(file_name: str, patterns: List[Tuple[str, str]]) -> Union[str, None]:
+    for pattern, config_key in patterns:
+        if fnmatch.fnmatch(file_name, pattern):
+            return config_key
+    return None
+
+
+def _process_file(path: str, config: Dict[str, Any], config_key: str, output_dir: str, kwargs: Dict[str, Any]) -> float:
+    '''
+    Runs in a worker process and converts a single landed file.
+
+    The exports are named after the whole file name (without its extension) so
+    landed files which only differ after a dot (e.g titles.2021-01-01.csv and
+    titles.2021-01-02.csv) do not overwrite each other.
+    '''
+    from dgraphpandas.rdf import to_rdf
+
+    started = time.monotonic()
+    output_prefix = os.path.splitext(os.path.basename(path))[0]
+    to_rdf(path, config, config_key, output_dir, **{'export_rdf': True, 'output_prefix': output_prefix, **kwargs})
+    return time.monotonic() - started
+
+
+class DirectoryWatcher:
+    '''
+    Watches a landing directory for files matching the watch_pattern of each file in the
+    configuration and converts each new (or changed) file exactly once with to_rdf.
+
+    A file is considered complete once its size and modification time have not changed
+    for watch_settle seconds. Up to watch_workers files are converted concurrently and
+    every file is recorded with its fingerprint in the watch_ledger (sqlite).
+    Files which fail are recorded as failed and are only retried once they change.
+    '''
+
+    def __init__(self, directory: str, config: Union[str, Dict[str, Any]], output_dir: str, **kwargs):
+        if not directory:
+            raise ValueError('directory')
+        if not config:
+            raise ValueError('config')
+        if output_dir is None:
+            raise ValueError('output_dir')
+
+        self.directory = directory
+        self.config = _get_config(config)
+        self.output_dir = output_dir
+        self.kwargs = kwargs
+
+        self.interval: float = get_from_config('watch_interval', self.config, 1.0, **(kwargs))
+        self.settle: float = get_from_config('watch_settle', self.config, 2.0, **(kwargs))
+        workers: int = get_from_config('watch_workers', self.config, 4, **(kwargs))
+        ledger_path: str = get_from_config('watch_ledger', self.config, os.path.join(directory, '.dgraphpandas_ledger.db'), **(kwargs))
+
+        self.patterns: List[Tuple[str, str]] = [
+            (file_config['watch_pattern'], config_key)
+            for config_key, file_config in self.config['files'].items()
+            if file_config.get('watch_pattern')
+        ]
+        if not self.patterns:
+            raise ValueError('watch_pattern must be defined on at least one file')
+
+        self.ledger = _open_ledger(ledger_path)
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.pending: Dict[str, Tuple[int, int, float]] = {}
+        self.handled: Dict[str, Tuple[int, int]] = {}
+        self.running: Dict[Future, Tuple[str, str]] = {}
+
+    def _is_processed(self, path: str, fingerprint: str) -> bool:
+        row = self.ledger.execute(
+            "SELECT 1 FROM processed WHERE path = ? AND fingerprint = ? AND status != 'processing'", (path, fingerprint)).fetchone()
+        return row is not None
+
+    def _record(self, path: str, fingerprint: str, config_key: str, status: str, seconds: float = None, error: str = None):
+        self.ledger.execute(
+            'INSERT OR REPLACE INTO processed (path, fingerprint, config_key, status, processed_at, seconds, error) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (path, fingerprint, config_key, status, time.time(), seconds, error))
+        self.ledger.commit()
+
+    def _ready_files(self) -> List[Tuple[str, str]]:
+        '''
+        Finds matching files which have stopped changing for the settle period.
+        '''
+        now = time.monotonic()
+        running_paths = {path for path, _ in self.running.values()}
+        ready = []
+
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.path in running_paths:
+                continue
+
+            config_key = _match_config_key(entry.name, self.patterns)
+            if config_key is None:
+                continue
+
+            stat = entry.stat()
+            if self.handled.get(entry.path) == (stat.st_size, stat.st_mtime_ns):
+                continue
+
+            previous = self.pending.get(entry.path)
+            if previous is None or previous[:2] != (stat.st_size, stat.st_mtime_ns):
+                self.pending[entry.path] = (stat.st_size, stat.st_mtime_ns, now)
+                if self.settle > 0:
+                    continue
+            elif now - previous[2] < self.settle:
+                continue
+
+            ready.append((entry.path, config_key))
+
+        return ready
+
+    def _collect(self, wait: bool = False) -> int:
+        '''
+        Records the outcome of finished conversions and returns how many finished.
+        '''
+        finished = 0
+        for future in list(self.running):
+            if not wait and not future.done():
+                continue
+
+            path, fingerprint = self.running.pop(future)
+            config_key = _match_config_key(os.path.basename(path), self.patterns)
+            try:
+                seconds = future.result()
+                logger.info(f'Converted {path} in {seconds:.2f}s')
+                self._record(path, fingerprint, config_key, 'done', seconds=seconds)
+            except Exception as e:
+                logger.error(f'Failed to convert {path}: {e}')
+                self._record(path, fingerprint, config_key, 'failed', error=f'{type(e).__name__}: {e}')
+            finished += 1
+
+        return finished
+
+    def poll(self) -> int:
+        '''
+        Records finished conversions and submits every newly completed file.
+        Returns the number of files submitted.
+        '''
+        self._collect()
+
+        submitted = 0
+        for path, config_key in self._ready_files():
+            size, modified, _ = self.pending.pop(path)
+            self.handled[path] = (size, modified)
+
+            fingerprint = file_fingerprint(path)
+            if self._is_processed(path, fingerprint):
+                continue
+
+            logger.info(f'Picked up {path} for {config_key}')
+            self._record(path, fingerprint, config_key, 'processing')
+            future = self.executor.submit(_process_file, path, self.config, config_key, self.output_dir, self.kwargs)
+            self.running[future] = (path, fingerprint)
+            submitted += 1
+
+        return submitted
+
+    def drain(self) -> int:
+        '''
+        Waits for every running conversion to finish.
+        '''
+        return self._collect(wait=True)
+
+    def run(self):
+        logger.info(f'Watching {self.directory} for {self.patterns}')
+        try:
+            while True:
+                self.poll()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:  # pragma: no cover
+            logger.info('Stopping watch, waiting for running conversions')
+        finally:
+            self.close()
+
+    def close(self):
+        self.drain()
+        self.executor.shutdown()
+        self.ledger.close()
+
+
+def watch(directory: str, config: Union[str, Dict[str, Any]], output_dir: str, **kwargs):
+    '''
+    Watches the directory and converts landed files until interrupted. See DirectoryWatcher.
+    '''
+    DirectoryWatcher(directory, config, output_dir, **(kwargs)).run()
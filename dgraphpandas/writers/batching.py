@@ -0,0 +1,64 @@
+import logging
+from typing import Dict, List
+
+from dgraphpandas.writers.subjects import worker_of, statement_subject
+
+logger = logging.getLogger(__name__)
+
+
+def group_by_subject(statements: List[str]) -> Dict[str, List[str]]:
+    '''
+    Groups RDF statements by their subject, keeping the
+    order the subjects (and their statements) first appeared in.
+    '''
+    if statements is None:
+        raise ValueError('statements')
+
+    groups: Dict[str, List[str]] = {}
+    for statement in statements:
+        groups.setdefault(statement_subject(statement), []).append(statement)
+    return groups
+
+
+def subject_worker(subject: str, workers: int) -> int:
+    '''
+    The worker a subject belongs to. This is stable across runs and processes so a
+    subject always goes to the same worker, independently of the shard it is in.
+    '''
+    return int(worker_of([subject], workers)[0])
+
+
+def subject_batches(statements: List[str], batch_size: int, workers: int = 1) -> List[List[List[str]]]:
+    '''
+    Clusters the statements (intrinsic and edges) of every subject together and
+    gives each worker a disjoint set of subjects, cut into batches of up to batch_size.
+
+    Batches are only cut between subjects so concurrent batches never write to the same
+    subject. A subject with more than batch_size statements gets a batch of its own.
+
+    Returns the batches of each worker.
+    '''
+    if statements is None:
+        raise ValueError('statements')
+    if not batch_size or batch_size <= 0:
+        raise ValueError('batch_size')
+    if not workers or workers <= 0:
+        raise ValueError('workers')
+
+    batches: List[List[List[str]]] = [[] for _ in range(workers)]
+    current: List[List[str]] = [[] for _ in range(workers)]
+
+    groups = group_by_subject(statements)
+    subject_workers = worker_of(list(groups.keys()), workers) if groups else []
+    for group, worker in zip(groups.values(), subject_workers):
+        if current[worker] and len(current[worker]) + len(group) > batch_size:
+            batches[worker].append(current[worker])
+            current[worker] = []
+        current[worker].extend(group)
+
+    for worker in range(workers):
+        if current[worker]:
+            batches[worker].append(current[worker])
+
+    logger.debug(f'Cut {len(statements)} statements into {[len(worker) for worker in batches]} batches per worker')
+    return batches
@@ -0,0 +1,181 @@
+import os
+import glob
+import shutil
+import logging
+import tempfile
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_itemsize = np.dtype(np.uint64).itemsize
+
+
+class TripleDeduplicator:
+    '''
+    Removes RDF statements which have already been seen, across
+    every chunk and file which is passed through the same instance.
+
+    Statements are tracked as 64 bit hashes. While the tracked hashes fit within
+    half of memory_limit (bytes) they are kept in a sorted in-memory array, above that
+    they are merged into sorted on-disk partitions which are memory mapped when checked.
+    Each partition holds a range of hashes and is split in two once it grows beyond
+    half of memory_limit, so the number of partitions follows the volume spilled
+    and merging into them only holds a block of each in memory at a time.
+
+    If spill_dir is provided then the partitions are kept there after close
+    so that subsequent runs (for example other files from the cli) are deduplicated against them.
+    '''
+
+    def __init__(self, memory_limit: int = 256 * 1024 * 1024, spill_dir: Union[str, None] = None):
+        if memory_limit is None or memory_limit <= 0:
+            raise ValueError('memory_limit')
+
+        self.memory_limit = memory_limit
+        self.duplicates = 0
+        self.seen = 0
+
+        self._block = max(memory_limit // (8 * _itemsize), 1)
+        self._partition_limit = max(memory_limit // (2 * _itemsize), 1)
+        self._persistent = spill_dir is not None
+        self._spill_dir = spill_dir if self._persistent else tempfile.mkdtemp(prefix='dgraphpandas_dedup_')
+        os.makedirs(self._spill_dir, exist_ok=True)
+        self._memory = np.array([], dtype=np.uint64)
+
+        '''
+        A partition is named after the first hash of its range, which
+        runs up to the first hash of the next partition.
+        '''
+        self._starts = np.array(sorted(
+            int(os.path.basename(path).split('.')[0]) for path in glob.glob(os.path.join(self._spill_dir, '*.u64'))), dtype=np.uint64)
+
+    @property
+    def partitions(self) -> int:
+        return len(self._starts)
+
+    def _partition_path(self, start: int) -> str:
+        return os.path.join(self._spill_dir, f'{start}.u64')
+
+    def _open_partition(self, start: int) -> np.ndarray:
+        path = self._partition_path(start)
+        if not os.path.getsize(path):
+            return np.array([], dtype=np.uint64)
+        return np.memmap(path, dtype=np.uint64, mode='r')
+
+    def _merge(self, start: int, hashes: np.ndarray) -> List[int]:
+        '''
+        Merges sorted hashes into a partition a block at a time, splitting it into
+        partitions of at most half of memory_limit. Returns the starts of the partitions written.
+        '''
+        existing = self._open_partition(start)
+        merged_path = self._partition_path(start) + '.merging'
+        with open(merged_path, 'wb') as f:
+            position = 0
+            for offset in range(0, len(existing), self._block):
+                block = np.asarray(existing[offset:offset + self._block])
+                end = len(hashes) if offset + self._block >= len(existing) else np.searchsorted(hashes, block[-1], side='right')
+                np.union1d(block, hashes[position:end]).tofile(f)
+                position = end
+            hashes[position:].tofile(f)
+        del existing
+
+        merged = np.memmap(merged_path, dtype=np.uint64, mode='r')
+        starts = [start] + [int(merged[offset]) for offset in range(self._partition_limit, len(merged), self._partition_limit)]
+        bounds = list(range(0, len(merged), self._partition_limit))[1:]
+        if bounds:
+            logger.debug(f'Splitting the partition from {start} into {len(starts)} partitions')
+            for partition_start, begin, end in zip(starts, [0] + bounds, bounds + [len(merged)]):
+                with open(self._partition_path(partition_start) + '.split', 'wb') as f:
+                    for offset in range(begin, end, self._block):
+                        np.asarray(merged[offset:min(offset + self._block, end)]).tofile(f)
+            del merged
+            os.remove(merged_path)
+            for partition_start in starts:
+                os.replace(self._partition_path(partition_start) + '.split', self._partition_path(partition_start))
+        else:
+            del merged
+            os.replace(merged_path, self._partition_path(start))
+
+        return starts
+
+    def _spill(self):
+        '''
+        Merges the in-memory hashes into the on-disk partitions
+        for their range and frees the in-memory array.
+        '''
+        if not len(self._memory):
+            return
+
+        logger.debug(f'Spilling {len(self._memory)} hashes to {self._spill_dir}')
+        if not self.partitions:
+            open(self._partition_path(0), 'wb').close()
+            self._starts = np.array([0], dtype=np.uint64)
+
+        bounds = np.searchsorted(self._memory, self._starts).tolist() + [len(self._memory)]
+        starts = []
+        for partition, start in enumerate(self._starts.tolist()):
+            hashes = self._memory[bounds[partition]:bounds[partition + 1]]
+            starts.extend(self._merge(start, hashes) if len(hashes) else [start])
+
+        self._starts = np.array(starts, dtype=np.uint64)
+        self._memory = np.array([], dtype=np.uint64)
+
+    def _is_spilled(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        if not self.partitions or not len(hashes):
+            return found
+
+        assignments = np.searchsorted(self._starts, hashes, side='right') - 1
+        for partition in np.unique(assignments).tolist():
+            mask = assignments == partition
+            found[mask] = _contains(self._open_partition(int(self._starts[partition])), hashes[mask])
+
+        return found
+
+    def deduplicate(self, lines: List[str]) -> List[str]:
+        '''
+        Returns the given lines without any which have been seen before,
+        either earlier within lines or in a previous call.
+        '''
+        if lines is None:
+            raise ValueError('lines')
+        if not lines:
+            return lines
+
+        hashes = pd.util.hash_array(np.asarray(lines, dtype=object))
+        keep = ~pd.Series(hashes).duplicated().values
+        keep[keep] = ~(_contains(self._memory, hashes[keep]) | self._is_spilled(hashes[keep]))
+
+        new_hashes = hashes[keep]
+        self.duplicates += len(lines) - len(new_hashes)
+        self.seen += len(lines)
+        self._memory = np.union1d(self._memory, new_hashes)
+
+        if self._memory.nbytes > self.memory_limit // 2:
+            self._spill()
+
+        return np.asarray(lines, dtype=object)[keep].tolist()
+
+    def close(self):
+        '''
+        Reports the duplicates removed. Persistent spill directories
+        keep every hash seen, otherwise the spilled partitions are removed.
+        '''
+        logger.info(f'Removed {self.duplicates} duplicate statements out of {self.seen} ({self.partitions} partitions on disk)')
+        if self._persistent:
+            self._spill()
+        else:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._starts = np.array([], dtype=np.uint64)
+        self._memory = np.array([], dtype=np.uint64)
+
+
+def _contains(sorted_hashes: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+    if not len(sorted_hashes) or not len(hashes):
+        return np.zeros(len(hashes), dtype=bool)
+
+    positions = np.searchsorted(sorted_hashes, hashes)
+    positions[positions == len(sorted_hashes)] = 0
+    return np.asarray(sorted_hashes[positions] == hashes)
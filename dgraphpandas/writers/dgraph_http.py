@@ -0,0 +1,232 @@
+import json
+import time
+import queue
+import random
+import logging
+import threading
+import http.client
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple, Union
+
+from dgraphpandas.config import get_from_config
+from dgraphpandas.writers.batching import subject_batches
+from dgraphpandas.writers.dql import generate_upsert_block
+
+logger = logging.getLogger(__name__)
+
+
+class MutationError(Exception):
+    '''
+    Raised when Dgraph rejects a mutation, or keeps aborting it beyond the retries.
+    '''
+    pass
+
+
+def _is_aborted(errors: List[Dict]) -> bool:
+    for error in errors:
+        code = error.get('extensions', {}).get('code', '')
+        if code == 'ErrorAborted' or 'aborted' in error.get('message', '').lower():
+            return True
+    return False
+
+
+class DgraphHttpSink:
+    '''
+    Sends RDF statements straight to the HTTP endpoint of a Dgraph alpha
+    rather than writing exports for dgraph live.
+
+    Statements are cut into batches of batch_size, each sent as an upsert block
+    (matching nodes by upsert_predicate) and committed immediately. Up to concurrency
+    batches are in flight at once, each over a connection from a pool of keep alive
+    connections. A batch whose transaction is aborted (e.g because another batch in
+    flight touched the same node) is retried up to retries times with exponential backoff.
+
+    With group_by_subject, every subject's statements are kept in the same batch and
+    each in flight worker sends the batches for a disjoint set of subjects in turn,
+    so concurrent batches do not conflict on their subjects.
+
+    The upsert_predicate should be indexed with @upsert in the schema,
+    e.g xid: string @index(hash) @upsert .
+    '''
+
+    def __init__(
+            self,
+            address: str = 'http://localhost:8080',
+            batch_size: int = 1000,
+            concurrency: int = 4,
+            retries: int = 5,
+            backoff: float = 0.1,
+            upsert_predicate: str = 'xid',
+            timeout: float = 60,
+            group_by_subject: bool = False):
+        if not address:
+            raise ValueError('address')
+        if not batch_size or batch_size <= 0:
+            raise ValueError('batch_size')
+        if not concurrency or concurrency <= 0:
+            raise ValueError('concurrency')
+
+        parsed = urlparse(address if '://' in address else 'http://' + address)
+        self._connection_class = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+        self._host = parsed.hostname
+        self._port = parsed.port
+        self._path = parsed.path.rstrip('/') + '/mutate?commitNow=true'
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.upsert_predicate = upsert_predicate
+        self.timeout = timeout
+        self.group_by_subject = group_by_subject
+
+        self.batches = 0
+        self.statements = 0
+        self.retried = 0
+        self._lock = threading.Lock()
+
+        self._pool: queue.Queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='dgraph_http')
+
+    def _connection(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connection_class(self._host, self._port, timeout=self.timeout)
+
+    def _post(self, body: bytes) -> Tuple[int, Dict]:
+        connection = self._connection()
+        try:
+            connection.request('POST', self._path, body=body, headers={'Content-Type': 'application/rdf'})
+            response = connection.getresponse()
+            status, payload = response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            raise
+
+        self._pool.put(connection)
+        try:
+            return status, json.loads(payload or b'{}')
+        except ValueError:
+            return status, {'errors': [{'message': payload.decode('utf-8', 'replace')}]}
+
+    def _send_block(self, block: str, statements: int) -> int:
+        body = block.encode('utf-8')
+
+        for attempt in range(self.retries + 1):
+            try:
+                status, payload = self._post(body)
+                errors = payload.get('errors', [])
+                retry = _is_aborted(errors) or status >= 500
+            except (http.client.HTTPException, OSError) as e:
+                status, errors, retry = None, [{'message': str(e)}], True
+
+            if not errors and status is not None and status < 300:
+                return statements
+            if not retry or attempt == self.retries:
+                raise MutationError(f'Mutation of {statements} statements failed ({status}): {errors}')
+
+            delay = self.backoff * (2 ** attempt) * (1 + random.random())
+            logger.debug(f'Retrying batch in {delay:.2f}s after {errors}')
+            with self._lock:
+                self.retried += 1
+            time.sleep(delay)
+
+    def _send_batch(self, statements: List[str], delete: bool) -> int:
+        return self._send_block(generate_upsert_block(statements, self.upsert_predicate, delete), len(statements))
+
+    def _send_batches(self, batches: List[List[str]], delete: bool) -> int:
+        return sum(self._send_batch(batch, delete) for batch in batches)
+
+    def send(self, statements: List[str], delete: bool = False) -> int:
+        '''
+        Sends the statements in batches (concurrently) and waits for every
+        batch to be committed. Returns the number of statements sent.
+        '''
+        if statements is None:
+            raise ValueError('statements')
+
+        if self.group_by_subject:
+            worker_batches = [batches for batches in subject_batches(statements, self.batch_size, self.concurrency) if batches]
+        else:
+            worker_batches = [[statements[i:i + self.batch_size]] for i in range(0, len(statements), self.batch_size)]
+        batches = sum(len(batches) for batches in worker_batches)
+        logger.info(f'Sending {len(statements)} statements to Dgraph in {batches} batches')
+
+        futures = [self._executor.submit(self._send_batches, batches, delete) for batches in worker_batches]
+        sent = sum(future.result() for future in futures)
+
+        self.batches += batches
+        self.statements += sent
+        return sent
+
+    def send_blocks(self, blocks: List[str]) -> int:
+        '''
+        Sends upsert blocks which have already been built (e.g by generate_upsert_blocks)
+        concurrently and waits for every block to be committed. Returns the number of blocks sent.
+        '''
+        if blocks is None:
+            raise ValueError('blocks')
+
+        logger.info(f'Sending {len(blocks)} upsert blocks to Dgraph')
+        futures = [self._executor.submit(self._send_block, block, 1) for block in blocks]
+        sent = sum(future.result() for future in futures)
+
+        self.batches += sent
+        return sent
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def alter_schema(address: str, schema: str, timeout: float = 60):
+    '''
+    Applies a schema (and types) to a Dgraph alpha through its HTTP alter endpoint.
+    '''
+    if not address:
+        raise ValueError('address')
+    if schema is None:
+        raise ValueError('schema')
+
+    parsed = urlparse(address if '://' in address else 'http://' + address)
+    connection_class = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(parsed.hostname, parsed.port, timeout=timeout)
+    try:
+        connection.request('POST', parsed.path.rstrip('/') + '/alter', body=schema.encode('utf-8'))
+        response = connection.getresponse()
+        status, payload = response.status, response.read()
+    finally:
+        connection.close()
+
+    try:
+        errors = json.loads(payload or b'{}').get('errors', [])
+    except ValueError:
+        errors = [{'message': payload.decode('utf-8', 'replace')}]
+    if errors or status >= 300:
+        raise MutationError(f'Altering the schema failed ({status}): {errors}')
+
+
+def create_sink(config: Dict[str, Any], **kwargs) -> Union[DgraphHttpSink, None]:
+    '''
+    Creates a sink from the dgraph_* options, or None when there is no dgraph_address.
+    '''
+    address: str = get_from_config('dgraph_address', config, None, **(kwargs))
+    if not address:
+        return None
+
+    options = {
+        'batch_size': get_from_config('dgraph_batch_size', config, None, **(kwargs)),
+        'concurrency': get_from_config('dgraph_concurrency', config, None, **(kwargs)),
+        'retries': get_from_config('dgraph_retries', config, None, **(kwargs)),
+        'upsert_predicate': get_from_config('dgraph_upsert_predicate', config, None, **(kwargs)),
+        'group_by_subject': get_from_config('subject_batches', config, None, **(kwargs)),
+    }
+    return DgraphHttpSink(address, **{key: value for key, value in options.items() if value is not None})
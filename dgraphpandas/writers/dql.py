@@ -0,0 +1,114 @@
+import re
+import gzip
+import logging
+from typing import Dict, List
+
+from dgraphpandas.writers.batching import group_by_subject
+from dgraphpandas.writers.subjects import statement_subject
+
+logger = logging.getLogger(__name__)
+
+_statement_pattern = re.compile(r'^<[^>]+> <([^>]+)> (.+) \.$')
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def generate_upsert_block(statements: List[str], upsert_predicate: str = 'xid', delete: bool = False) -> str:
+    '''
+    Builds a DQL upsert block for RDF statements so that subjects (and edge targets)
+    are matched to existing nodes by their upsert_predicate, as dgraph live does with --upsertPredicate.
+
+    <student_1> <school> <school_1> .
+
+    becomes
+
+    upsert {
+      query {
+        v0 as var(func: eq(xid, "student_1"))
+        v1 as var(func: eq(xid, "school_1"))
+      }
+      mutation {
+        set {
+          uid(v0) <school> uid(v1) .
+          uid(v0) <xid> "student_1" .
+          uid(v1) <xid> "school_1" .
+        }
+      }
+    }
+
+    Every xid is looked up in the same query so the whole block is one round trip. Each gets a
+    variable of its own as eq(xid, [...]) would match them all into one variable which the
+    mutation could not tell apart. When a variable matches nothing Dgraph creates the node, so
+    the upsert_predicate is always set on the nodes being set. Deletes only match existing nodes.
+    '''
+    if statements is None:
+        raise ValueError('statements')
+
+    variables: Dict[str, str] = {}
+
+    def _variable(xid: str) -> str:
+        if xid not in variables:
+            variables[xid] = f'v{len(variables)}'
+        return variables[xid]
+
+    mutations = []
+    for statement in statements:
+        match = _statement_pattern.match(statement)
+        if not match:
+            raise ValueError(f'Could not parse statement {statement}')
+
+        predicate, obj = match.groups()
+        subject = _variable(statement_subject(statement))
+        if obj.startswith('<') and obj.endswith('>'):
+            obj = f'uid({_variable(obj[1:-1])})'
+        mutations.append(f'uid({subject}) <{predicate}> {obj} .')
+
+    if not delete:
+        mutations += [f'uid({variable}) <{upsert_predicate}> {_quote(xid)} .' for xid, variable in variables.items()]
+
+    query = '\n'.join(f'    {variable} as var(func: eq({upsert_predicate}, {_quote(xid)}))' for xid, variable in variables.items())
+    body = '\n'.join('      ' + mutation for mutation in mutations)
+    return f'upsert {{\n  query {{\n{query}\n  }}\n  mutation {{\n    {"delete" if delete else "set"} {{\n{body}\n    }}\n  }}\n}}'
+
+
+def generate_upsert_blocks(statements: List[str], batch_size: int = 100, upsert_predicate: str = 'xid', delete: bool = False) -> List[str]:
+    '''
+    Builds an upsert block for every batch_size subjects, with all of
+    the statements of a subject (intrinsic and edges) in the same block.
+    '''
+    if statements is None:
+        raise ValueError('statements')
+    if not batch_size or batch_size <= 0:
+        raise ValueError('batch_size')
+
+    groups = list(group_by_subject(statements).values())
+    blocks = [
+        generate_upsert_block([statement for group in groups[start:start + batch_size] for statement in group], upsert_predicate, delete)
+        for start in range(0, len(groups), batch_size)]
+
+    logger.debug(f'Built {len(blocks)} upsert blocks for {len(groups)} subjects')
+    return blocks
+
+
+def write_upsert_blocks(path: str, blocks: List[str], encoding: str = 'utf-8', compresslevel: int = 9) -> int:
+    '''
+    Writes upsert blocks to a gzip file, separated by a blank line, one block at a time.
+    Each block can be posted to /mutate?commitNow=true on its own.
+
+    Returns the uncompressed bytes written.
+    '''
+    if not path:
+        raise ValueError('path')
+    if blocks is None:
+        raise ValueError('blocks')
+
+    written = 0
+    with gzip.open(path, mode='wb', compresslevel=compresslevel) as zip_file:
+        for block in blocks:
+            s = (block + '\n\n').encode(encoding=encoding)
+            zip_file.write(s)
+            written += len(s)
+
+    return written
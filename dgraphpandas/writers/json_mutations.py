@@ -0,0 +1,211 @@
+import re
+import json
+import gzip
+import logging
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from dgraphpandas.types import default_rdf_type
+from dgraphpandas.writers.subjects import statement_subject
+
+logger = logging.getLogger(__name__)
+
+_statement_pattern = re.compile(r'^<[^>]*> <([^>]*)> (?:"(.*)"\^\^<([^>]*)>|<([^>]*)>) \.$')
+
+
+def _to_int(values: pd.Series) -> pd.Series:
+    '''
+    Integer columns with nulls are read as floats, so 1.0 is written as 1.
+    '''
+    numbers = pd.to_numeric(values, errors='coerce')
+    integral = (numbers.notna() & (numbers == np.floor(numbers))).values
+    typed = values.astype(object)
+    typed[integral] = numbers[integral].astype('int64').astype(object)
+    return typed
+
+
+def _to_float(values: pd.Series) -> pd.Series:
+    numbers = pd.to_numeric(values, errors='coerce')
+    finite = np.isfinite(numbers.values.astype(float))
+    typed = values.astype(object)
+    typed[finite] = numbers[finite].astype(object)
+    return typed
+
+
+def _to_bool(values: pd.Series) -> pd.Series:
+    booleans = values.str.lower().map({'true': True, 'false': False, '1': True, '0': False})
+    known = booleans.notna().values
+    typed = values.astype(object)
+    typed[known] = booleans[known]
+    return typed
+
+
+'''
+The RDF type of a value (from the type_overrides) decides its JSON type.
+Values which cannot be converted and every other type (e.g xs:dateTime) stay strings.
+'''
+_converters: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    'xs:int': _to_int,
+    'xs:float': _to_float,
+    'xs:boolean': _to_bool,
+}
+
+
+def _typed_values(values: pd.Series, types: pd.Series) -> pd.Series:
+    typed = values.astype(object)
+    for rdf_type, convert in _converters.items():
+        mask = (types == rdf_type).values
+        if mask.any():
+            typed[mask] = convert(values[mask]).values
+    return typed
+
+
+def _group_mutations(subjects: np.ndarray, predicates: np.ndarray, values: np.ndarray, is_edge: np.ndarray) -> List[Dict[str, Any]]:
+    '''
+    Groups the values into a mutation object for every subject (in the order the subjects first
+    appeared) and a key for every predicate. The (subject, predicate) groups are found vectorized
+    so there is only one step in python for every predicate of a node rather than every value.
+
+    A predicate with more than one value becomes a list and edges
+    are always a list of the nodes they point to.
+    '''
+    if len(subjects) == 0:
+        return []
+
+    subject_codes, unique_subjects = pd.factorize(subjects)
+    keys = pd.DataFrame({'subject': subject_codes, 'predicate': predicates}).groupby(['subject', 'predicate'], sort=False).ngroup().values
+    order = np.argsort(keys, kind='stable')
+    starts = np.flatnonzero(np.r_[True, np.diff(keys[order]) != 0])
+    ends = np.r_[starts[1:], len(order)]
+    firsts = order[starts]
+    values = values[order].tolist()
+
+    nodes: List[Dict[str, Any]] = [{'uid': '_:' + subject} for subject in unique_subjects]
+    for start, end, node, predicate, edge in zip(
+            starts.tolist(), ends.tolist(), subject_codes[firsts].tolist(), predicates[firsts].tolist(), is_edge[firsts].tolist()):
+        nodes[node][predicate] = values[start:end] if edge or end - start > 1 else values[start]
+
+    return nodes
+
+
+def _edge_values(objects: List[str]) -> np.ndarray:
+    values = np.empty(len(objects), dtype=object)
+    values[:] = [{'uid': '_:' + obj} for obj in objects]
+    return values
+
+
+def generate_json_mutations(statements: List[str]) -> List[Dict[str, Any]]:
+    '''
+    Groups RDF statements by their subject into Dgraph JSON mutation objects:
+
+    <sloth> <dgraph.type> "Animal"^^<xs:string> .
+    <sloth> <legs> "4"^^<xs:int> .
+    <sloth> <species> <mammal> .
+
+    becomes
+
+    {"uid": "_:sloth", "dgraph.type": "Animal", "legs": 4, "species": [{"uid": "_:mammal"}]}
+
+    Subjects keep the order they first appeared in. A predicate with more than one value
+    becomes a list and edges are always a list of the nodes they point to.
+
+    When the transformed frames are at hand, generate_json_mutations_from_frames
+    builds the same objects without making the statements first.
+    '''
+    if statements is None:
+        raise ValueError('statements')
+    if not statements:
+        return []
+
+    '''
+    pandas' str.extract has a large overhead for every row so the
+    statements are matched directly and only the values are converted as columns.
+    '''
+    matches = [_statement_pattern.match(statement) for statement in statements]
+    if None in matches:
+        raise ValueError(f'Could not parse statement {statements[matches.index(None)]}')
+    predicates, values, types, objects = zip(*(match.groups() for match in matches))
+    subjects = [statement_subject(statement) for statement in statements]
+
+    parts = pd.DataFrame({'value': values, 'type': types, 'object': objects}, dtype=object)
+    is_edge = parts['object'].notna().values
+    values = np.empty(len(parts), dtype=object)
+    values[is_edge] = _edge_values(parts['object'][is_edge].tolist())
+    values[~is_edge] = _typed_values(parts['value'][~is_edge], parts['type'][~is_edge]).values
+
+    nodes = _group_mutations(np.array(subjects, dtype=object), np.array(predicates, dtype=object), values, is_edge)
+    logger.debug(f'Grouped {len(statements)} statements into {len(nodes)} JSON mutations')
+    return nodes
+
+
+def generate_json_mutations_from_frames(intrinsic: pd.DataFrame, edges: pd.DataFrame, drop_na_objects: bool = True) -> List[Dict[str, Any]]:
+    '''
+    Builds the Dgraph JSON mutation objects (as generate_json_mutations) straight from the
+    transformed intrinsic and edges frames, without making the RDF statements first.
+    The values are typed a column at a time from the RDF type of each row.
+
+    The frames are read as generate_upserts reads them so the objects hold
+    the same values the statements would, and they are not changed.
+    '''
+    if intrinsic is None:
+        raise ValueError('intrinsic')
+    if edges is None:
+        raise ValueError('edges')
+
+    for col in ['subject', 'predicate', 'object', 'type']:
+        if col not in intrinsic.columns:
+            raise ValueError(f'{col} is not within intrinsic columns {intrinsic.columns}')
+    for col in ['subject', 'predicate', 'object']:
+        if col not in edges.columns:
+            raise ValueError(f'{col} is not within edges columns {edges.columns}')
+
+    if drop_na_objects:
+        intrinsic = intrinsic.loc[intrinsic['object'].notna()]
+
+    '''
+    There are only a few types so the brackets are stripped from each once.
+    '''
+    type_codes, unique_types = pd.factorize(intrinsic['type'].fillna(default_rdf_type).astype(str))
+    types = pd.Series(unique_types.str.strip('<>').values[type_codes] if len(unique_types) else [], dtype=object)
+    intrinsic_values = _typed_values(intrinsic['object'].astype(str).reset_index(drop=True), types).values
+    edge_values = _edge_values(edges['object'].astype(str).tolist())
+
+    nodes = _group_mutations(
+        np.concatenate([intrinsic['subject'].astype(str).values, edges['subject'].astype(str).values]).astype(object),
+        np.concatenate([intrinsic['predicate'].astype(str).values, edges['predicate'].astype(str).values]).astype(object),
+        np.concatenate([intrinsic_values, edge_values]),
+        np.r_[np.zeros(len(intrinsic), dtype=bool), np.ones(len(edges), dtype=bool)])
+    logger.debug(f'Grouped {len(intrinsic)} intrinsic and {len(edges)} edge rows into {len(nodes)} JSON mutations')
+    return nodes
+
+
+def write_json_mutations(
+        path: str,
+        mutations: List[Dict[str, Any]],
+        encoding: str = 'utf-8',
+        compresslevel: int = 9,
+        batch_size: int = 1000) -> int:
+    '''
+    Writes the mutations to a gzip file as JSON arrays of up to batch_size objects, one array
+    per line, so each line can be sent (or loaded) as a mutation on its own.
+    The arrays are serialized and written one batch at a time.
+
+    Returns the uncompressed bytes written.
+    '''
+    if not path:
+        raise ValueError('path')
+    if mutations is None:
+        raise ValueError('mutations')
+    if not batch_size or batch_size <= 0:
+        raise ValueError('batch_size')
+
+    written = 0
+    with gzip.open(path, mode='wb', compresslevel=compresslevel) as zip_file:
+        for start in range(0, len(mutations), batch_size):
+            s = (json.dumps(mutations[start:start + batch_size], ensure_ascii=False) + '\n').encode(encoding=encoding)
+            zip_file.write(s)
+            written += len(s)
+
+    return written
@@ -1,15 +1,53 @@
 import os
+import re
+import gzip
 import logging
-from typing import List
+from typing import List, Set, Tuple
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+_index_directives = re.compile(r'@index\b(\([^)]*\))?|@reverse\b|@count\b|@upsert\b')
+_schema_statement = re.compile(r'^\s*<?([^\s:<>]+)>?\s*:\s*(\[?\s*\w+\s*\]?)\s*(.*?)\s*\.\s*$')
+_index_tokenizers = re.compile(r'@index\s*(?:\(([^)]*)\))?')
+
+
+def _join_schema(frame: pd.DataFrame) -> str:
+    '''
+    Joins each column, type and options into a schema statement
+    '''
+    logger.debug('Concatting columns')
+    frame.loc[frame['options'].isnull(), 'joined'] = frame['column'] + ': ' + frame['type'] + ' .'
+    frame.loc[~frame['options'].isnull(), 'joined'] = frame['column'] + ': ' + frame['type'] + ' ' + frame['options'] + ' .'
+
+    logger.debug('Joining Expressions into string')
+    joined_expression_frame: List[str] = frame['joined'].unique().tolist()
+    return '\n'.join(joined_expression_frame)
+
+
+def _strip_index_options(frame: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Removes indexes and reverse edges (and the directives which depend on an index)
+    from the options so the predicates can be loaded without Dgraph maintaining them.
+    The xid index is kept as it is required by --upsertPredicate during the load.
+    '''
+    frame = frame.copy()
+    stripped = frame['options'].str.replace(_index_directives, '', regex=True).str.split().str.join(' ')
+    stripped = stripped.where(stripped != '', None)
+
+    keep_mask = frame['column'] == 'xid'
+    frame.loc[~keep_mask, 'options'] = stripped[~keep_mask]
+    return frame
+
 
 def generate_schema(frame: pd.DataFrame, **kwargs) -> str:
     '''
     Given the pre-processed DataFrame from the schema
     strategy, generate a schema.
+
+    If two_phase_schema is enabled then the returned (and exported) schema is the
+    load schema without indexes or reverse edges and a separate post load schema
+    which adds them back is exported to post_load_export_file.
     '''
     if frame is None:
         raise ValueError('frame')
@@ -25,14 +63,18 @@ def generate_schema(frame: pd.DataFrame, **kwargs) -> str:
     output_dir = kwargs.get('output_dir', '.')
     export_schema = kwargs.get('export_schema', False)
     export_file = kwargs.get('export_file', 'schema.txt')
+    two_phase_schema = kwargs.get('two_phase_schema', False)
+    post_load_export_file = kwargs.get('post_load_export_file', 'schema_post_load.txt')
 
-    logger.debug('Concatting columns')
-    frame.loc[frame['options'].isnull(), 'joined'] = frame['column'] + ': ' + frame['type'] + ' .'
-    frame.loc[~frame['options'].isnull(), 'joined'] = frame['column'] + ': ' + frame['type'] + ' ' + frame['options'] + ' .'
+    if two_phase_schema:
+        logger.debug('Splitting schema into load and post load phases')
+        load_frame = _strip_index_options(frame)
+        post_load_frame = frame.loc[(frame['options'].fillna('') != load_frame['options'].fillna('')).values]
 
-    logger.debug('Joining Expressions into string')
-    joined_expression_frame: List[str] = frame['joined'].unique().tolist()
-    joined_string = '\n'.join(joined_expression_frame)
+        joined_string = _join_schema(load_frame)
+        post_load_string = _join_schema(post_load_frame)
+    else:
+        joined_string = _join_schema(frame)
 
     if export_schema:
         export_file = os.path.join(output_dir, export_file)
@@ -40,4 +82,141 @@ def generate_schema(frame: pd.DataFrame, **kwargs) -> str:
         with open(export_file, 'w') as f:
             f.write(joined_string)
 
+        if two_phase_schema:
+            post_load_export_file = os.path.join(output_dir, post_load_export_file)
+            logger.info(f'Writing post load schema to {post_load_export_file}')
+            with open(post_load_export_file, 'w') as f:
+                f.write(post_load_string)
+
     return joined_string
+
+
+def _read_schema(path: str) -> str:
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt') as f:
+        return f.read()
+
+
+def _parse_schema(schema: str) -> pd.DataFrame:
+    '''
+    Parses the predicate statements of a schema (as generated here or
+    exported from Dgraph) into column, type and options.
+    Type definitions and Dgraph internal predicates are skipped.
+    '''
+    if schema is None:
+        raise ValueError('schema')
+
+    rows = []
+    in_type = False
+    for line in schema.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if in_type or line.startswith('type '):
+            in_type = '}' not in line
+            continue
+
+        match = _schema_statement.match(line)
+        if not match:
+            logger.warning(f'Could not parse schema statement {line}')
+            continue
+
+        column, predicate_type, options = match.groups()
+        if column.startswith('dgraph.'):
+            continue
+        rows.append((column, predicate_type.replace(' ', ''), options or None))
+
+    return pd.DataFrame(rows, columns=['column', 'type', 'options'])
+
+
+def _split_options(options: str) -> Tuple[Set[str], Set[str]]:
+    '''
+    Splits options into the set of index tokenizers and the set of other directives
+    so that ordering and spacing differences are not treated as changes.
+    '''
+    if not isinstance(options, str):
+        return set(), set()
+
+    tokenizers: Set[str] = set()
+    for match in _index_tokenizers.finditer(options):
+        tokenizers.update(token.strip() for token in (match.group(1) or '').split(',') if token.strip())
+        tokenizers.add('@index')
+
+    directives = set(_index_tokenizers.sub('', options).split())
+    return tokenizers, directives
+
+
+def _classify_change(previous_type: str, previous_options: str, current_type: str, current_options: str) -> str:
+    '''
+    Classifies the cost of changing a predicate definition:
+        full: the type (or @lang) changed so every value and index of the predicate is rebuilt
+        index: new tokenizers or directives have to be built
+        drop: indexes or directives are only being removed
+        none: no change
+    '''
+    if previous_type != current_type:
+        return 'full'
+
+    previous_tokenizers, previous_directives = _split_options(previous_options)
+    current_tokenizers, current_directives = _split_options(current_options)
+
+    if '@lang' in previous_directives.symmetric_difference(current_directives):
+        return 'full'
+    if current_tokenizers - previous_tokenizers or current_directives - previous_directives:
+        return 'index'
+    if previous_tokenizers - current_tokenizers or previous_directives - current_directives:
+        return 'drop'
+
+    return 'none'
+
+
+def generate_schema_diff(frame: pd.DataFrame, existing_schema: str, **kwargs) -> pd.DataFrame:
+    '''
+    Compares the pre-processed DataFrame from the schema strategy against
+    an existing schema file so that only predicates whose type or options changed
+    need to be altered. Predicates which only exist in the existing schema are left alone.
+
+    Returns a DataFrame of the changed predicates with their alter statement and
+    the reindex required (full, index, drop or new). If export_schema is set then the
+    alter statements are written to diff_export_file.
+    '''
+    if frame is None:
+        raise ValueError('frame')
+    if not existing_schema:
+        raise ValueError('existing_schema')
+    for column in ['column', 'type', 'options']:
+        if column not in frame:
+            raise ValueError(column)
+
+    output_dir = kwargs.get('output_dir', '.')
+    export_schema = kwargs.get('export_schema', False)
+    diff_export_file = kwargs.get('diff_export_file', 'schema_diff.txt')
+
+    logger.info(f'Comparing schema against {existing_schema}')
+    previous = _parse_schema(_read_schema(existing_schema))
+    previous = previous.drop_duplicates(subset=['column'], keep='last')
+    current = frame[['column', 'type', 'options']].drop_duplicates(subset=['column'], keep='last')
+
+    compared = current.merge(previous, on='column', how='left', suffixes=('', '_previous'))
+    compared['reindex'] = [
+        'new' if pd.isnull(previous_type) else _classify_change(previous_type, previous_options, current_type, current_options)
+        for current_type, current_options, previous_type, previous_options
+        in zip(compared['type'], compared['options'], compared['type_previous'], compared['options_previous'])
+    ]
+
+    changed = compared.loc[compared['reindex'] != 'none'].copy()
+    changed['alter'] = changed['column'] + ': ' + changed['type'] + \
+        changed['options'].map(lambda options: ' ' + options if isinstance(options, str) and options else '') + ' .'
+    changed = changed[['column', 'type_previous', 'options_previous', 'type', 'options', 'reindex', 'alter']].reset_index(drop=True)
+
+    for row in changed.loc[changed['reindex'] == 'full'].itertuples(index=False):
+        logger.warning(f'{row.column} changes from {row.type_previous} to {row.type} which forces a full reindex')
+
+    logger.info(f'{len(changed)} of {len(current)} predicates changed')
+    if export_schema:
+        export_path = os.path.join(output_dir, diff_export_file)
+        logger.info(f'Writing schema diff to {export_path}')
+        with open(export_path, 'w') as f:
+            f.write('\n'.join(changed['alter'].tolist()))
+
+    return changed
@@ -0,0 +1,43 @@
+import logging
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from dgraphpandas.writers.subjects import shard_of, statement_subjects
+
+logger = logging.getLogger(__name__)
+
+
+def shard_statements(statements: List[str], shards: int) -> List[List[str]]:
+    '''
+    Routes RDF statements into shards by their subject, keeping their order within each shard.
+    '''
+    if statements is None:
+        raise ValueError('statements')
+    if not shards or shards <= 0:
+        raise ValueError('shards')
+    if not statements:
+        return [[] for _ in range(shards)]
+
+    series = pd.Series(statements, dtype=object)
+    assignments = shard_of(statement_subjects(series).values, shards)
+
+    logger.debug(f'Sharding {len(statements)} statements into {shards} shards')
+    return [series.values[assignments == shard].tolist() for shard in range(shards)]
+
+
+def even_shards(statements: List[str], shards: int) -> List[List[str]]:
+    '''
+    Cuts RDF statements into shards of (close to) the same size in bytes, keeping
+    their order. Unlike shard_statements, the shard of a subject is not stable.
+    '''
+    if statements is None:
+        raise ValueError('statements')
+    if not shards or shards <= 0:
+        raise ValueError('shards')
+
+    sizes = np.cumsum(np.fromiter(map(len, statements), dtype=np.int64, count=len(statements)))
+    total = sizes[-1] if len(sizes) else 0
+    bounds = [0] + np.searchsorted(sizes, [total * shard / shards for shard in range(1, shards)], side='right').tolist() + [len(statements)]
+    return [statements[start:end] for start, end in zip(bounds, bounds[1:])]
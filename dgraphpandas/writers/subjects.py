@@ -0,0 +1,68 @@
+import logging
+from typing import Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_subject_pattern = r'^<([^>]*)>'
+
+# hash_array needs a key of 16 bytes, it differs from the default key used for shards
+_worker_hash_key = 'dgraphpandas_wkr'
+
+
+def statement_subject(statement: str) -> str:
+    '''
+    The subject xid of an RDF statement:
+
+    <sloth> <legs> "4"^^<xs:int> .
+
+    has the subject sloth.
+    '''
+    return statement[1:statement.index('>')]
+
+
+def statement_subjects(statements: Union[Iterable[str], pd.Series]) -> pd.Series:
+    '''
+    The subject xid of every RDF statement as a Series (vectorized
+    statement_subject). Lines which are not statements (e.g blank) are NA.
+    '''
+    if statements is None:
+        raise ValueError('statements')
+
+    statements = statements if isinstance(statements, pd.Series) else pd.Series(list(statements), dtype=object)
+    if statements.empty:
+        return pd.Series([], dtype=object)
+    return statements.str.extract(_subject_pattern, expand=False)
+
+
+def shard_of(subjects: Union[Iterable[str], np.ndarray], shards: int) -> np.ndarray:
+    '''
+    The shard of every subject in the array. pandas' hash_array (siphash with a fixed key)
+    is used as it is vectorized and gives the same hash for a subject across runs,
+    processes and files unlike the builtin hash.
+
+    Everything which routes subjects to shards uses this so a
+    subject is routed the same way whichever export it is in.
+    '''
+    if subjects is None:
+        raise ValueError('subjects')
+    if not shards or shards <= 0:
+        raise ValueError('shards')
+
+    return pd.util.hash_array(np.asarray(subjects, dtype=object)) % np.uint64(shards)
+
+
+def worker_of(subjects: Union[Iterable[str], np.ndarray], workers: int) -> np.ndarray:
+    '''
+    The subject batch worker of every subject in the array. This is stable in the same way as
+    shard_of but hashed with another key, so it is independent of the shard. Within a shard
+    (where every subject has the same shard_of) the subjects are still spread over every worker.
+    '''
+    if subjects is None:
+        raise ValueError('subjects')
+    if not workers or workers <= 0:
+        raise ValueError('workers')
+
+    return pd.util.hash_array(np.asarray(subjects, dtype=object), hash_key=_worker_hash_key) % np.uint64(workers)
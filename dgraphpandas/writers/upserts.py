@@ -7,7 +7,17 @@ from dgraphpandas.types import default_rdf_type
 logger = logging.getLogger(__name__)
 
 
-def _generate_intrinsic(intrinsic: pd.DataFrame) -> List[str]:
+def _node(nodes: pd.Series, blank_nodes: bool) -> pd.Series:
+    '''
+    Upserts refer to a node by its xid as an IRI (<sloth>) and the bulk
+    loader by a blank node (_:sloth) which it assigns a uid to.
+    '''
+    if blank_nodes:
+        return '_:' + nodes
+    return '<' + nodes + '>'
+
+
+def _generate_intrinsic(intrinsic: pd.DataFrame, blank_nodes: bool = False) -> List[str]:
     '''
     Generates Intrinsic RDF records from the given frame.
     Intrinsic records are fields for a given node:
@@ -20,14 +30,14 @@ def _generate_intrinsic(intrinsic: pd.DataFrame) -> List[str]:
     intrinsic['object'] = intrinsic['object'].astype(str)
 
     intrinsic['type'] = intrinsic['type'].fillna(default_rdf_type)
-    intrinsic['dql'] = '<' + intrinsic['subject'] + '>' + ' ' + '<' + intrinsic['predicate'] + \
+    intrinsic['dql'] = _node(intrinsic['subject'], blank_nodes) + ' ' + '<' + intrinsic['predicate'] + \
         '>' + ' ' + '"' + intrinsic['object'] + '"' + '^^' + intrinsic['type'] + ' .'
     intrinsic.drop(columns=['subject', 'predicate', 'object', 'type'], inplace=True)
     intrinsic = intrinsic['dql'].values.tolist()
     return intrinsic
 
 
-def _generate_edges(edges: pd.DataFrame) -> List[str]:
+def _generate_edges(edges: pd.DataFrame, blank_nodes: bool = False) -> List[str]:
     '''
     Generates Edge RDF records for the given frame.
     Edge records connect nodes:
@@ -39,7 +49,7 @@ def _generate_edges(edges: pd.DataFrame) -> List[str]:
     edges['predicate'] = edges['predicate'].astype(str)
     edges['object'] = edges['object'].astype(str)
 
-    edges['dql'] = '<' + edges['subject'] + '>' + ' ' + '<' + edges['predicate'] + '>' + ' ' + '<' + edges['object'] + '>' + ' .'
+    edges['dql'] = _node(edges['subject'], blank_nodes) + ' ' + '<' + edges['predicate'] + '>' + ' ' + _node(edges['object'], blank_nodes) + ' .'
     edges.drop(columns=['subject', 'predicate', 'object', 'type'], inplace=True)
     edges = edges['dql'].values.tolist()
     return edges
@@ -47,9 +57,12 @@ def _generate_edges(edges: pd.DataFrame) -> List[str]:
 
 def generate_upserts(
         intrinsic: pd.DataFrame,
-        edges: pd.DataFrame, drop_na_objects=True) -> Tuple[List[str], List[str]]:
+        edges: pd.DataFrame, drop_na_objects=True, blank_nodes=False) -> Tuple[List[str], List[str]]:
     '''
     Generates RDF Upsert Statements for the given intrinsic and edges frames.
+
+    With blank_nodes, subjects and objects are written as blank nodes (_:sloth)
+    for the bulk loader rather than as the xids dgraph live upserts on.
     '''
 
     if intrinsic is None:
@@ -71,7 +84,7 @@ def generate_upserts(
         logger.debug('Dropping NA Objects from intrinsic')
         intrinsic.dropna(subset=['object'], inplace=True)
 
-    intrinsic_upserts = _generate_intrinsic(intrinsic)
-    edge_upserts = _generate_edges(edges)
+    intrinsic_upserts = _generate_intrinsic(intrinsic, blank_nodes)
+    edge_upserts = _generate_edges(edges, blank_nodes)
 
     return (intrinsic_upserts, edge_upserts)
@@ -84,7 +84,7 @@ class HorizontalTests(unittest.TestCase):
             }
         }
         config_file_key = 'customer'
-        with self.assertRaises(SystemExit):
+        with self.assertRaisesRegex(ValueError, 'Could not convert age to int32'):
             horizontal_transform(frame, config, config_file_key)
 
     @parameterized.expand([
@@ -169,12 +169,11 @@ class HorizontalTests(unittest.TestCase):
             })
         )
     ])
-    @patch('dgraphpandas.strategies.horizontal.vertical_transform')
+    @patch('dgraphpandas.strategies.transformer.Transformer._transform_vertical')
     def test_horizontal_melted_passed(self, name, frame, config, config_file_key, expected_melted, transform_mock: Mock):
         '''
         Ensures that the passed horizontal frame is melted and
-        passed into the vertical_transform.
-        Also ensures the same config and key are passed through
+        passed into the vertical transform
         '''
         intrinsic_mock = Mock(spec=pd.DataFrame)
         edges_mock = Mock(spec=pd.DataFrame)
@@ -184,11 +183,9 @@ class HorizontalTests(unittest.TestCase):
 
         transform_mock.assert_called_once()
         args, kwargs = transform_mock.call_args_list[0]
-        invoked_frame, invoked_config, invoked_key = args
+        invoked_frame, = args
 
         assert_frame_equal(invoked_frame, expected_melted)
-        self.assertEqual(invoked_config, config)
-        self.assertEqual(invoked_key, config_file_key)
         self.assertEqual(kwargs, {})
         self.assertEqual(intrinsic_mock, intrinsic)
         self.assertEqual(edges_mock, edges)
@@ -219,7 +216,7 @@ class HorizontalTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             horizontal_transform(frame, config, config_key)
 
-    @patch('dgraphpandas.strategies.horizontal.vertical_transform')
+    @patch('dgraphpandas.strategies.transformer.Transformer._transform_vertical')
     @patch('dgraphpandas.strategies.horizontal.pd.read_csv', spec=pd.read_csv)
     def test_horizontal_melted_file_path_passed(self, mock_pandas: Mock, mock_transform: Mock):
         '''
@@ -260,10 +257,8 @@ class HorizontalTests(unittest.TestCase):
 
         args, kwargs = mock_transform.call_args_list[0]
         assert_frame_equal(expected_melted, args[0])
-        self.assertEqual(config, args[1])
-        self.assertEqual(config_file_key, args[2])
 
-    @patch('dgraphpandas.strategies.horizontal.vertical_transform')
+    @patch('dgraphpandas.strategies.transformer.Transformer._transform_vertical')
     @patch('dgraphpandas.strategies.horizontal.pd.read_csv', spec=pd.read_csv)
     def test_horizontal_melted_file_path_custom_csv_passed(self, mock_pandas: Mock, mock_transform: Mock):
         '''
@@ -305,8 +300,6 @@ class HorizontalTests(unittest.TestCase):
 
         args, kwargs = mock_transform.call_args_list[0]
         assert_frame_equal(expected_melted, args[0])
-        self.assertEqual(config, args[1])
-        self.assertEqual(config_file_key, args[2])
 
     @parameterized.expand([
         ###
@@ -360,7 +353,7 @@ class HorizontalTests(unittest.TestCase):
             })
         )
     ])
-    @patch('dgraphpandas.strategies.horizontal.vertical_transform')
+    @patch('dgraphpandas.strategies.transformer.Transformer._transform_vertical')
     def test_horizontal_transform_incorrect_date_format(self, name, date_format, frame, transform_mock: Mock):
         '''
         Ensures when the date format provided does not match the value within the frame,
@@ -402,7 +395,7 @@ class HorizontalTests(unittest.TestCase):
             })
         )
     ])
-    @patch('dgraphpandas.strategies.horizontal.vertical_transform')
+    @patch('dgraphpandas.strategies.transformer.Transformer._transform_vertical')
     def test_horizontal_transform_unconverted_date_parts(self, name, date_format, frame, transform_mock: Mock):
         '''
         Ensures when the date partially matches and there are some converted
@@ -498,7 +491,7 @@ class HorizontalTests(unittest.TestCase):
             })
         )
     ])
-    @patch('dgraphpandas.strategies.horizontal.vertical_transform')
+    @patch('dgraphpandas.strategies.transformer.Transformer._transform_vertical')
     def test_horizontal_transform_correct_date_format(self, name, date_format, frame, expected_melted, transform_mock: Mock):
         '''
         Ensures when the date_format provided is in the correct format,
@@ -519,9 +512,7 @@ class HorizontalTests(unittest.TestCase):
         transform_mock.assert_called_once()
         args, kwargs = transform_mock.call_args_list[0]
 
-        passed_frame, passed_config, passed_config_key = args
+        passed_frame, = args
 
         assert_frame_equal(passed_frame, expected_melted)
-        self.assertEqual(passed_config, config)
-        self.assertEqual(passed_config_key, config_file_key)
         self.assertEqual(kwargs, {})
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.strategies.index_advisor import _HyperLogLog, _leading_zeros, _suggest_index, profile_predicates, advise_options
+
+
+class IndexAdvisorTests(unittest.TestCase):
+
+    @parameterized.expand([
+        ('low', 3),
+        ('high', 17),
+    ])
+    def test_hyperloglog_bad_precision(self, name, precision):
+        '''
+        Ensures when the precision is out of range, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            _HyperLogLog(precision)
+
+    @parameterized.expand([
+        ('small', 50),
+        ('medium', 5_000),
+        ('large', 200_000),
+    ])
+    def test_hyperloglog_count(self, name, distinct):
+        '''
+        Ensures the estimated distinct count is within a few percent
+        and repeated values do not change the estimate
+        '''
+        values = pd.Series(np.arange(distinct)).astype(str)
+        hashes = pd.util.hash_pandas_object(values, index=False).values
+
+        hll = _HyperLogLog(12)
+        hll.update(hashes)
+        hll.update(hashes[:distinct // 2])
+
+        self.assertAlmostEqual(hll.count(), distinct, delta=distinct * 0.05)
+
+    def test_leading_zeros(self):
+        '''
+        Ensures leading zeros are exact across both 32 bit halves
+        '''
+        values = np.array([1, 1 << 32, 1 << 63, 0, (1 << 52) + 1], dtype=np.uint64)
+        self.assertEqual(_leading_zeros(values).tolist(), [63, 31, 0, 64, 11])
+
+    def test_profile_predicates_null_frames(self):
+        '''
+        Ensures when frames is null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            profile_predicates(None)
+
+    def test_profile_predicates(self):
+        '''
+        Ensures counts, lengths and tokens are accumulated per predicate
+        across frames and dgraph.type is ignored
+        '''
+        frames = [
+            pd.DataFrame(data={
+                'subject': ['a', 'a', 'b', 'b'],
+                'predicate': ['name', 'dgraph.type', 'name', 'age'],
+                'object': ['Jack Smith', 'person', 'Jane', 10],
+                'type': ['<xs:string>', '<xs:string>', '<xs:string>', '<xs:int>']
+            }),
+            pd.DataFrame(data={
+                'subject': ['c'],
+                'predicate': ['name'],
+                'object': ['Jack Smith'],
+                'type': ['<xs:string>']
+            })
+        ]
+
+        profile = profile_predicates(frames).set_index('predicate')
+
+        self.assertEqual(sorted(profile.index.tolist()), ['age', 'name'])
+        self.assertEqual(profile.loc['name', 'count'], 3)
+        self.assertEqual(profile.loc['name', 'distinct'], 2)
+        self.assertEqual(profile.loc['name', 'distinct_tokens'], 3)
+        self.assertAlmostEqual(profile.loc['name', 'average_length'], 24 / 3)
+        self.assertAlmostEqual(profile.loc['name', 'average_tokens'], 5 / 3)
+        self.assertEqual(profile.loc['age', 'type'], '<xs:int>')
+
+    @parameterized.expand([
+        ('int', {'type': '<xs:int>', 'average_tokens': 1, 'average_length': 2}, '@index(int)'),
+        ('date', {'type': '<xs:dateTime>', 'average_tokens': 1, 'average_length': 19}, '@index(year)'),
+        ('free_text', {'type': '<xs:string>', 'average_tokens': 12, 'average_length': 80}, '@index(term)'),
+        ('long_unique', {'type': '<xs:string>', 'average_tokens': 1, 'average_length': 64}, '@index(hash)'),
+        ('short', {'type': '<xs:string>', 'average_tokens': 1, 'average_length': 8}, '@index(exact)'),
+    ])
+    def test_suggest_index(self, name, profile, expected):
+        '''
+        Ensures the expected tokenizer is suggested for the profile
+        '''
+        profile = {'count': 100, 'distinct': 90, 'distinct_tokens': 200, 'average_token_length': 5, **profile}
+        suggested, size = _suggest_index(profile)
+
+        self.assertEqual(suggested, expected)
+        self.assertGreater(size, 0)
+
+    @parameterized.expand([
+        (None, {'files': {}}, 'title'),
+        ('titles.csv', None, 'title'),
+        ('titles.csv', {'files': {}}, None),
+    ])
+    def test_advise_options_null_parameters(self, file_path, config, config_key):
+        '''
+        Ensures when parameters are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            advise_options(file_path, config, config_key)
+
+    def test_advise_options(self):
+        '''
+        Ensures options are suggested for each intrinsic predicate
+        and already configured options are kept
+        '''
+        config = {
+            'files': {
+                'title': {
+                    'subject_fields': ['id'],
+                    'type_overrides': {'year': 'int32'},
+                    'options': {'title': ['@index(trigram)']}
+                }
+            }
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'titles.csv')
+            pd.DataFrame(data={
+                'id': [1, 2, 3],
+                'title': ['Movie A', 'Movie B', 'Movie C'],
+                'description': ['a very long description of the film'] * 3,
+                'year': [2019, 2020, 2021]
+            }).to_csv(path, index=False)
+
+            options, advice = advise_options(path, config, 'title')
+
+        self.assertEqual(options, {
+            'title': ['@index(trigram)'],
+            'description': ['@index(term)'],
+            'year': ['@index(int)']
+        })
+        self.assertEqual(sorted(advice['predicate'].tolist()), ['description', 'title', 'year'])
+        self.assertTrue({'exact_bytes', 'hash_bytes', 'term_bytes', 'trigram_bytes'}.issubset(advice.columns))
@@ -0,0 +1,148 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import patch, Mock
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.strategies.inference import _reservoir_sample, _infer_column, infer_schema
+
+
+class InferenceTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'titles.csv')
+        pd.DataFrame(data={
+            'id': [1, 2, 3, 4],
+            'release_year': [2019, 2020, None, 2018],
+            'rating': [4.5, 3.0, 2.5, 1.0],
+            'date_added': [' September 9, 2019', 'August 1, 2020', 'May 5, 2018', 'July 1, 2017'],
+            'kids': ['True', 'False', 'True', 'False'],
+            'title': ['a', 'b', 'c', 'd'],
+            'director_id': [1, 2, 3, 4]
+        }).to_csv(self.path, index=False)
+
+        self.config = {
+            'files': {
+                'title': {
+                    'subject_fields': ['id'],
+                    'edge_fields': ['director_id'],
+                    'type_overrides': {'title': 'object'}
+                }
+            }
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @parameterized.expand([
+        ('int', ['1', '2', '3'], {'type': 'Int64'}),
+        ('nullable_int', ['1', None, '3'], {'type': 'Int64'}),
+        ('negative_int', ['-1', '0', '10'], {'type': 'Int64'}),
+        ('float', ['1.5', '2', '3'], {'type': 'float64'}),
+        ('small_float', ['0.5', '-0.25'], {'type': 'float64'}),
+        ('whole_float', ['1.0', '2.0'], {'type': 'Int64'}),
+        ('leading_zeros', ['00123', '123'], {'type': 'object'}),
+        ('bool', ['True', 'false'], {'type': 'boolean'}),
+        ('nullable_bool', ['True', None], {'type': 'boolean'}),
+        ('iso_date', ['2021-01-01', '2021-02-03'], {'type': 'datetime64', 'date_format': {'format': '%Y-%m-%d'}}),
+        ('string', ['hello', '2021-01-01'], {'type': 'object'}),
+        ('empty', [None, None], None),
+    ])
+    def test_infer_column(self, name, values, expected):
+        '''
+        Ensures the expected type is suggested for the sampled values
+        '''
+        self.assertEqual(_infer_column(pd.Series(values, dtype=object)), expected)
+
+    @parameterized.expand([
+        ('all_rows', 10, 10**9, 4),
+        ('limited_sample', 2, 10**9, 2),
+        ('byte_budget', 1000, 1, 4),
+    ])
+    def test_reservoir_sample(self, name, sample_size, byte_budget, expected_rows):
+        '''
+        Ensures the sample never exceeds the sample size
+        and only contains rows from the file
+        '''
+        sample = _reservoir_sample(self.path, {}, sample_size, byte_budget, 60)
+        self.assertEqual(len(sample), expected_rows)
+        self.assertTrue(sample['title'].isin(['a', 'b', 'c', 'd']).all())
+
+    def test_reservoir_sample_bad_sample_size(self):
+        '''
+        Ensures when the sample size is not positive, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            _reservoir_sample(self.path, {}, 0, 1, 1)
+
+    @parameterized.expand([
+        (None, {'files': {}}),
+        ({'title': 'titles.csv'}, None),
+    ])
+    def test_infer_schema_null_parameters(self, files, config):
+        '''
+        Ensures when parameters are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            infer_schema(files, config)
+
+    def test_infer_schema(self):
+        '''
+        Ensures inferred types are written back into the configuration
+        without replacing declared types, keys or edges
+        '''
+        cache_dir = os.path.join(self.directory.name, 'cache')
+        export_config = os.path.join(self.directory.name, 'inferred.json')
+
+        config = infer_schema({'title': self.path}, self.config, inference_cache_dir=cache_dir, export_config=export_config)
+        file_config = config['files']['title']
+
+        self.assertEqual(file_config['type_overrides'], {
+            'release_year': 'Int64',
+            'rating': 'float64',
+            'date_added': 'datetime64',
+            'kids': 'boolean',
+            'title': 'object'
+        })
+        self.assertEqual(file_config['date_fields'], {'date_added': {'format': '%B %d, %Y', 'exact': False}})
+
+        with open(export_config, 'r') as f:
+            self.assertEqual(json.load(f), config)
+
+    @patch('dgraphpandas.strategies.inference._reservoir_sample')
+    def test_infer_schema_cached_by_fingerprint(self, reservoir_sample_mock: Mock):
+        '''
+        Ensures when a file has already been inferred then
+        the cached result is used rather than sampling again
+        '''
+        reservoir_sample_mock.return_value = pd.DataFrame(data={'age': ['1', '2']})
+        cache_dir = os.path.join(self.directory.name, 'cache')
+
+        infer_schema({'title': self.path}, json.loads(json.dumps(self.config)), inference_cache_dir=cache_dir)
+        config = infer_schema({'title': self.path}, json.loads(json.dumps(self.config)), inference_cache_dir=cache_dir)
+
+        self.assertEqual(reservoir_sample_mock.call_count, 1)
+        self.assertEqual(config['files']['title']['type_overrides'], {'age': 'Int64', 'title': 'object'})
+
+    @parameterized.expand([
+        ('read_csv_options', {'read_csv_options': {'sep': ';'}}),
+        ('sample_size', {'inference_sample_size': 10}),
+        ('byte_budget', {'inference_byte_budget': 1024}),
+    ])
+    @patch('dgraphpandas.strategies.inference._reservoir_sample')
+    def test_infer_schema_cache_key_options(self, name, options, reservoir_sample_mock: Mock):
+        '''
+        Ensures when the file is read with other options or
+        sampled with other settings then it is sampled again
+        '''
+        reservoir_sample_mock.return_value = pd.DataFrame(data={'age': ['1', '2']})
+        cache_dir = os.path.join(self.directory.name, 'cache')
+
+        infer_schema({'title': self.path}, json.loads(json.dumps(self.config)), inference_cache_dir=cache_dir)
+        infer_schema({'title': self.path}, json.loads(json.dumps(self.config)), inference_cache_dir=cache_dir, **(options))
+
+        self.assertEqual(reservoir_sample_mock.call_count, 2)
@@ -483,7 +483,7 @@ def test_create_schema_ensure_xid():
         data=[
             ('id', 'string', 'animal', None),
             ('habitat', 'uid', 'animal', None),
-            ('xid', 'string', None, '@index(exact)'),
+            ('xid', 'string', None, '@index(exact) @upsert'),
         ])
 
     result = create_schema(config, ensure_xid_predicate=True)
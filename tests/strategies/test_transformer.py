@@ -0,0 +1,166 @@
+import copy
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from parameterized import parameterized
+
+from dgraphpandas.rdf import _resolve_transform
+from dgraphpandas.strategies.transformer import Transformer
+
+
+class TransformerTests(unittest.TestCase):
+
+    @parameterized.expand([
+        (None, 'student'),
+        ({'files': {'student': {'subject_fields': ['id']}}}, None),
+    ])
+    def test_transformer_null_parameters(self, config, config_file_key):
+        '''
+        Ensures when parameters are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            Transformer(config, config_file_key)
+
+    def test_transformer_config_file_key_not_in_config(self):
+        '''
+        Ensures when the key is not in the configuration, an exception is raised
+        '''
+        with self.assertRaises(KeyError):
+            Transformer({'files': {'student': {'subject_fields': ['id']}}}, 'school')
+
+    @parameterized.expand([
+        ('missing', {'files': {'student': {}}}),
+        ('callable', {'files': {'student': {'subject_fields': lambda frame: ['id']}}}),
+    ])
+    def test_transformer_horizontal_bad_subject_fields(self, name, config):
+        '''
+        Ensures when the subject fields for a horizontal transform
+        are not a list, an exception is raised when compiled
+        '''
+        with self.assertRaises(ValueError):
+            Transformer(config, 'student')
+
+    def test_transform_null_frame(self):
+        '''
+        Ensures when the frame is null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            Transformer({'files': {'student': {'subject_fields': ['id']}}}, 'student').transform(None)
+
+    @parameterized.expand([
+        (
+            'horizontal',
+            {
+                'files': {
+                    'student': {
+                        'subject_fields': ['id'],
+                        'edge_fields': ['school_id'],
+                        'type_overrides': {'age': 'int32'},
+                        'date_fields': {'dob': {'format': '%Y-%m-%d'}},
+                        'pre_rename': {'name': 'full_name'},
+                        'ignore_fields': ['notes'],
+                        'csv_edges': ['classes']
+                    }
+                }
+            },
+            pd.DataFrame(data={
+                'id': [1, 2, 3],
+                'name': ['Jack "J" Smith', 'Jane', None],
+                'age': [10, 11, 12],
+                'dob': ['2010-01-01', '2011-02-02', '2012-03-03'],
+                'notes': ['a', 'b', 'c'],
+                'school_id': [1, 2, 1],
+                'classes': ['math, art', 'art', 'math']
+            })
+        ),
+        (
+            'vertical_edge_id_convention',
+            {
+                'transform': 'vertical',
+                'files': {
+                    'student': {
+                        'subject_fields': ['id'],
+                        'edge_id_convention': True,
+                        'type_overrides': {'age': 'int32'}
+                    }
+                }
+            },
+            pd.DataFrame(data={
+                'id': [1, 1, 2, 2],
+                'predicate': ['age', 'school_id', 'age', 'school_id'],
+                'object': [10, 1, 11, 2]
+            })
+        ),
+        (
+            'vertical_callables',
+            {
+                'transform': 'vertical',
+                'key_separator': ':',
+                'files': {
+                    'student': {
+                        'subject_fields': lambda frame: ['key'],
+                        'dgraph_type': lambda frame: 'learner',
+                        'predicate_field': 'attribute',
+                        'object_field': 'value',
+                    }
+                }
+            },
+            pd.DataFrame(data={
+                'key': [1, 2],
+                'attribute': ['name', 'name'],
+                'value': ['Jack', 'Jane']
+            })
+        ),
+    ])
+    def test_transform_matches_transform_function(self, name, config, frame):
+        '''
+        Ensures the compiled transform produces exactly what
+        the horizontal and vertical transforms produce
+        '''
+        transform_func = _resolve_transform(config)
+        expected_intrinsic, expected_edges = transform_func(frame.copy(), copy.deepcopy(config), 'student')
+
+        intrinsic, edges = Transformer(copy.deepcopy(config), 'student').transform(frame.copy())
+
+        assert_frame_equal(expected_intrinsic, intrinsic)
+        assert_frame_equal(expected_edges, edges)
+
+    def test_transform_resolves_callables_once(self):
+        '''
+        Ensures callables are resolved from the first frame
+        and reused for every following frame
+        '''
+        edge_fields = Mock(return_value=['school_id'])
+        config = {'transform': 'vertical', 'files': {'student': {'subject_fields': ['id'], 'edge_fields': edge_fields}}}
+        transformer = Transformer(config, 'student')
+
+        for _ in range(3):
+            _, edges = transformer.transform(pd.DataFrame(data={'id': [1], 'predicate': ['school_id'], 'object': [1]}))
+            self.assertEqual(edges['object'].tolist(), ['school_1'])
+
+        self.assertEqual(edge_fields.call_count, 1)
+
+    def test_transform_vertical_edge_id_convention_later_frame(self):
+        '''
+        Ensures an _id predicate which first appears in a later frame
+        of a vertical file is still treated as an edge
+        '''
+        config = {'transform': 'vertical', 'files': {'student': {'subject_fields': ['id'], 'edge_id_convention': True}}}
+        transformer = Transformer(config, 'student')
+
+        transformer.transform(pd.DataFrame(data={'id': [1], 'predicate': ['school_id'], 'object': [1]}))
+        intrinsic, edges = transformer.transform(pd.DataFrame(data={'id': [2, 2], 'predicate': ['school_id', 'club_id'], 'object': [1, 7]}))
+
+        self.assertEqual(sorted(edges['predicate'].tolist()), ['club', 'school'])
+        self.assertEqual(intrinsic['predicate'].tolist(), ['dgraph.type'])
+
+    def test_transform_does_not_change_config(self):
+        '''
+        Ensures date fields are not written back into the configured type_overrides
+        '''
+        config = {'files': {'student': {'subject_fields': ['id'], 'date_fields': {'dob': {}}, 'type_overrides': {}}}}
+        Transformer(config, 'student').transform(pd.DataFrame(data={'id': [1], 'dob': ['2010-01-01']}))
+
+        self.assertEqual(config['files']['student']['type_overrides'], {})
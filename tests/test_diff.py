@@ -0,0 +1,152 @@
+import os
+import gzip
+import tempfile
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.diff import _external_sort, _merge_join, diff_rdf
+
+
+class DiffTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @parameterized.expand([
+        ('single_run', 10),
+        ('multiple_runs', 2),
+        ('run_per_line', 1),
+    ])
+    def test_external_sort(self, name, run_size):
+        '''
+        Ensures lines are sorted regardless of how many runs are spilled to disk
+        '''
+        lines = ['<c> <p> "1"^^<xs:int> .', '<a> <p> <x> .', '<b> <p> <y> .', '<a> <o> <y> .', '<d> <p> <z> .']
+        result = list(_external_sort(iter(lines), self.directory.name, run_size))
+        self.assertEqual(result, sorted(lines))
+
+    def test_external_sort_bad_run_size(self):
+        '''
+        Ensures when the run size is not positive, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            list(_external_sort(iter([]), self.directory.name, 0))
+
+    @parameterized.expand([
+        ###
+        (
+            'subject_removed',
+            ['<customer_1> <age> "23"^^<xs:int> .', '<customer_2> <age> "40"^^<xs:int> .'],
+            ['<customer_2> <age> "40"^^<xs:int> .'],
+            [('delete', '<customer_1> * * .')]
+        ),
+        ###
+        (
+            'subject_added',
+            ['<customer_2> <age> "40"^^<xs:int> .'],
+            ['<customer_1> <age> "23"^^<xs:int> .', '<customer_2> <age> "40"^^<xs:int> .'],
+            [('add', '<customer_1> <age> "23"^^<xs:int> .')]
+        ),
+        ###
+        (
+            'intrinsic_changed',
+            ['<customer_1> <age> "23"^^<xs:int> .'],
+            ['<customer_1> <age> "24"^^<xs:int> .'],
+            [('add', '<customer_1> <age> "24"^^<xs:int> .')]
+        ),
+        ###
+        (
+            'intrinsic_removed',
+            ['<customer_1> <age> "23"^^<xs:int> .', '<customer_1> <hair> "black"^^<xs:string> .'],
+            ['<customer_1> <age> "23"^^<xs:int> .'],
+            [('delete', '<customer_1> <hair> * .')]
+        ),
+        ###
+        (
+            'edge_removed',
+            ['<customer_1> <location> <location_1> .', '<customer_1> <location> <location_2> .'],
+            ['<customer_1> <location> <location_1> .'],
+            [('delete', '<customer_1> <location> <location_2> .')]
+        ),
+        ###
+        (
+            'unchanged',
+            ['<customer_1> <location> <location_1> .'],
+            ['<customer_1> <location> <location_1> .'],
+            []
+        ),
+    ])
+    def test_merge_join(self, name, previous, current, expected):
+        '''
+        Ensures the merge join produces the expected adds and deletes
+        '''
+        result = list(_merge_join(iter(sorted(previous)), iter(sorted(current))))
+        self.assertEqual(result, expected)
+
+    @parameterized.expand([
+        (None, 'current.csv', {'files': {}}, 'key'),
+        ('previous.csv', None, {'files': {}}, 'key'),
+        ('previous.csv', 'current.csv', None, 'key'),
+        ('previous.csv', 'current.csv', {'files': {}}, None),
+    ])
+    def test_diff_rdf_null_parameters(self, previous_file, current_file, config, config_key):
+        '''
+        Ensures when parameters are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            diff_rdf(previous_file, current_file, config, config_key)
+
+    @parameterized.expand([
+        ('no_state', False),
+        ('incremental_state', True),
+    ])
+    def test_diff_rdf(self, name, incremental_state):
+        '''
+        Ensures two snapshots are transformed and only the delta is written,
+        even when the configuration has an incremental_state
+        '''
+        previous_file = os.path.join(self.directory.name, 'previous.csv')
+        current_file = os.path.join(self.directory.name, 'customers.csv')
+        pd.DataFrame(data={'id': [1, 2, 3], 'age': [23, 40, 18], 'location_id': [1, 1, 2]}).to_csv(previous_file, index=False)
+        pd.DataFrame(data={'id': [1, 2, 4], 'age': [23, 41, 50], 'location_id': [1, 2, 2]}).to_csv(current_file, index=False)
+
+        config = {
+            'files': {
+                'customer': {
+                    'subject_fields': ['id'],
+                    'edge_fields': ['location_id'],
+                    'type_overrides': {'age': 'int32'}
+                }
+            }
+        }
+
+        state_path = os.path.join(self.directory.name, 'state.db')
+        if incremental_state:
+            config['incremental_state'] = state_path
+
+        output_dir = os.path.join(self.directory.name, 'output')
+        adds, deletes = diff_rdf(previous_file, current_file, config, 'customer', output_dir, chunk_size=2, diff_run_size=3)
+
+        with gzip.open(os.path.join(output_dir, 'customers_diff_adds.gz'), 'rt') as f:
+            add_lines = f.read().split('\n')
+        with gzip.open(os.path.join(output_dir, 'customers_diff_deletes.gz'), 'rt') as f:
+            delete_lines = f.read().split('\n')
+
+        self.assertEqual((adds, deletes), (len(add_lines), len(delete_lines)))
+        self.assertCountEqual(add_lines, [
+            '<customer_2> <age> "41"^^<xs:int> .',
+            '<customer_2> <location> <location_2> .',
+            '<customer_4> <age> "50"^^<xs:int> .',
+            '<customer_4> <dgraph.type> "customer"^^<xs:string> .',
+            '<customer_4> <location> <location_2> .',
+        ])
+        self.assertCountEqual(delete_lines, [
+            '<customer_2> <location> <location_1> .',
+            '<customer_3> * * .',
+        ])
+        self.assertFalse(os.path.exists(state_path))
@@ -0,0 +1,107 @@
+import threading
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+
+from dgraphpandas.hooks import StageHooks, stage_hooks, register_stage_hooks, _registered, _run_stage
+from dgraphpandas.strategies.vertical import vertical_transform
+
+
+class _RecordingHooks(StageHooks):
+
+    def __init__(self):
+        self.calls = []
+
+    def on_stage_start(self, stage, rows):
+        self.calls.append(('start', stage, rows))
+
+    def on_stage_end(self, stage, rows):
+        self.calls.append(('end', stage, rows))
+
+
+class HooksTests(unittest.TestCase):
+
+    def test_register_none(self):
+        '''
+        Ensures when hooks are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            register_stage_hooks(None)
+
+    def test_run_stage_without_hooks(self):
+        '''
+        Ensures when no hooks are registered then
+        the function is just called
+        '''
+        func = Mock(return_value='result')
+
+        self.assertEqual(_run_stage('stage', func, 1, key=2), 'result')
+        func.assert_called_once_with(1, key=2)
+
+    def test_run_stage_rows(self):
+        '''
+        Ensures hooks receive the rows going in and coming out of the stage
+        and are unregistered when the context exits
+        '''
+        frame = pd.DataFrame({'id': [1, 2, 3]})
+        hooks = _RecordingHooks()
+
+        with stage_hooks(hooks):
+            _run_stage('head', pd.DataFrame.head, frame, 1)
+            _run_stage('concat', lambda left, right: None, frame, frame)
+            _run_stage('write', lambda path, lines: None, 'path', ['a', 'b'])
+
+        self.assertEqual(hooks.calls, [
+            ('start', 'head', 3), ('end', 'head', 1),
+            ('start', 'concat', 6), ('end', 'concat', 6),
+            ('start', 'write', 2), ('end', 'write', 2)])
+        self.assertEqual(_registered, [])
+
+    def test_run_stage_raises(self):
+        '''
+        Ensures when a stage raises then the end of
+        the stage is still reported
+        '''
+        hooks = _RecordingHooks()
+
+        with stage_hooks(hooks):
+            with self.assertRaises(KeyError):
+                _run_stage('fail', lambda lines: {}['missing'], ['a', 'b'])
+
+        self.assertEqual(hooks.calls, [('start', 'fail', 2), ('end', 'fail', 2)])
+
+    def test_run_stage_thread_local(self):
+        '''
+        Ensures thread local hooks only receive the stages
+        run on the thread which registered them
+        '''
+        local_hooks = _RecordingHooks()
+        other_thread = threading.Thread(target=_run_stage, args=('other', lambda lines: lines, ['a']))
+
+        with stage_hooks(local_hooks, thread_local=True):
+            other_thread.start()
+            other_thread.join()
+            _run_stage('local', lambda lines: lines, ['a'])
+
+        self.assertEqual(local_hooks.calls, [('start', 'local', 1), ('end', 'local', 1)])
+        self.assertEqual(_registered, [])
+
+    def test_vertical_transform_stages(self):
+        '''
+        Ensures every helper of the vertical transform is reported as a stage
+        '''
+        frame = pd.DataFrame({
+            'id': [1, 2],
+            'predicate': ['name', 'school_id'],
+            'object': ['a', '1']})
+        config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']}}}
+        hooks = _RecordingHooks()
+
+        with stage_hooks(hooks):
+            vertical_transform(frame, config, 'student')
+
+        stages = [stage for event, stage, _ in hooks.calls if event == 'start']
+        self.assertEqual(stages[:5], ['rename_fields', 'ignore_fields', 'expand_csv_edges', 'join_key_fields', 'add_dgraph_type_records'])
+        self.assertIn(('end', 'add_dgraph_type_records', 4), hooks.calls)
+        self.assertEqual(stages[-1], 'override_edge_name')
@@ -0,0 +1,56 @@
+import os
+import sys
+import subprocess
+from typing import Dict, List
+
+import pytest
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_times(arguments: List[str]) -> Dict[str, int]:
+    '''
+    Runs python with -X importtime and returns the
+    cumulative import time (us) of every module imported.
+    '''
+    environment = {**os.environ, 'PYTHONPATH': _root}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *arguments],
+        cwd=_root, env=environment, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        times[module.strip()] = int(cumulative)
+
+    return times
+
+
+@pytest.mark.parametrize('arguments', [
+    ['-c', 'import dgraphpandas'],
+    ['-m', 'dgraphpandas', '--help'],
+    ['-m', 'dgraphpandas', '--version'],
+    ['-m', 'dgraphpandas', '-x', 'upserts', '-c', 'dgraphpandas.json'],
+])
+def test_startup_does_not_import_pandas(arguments):
+    '''
+    Ensures importing the package, the command line help/version and
+    bad arguments do not pay for importing pandas or numpy
+    '''
+    times = _import_times(arguments)
+
+    assert 'dgraphpandas' in times
+    heavy = [module for module in times if module.split('.')[0] in ('pandas', 'numpy')]
+    assert not heavy, f'{arguments} imported {heavy[:5]}'
+
+
+def test_public_api_imported_on_access():
+    '''
+    Ensures the public api is still available from the package
+    '''
+    times = _import_times(['-c', 'import dgraphpandas; dgraphpandas.to_rdf; dgraphpandas.Transformer'])
+
+    assert 'pandas' in times
+    assert 'dgraphpandas.strategies.transformer' in times
@@ -0,0 +1,237 @@
+import os
+import gzip
+import tempfile
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.incremental import _open_state, _hash_triples, _generate_deletes, _apply_incremental_state, _finish_incremental_state
+from dgraphpandas.hooks import StageHooks, stage_hooks
+from dgraphpandas.manifest import read_manifest
+from dgraphpandas.rdf import to_rdf
+
+
+class IncrementalTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.directory.name, 'state.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_open_state_null_path(self):
+        '''
+        Ensures when the path is null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            _open_state(None)
+
+    @parameterized.expand([
+        (None, 'customer', pd.DataFrame(), pd.DataFrame()),
+        ('connection', None, pd.DataFrame(), pd.DataFrame()),
+        ('connection', 'customer', None, pd.DataFrame()),
+        ('connection', 'customer', pd.DataFrame(), None),
+    ])
+    def test_apply_incremental_state_null_parameters(self, connection, source, intrinsic, edges):
+        '''
+        Ensures when parameters are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            _apply_incremental_state(connection, source, intrinsic, edges)
+
+    @parameterized.expand([
+        (None, 'customer'),
+        ('connection', None),
+    ])
+    def test_finish_incremental_state_null_parameters(self, connection, source):
+        '''
+        Ensures when parameters are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            _finish_incremental_state(connection, source)
+
+    def test_hash_triples(self):
+        '''
+        Ensures every row is hashed on its object and type within its (subject, predicate)
+        '''
+        frame = pd.DataFrame(data={
+            'subject': ['movie_1', 'movie_1', 'movie_2', 'movie_1'],
+            'predicate': ['cast', 'cast', 'cast', 'cast'],
+            'object': ['actor_1', 'actor_2', 'actor_1', 'actor_1'],
+            'type': [None]*4
+        })
+
+        keys = _hash_triples(frame)
+
+        self.assertEqual(len(keys), 4)
+        self.assertEqual(keys.get_level_values('subject').tolist(), ['movie_1', 'movie_1', 'movie_2', 'movie_1'])
+        self.assertEqual(keys[0], keys[3])
+        self.assertNotEqual(keys[0][2], keys[1][2])
+        self.assertEqual(keys[0][2], keys[2][2])
+
+    @parameterized.expand([
+        (pd.DataFrame(data={'subject': ['customer_1'], 'predicate': ['age']}), ['<customer_1> <age> * .']),
+        (pd.DataFrame(data={'subject': ['customer_1'], 'predicate': ['location'], 'object': ['loc_1']}), ['<customer_1> <location> <loc_1> .']),
+    ])
+    def test_generate_deletes(self, frame, expected):
+        '''
+        Ensures deletes are generated as wildcard deletions on the predicate
+        or of the edge to the object when there is one
+        '''
+        self.assertEqual(_generate_deletes(frame), expected)
+
+    def test_apply_incremental_state_only_changes(self):
+        '''
+        Ensures a second run only emits new or changed predicates
+        and produces deletes for predicates and edges which disappeared
+        '''
+        def frames(age, hair, locations):
+            intrinsic = pd.DataFrame(data={
+                'subject': ['customer_1', 'customer_1', 'customer_2'],
+                'predicate': ['age', 'hair', 'age'],
+                'object': pd.Series([age, hair, 40], dtype=object),
+                'type': ['<xs:int>', '<xs:string>', '<xs:int>']
+            }).dropna(subset=['object'])
+            edges = pd.DataFrame(data={
+                'subject': ['customer_1'] * len(locations),
+                'predicate': ['location'] * len(locations),
+                'object': locations,
+                'type': [None] * len(locations)
+            })
+            return intrinsic, edges
+
+        connection = _open_state(self.state_path)
+        intrinsic, edges = _apply_incremental_state(connection, 'customer', *frames(23, 'black', ['loc_1', 'loc_2']))
+        self.assertEqual(_finish_incremental_state(connection, 'customer'), [])
+        connection.commit()
+
+        self.assertEqual(len(intrinsic), 3)
+        self.assertEqual(len(edges), 2)
+
+        intrinsic, edges = _apply_incremental_state(connection, 'customer', *frames(24, None, ['loc_1']))
+        deletes = _finish_incremental_state(connection, 'customer')
+        connection.commit()
+        connection.close()
+
+        self.assertEqual(intrinsic['predicate'].tolist(), ['age'])
+        self.assertEqual(intrinsic['subject'].tolist(), ['customer_1'])
+        self.assertEqual(len(edges), 0)
+        self.assertCountEqual(deletes, ['<customer_1> <hair> * .', '<customer_1> <location> <loc_2> .'])
+
+    def test_apply_incremental_state_scoped_by_source(self):
+        '''
+        Ensures sources which share subjects do not remove
+        each other's predicates
+        '''
+        def frame(predicate):
+            return pd.DataFrame(data={'subject': ['customer_1'], 'predicate': [predicate], 'object': ['1'], 'type': ['<xs:int>']})
+
+        connection = _open_state(self.state_path)
+        for _ in range(2):
+            _apply_incremental_state(connection, 'customer', frame('age'), frame('age').iloc[:0])
+            self.assertEqual(_finish_incremental_state(connection, 'customer'), [])
+            _apply_incremental_state(connection, 'orders', frame('orders'), frame('orders').iloc[:0])
+            self.assertEqual(_finish_incremental_state(connection, 'orders'), [])
+        connection.close()
+
+    def test_to_rdf_incremental_state(self):
+        '''
+        Ensures when incremental_state is passed to to_rdf then
+        a rerun of the same frame produces no upserts
+        '''
+        config = {'files': {'customer': {'subject_fields': ['id'], 'type_overrides': {'age': 'int32'}}}}
+
+        def frame():
+            return pd.DataFrame(data={'id': [1, 2], 'age': [23, 40]})
+
+        intrinsic, _ = to_rdf(frame(), config, 'customer', incremental_state=self.state_path)
+        self.assertEqual(len(intrinsic), 4)
+
+        intrinsic, edges = to_rdf(frame(), config, 'customer', incremental_state=self.state_path)
+        self.assertEqual(intrinsic, [])
+        self.assertEqual(edges, [])
+
+    def test_to_rdf_incremental_state_vertical_chunks(self):
+        '''
+        Ensures when the predicates of a subject are spread across chunks
+        then none of them are deleted and a rerun produces nothing, while a
+        predicate removed from the file is deleted once
+        '''
+        config = {
+            'transform': 'vertical',
+            'files': {'customer': {'subject_fields': ['id'], 'edge_fields': ['location'], 'type_overrides': {'age': 'int32'}}}
+        }
+        output_dir = os.path.join(self.directory.name, 'output')
+
+        def convert(rows):
+            path = os.path.join(self.directory.name, 'customer.csv')
+            pd.DataFrame(data=rows, columns=['id', 'predicate', 'object']).to_csv(path, index=False)
+            result = to_rdf(path, config, 'customer', output_dir, chunk_size=1, export_rdf=True, incremental_state=self.state_path)
+            removed_path = os.path.join(output_dir, 'customer_removed.gz')
+            removed = []
+            if os.path.exists(removed_path):
+                with gzip.open(removed_path, 'rt') as f:
+                    removed = f.read().split('\n')
+                os.remove(removed_path)
+            return result, removed
+
+        rows = [[1, 'age', 23], [1, 'hair', 'black'], [1, 'location', 'loc_1'], [2, 'age', 40]]
+        result, removed = convert(rows)
+        self.assertEqual(sum(len(intrinsic) + len(edges) for intrinsic, edges in result), 6)
+        self.assertEqual(removed, [])
+
+        result, removed = convert(rows)
+        self.assertEqual(sum(len(intrinsic) + len(edges) for intrinsic, edges in result), 0)
+        self.assertEqual(removed, [])
+
+        result, removed = convert([rows[0], rows[2], rows[3]])
+        self.assertEqual(sum(len(intrinsic) + len(edges) for intrinsic, edges in result), 0)
+        self.assertEqual(removed, ['<customer_1> <hair> * .'])
+
+    def test_to_rdf_incremental_state_stale_removed(self):
+        '''
+        Ensures the removed export of an earlier run is deleted by the next
+        run and is no longer in the manifest, so it is not loaded again
+        '''
+        config = {'files': {'customer': {'subject_fields': ['id'], 'type_overrides': {'age': 'int32'}}}}
+        output_dir = os.path.join(self.directory.name, 'output')
+        path = os.path.join(self.directory.name, 'customer.csv')
+        removed_path = os.path.join(output_dir, 'customer_removed.gz')
+
+        def convert(frame):
+            frame.to_csv(path, index=False)
+            to_rdf(path, config, 'customer', output_dir, export_rdf=True, manifest=True, incremental_state=self.state_path)
+            return [entry['path'] for entry in read_manifest(output_dir) if entry['kind'] == 'deletes']
+
+        self.assertEqual(convert(pd.DataFrame(data={'id': [1, 2], 'age': [23, 40], 'hair': ['black', 'red']})), [])
+
+        self.assertEqual(convert(pd.DataFrame(data={'id': [1, 2], 'age': [23, 40]})), ['customer_removed.gz'])
+        self.assertTrue(os.path.exists(removed_path))
+
+        self.assertEqual(convert(pd.DataFrame(data={'id': [1, 2], 'age': [23, 40]})), [])
+        self.assertFalse(os.path.exists(removed_path))
+
+    def test_to_rdf_incremental_state_failed(self):
+        '''
+        Ensures when converting a frame fails then its state is rolled back
+        and closed, so a rerun exports every value again
+        '''
+        config = {'files': {'customer': {'subject_fields': ['id'], 'type_overrides': {'age': 'int32'}}}}
+        output_dir = os.path.join(self.directory.name, 'output')
+
+        class _FailWrite(StageHooks):
+            def on_stage_start(self, stage, rows):
+                if stage == 'write_gz':
+                    raise IOError('disk full')
+
+        def frame():
+            return pd.DataFrame(data={'id': [1, 2], 'age': [23, 40]})
+
+        with stage_hooks(_FailWrite()):
+            with self.assertRaises(IOError):
+                to_rdf(frame(), config, 'customer', output_dir, export_rdf=True, incremental_state=self.state_path)
+
+        intrinsic, _ = to_rdf(frame(), config, 'customer', output_dir, export_rdf=True, incremental_state=self.state_path)
+        self.assertEqual(len(intrinsic), 4)
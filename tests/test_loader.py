@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.dgraph_stub import DgraphStub
+from dgraphpandas.loader import LoadError, load
+from dgraphpandas.manifest import append_manifest, read_manifest
+from dgraphpandas.rdf import to_rdf
+
+
+class LoaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.directory.name, 'output')
+        self.log = os.path.join(self.directory.name, 'loader.log')
+
+        '''
+        The stub loader runs as a module of this package so it has to be importable by the loader processes
+        '''
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.environ = patch.dict(os.environ, {'PYTHONPATH': os.pathsep.join(filter(None, [repo_root, os.environ.get('PYTHONPATH')]))})
+        self.environ.start()
+        self.config = {'files': {
+            'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']},
+            'school': {'subject_fields': ['id'], 'edge_fields': ['city_id']}}}
+
+        for name, key in [('students.csv', 'student'), ('schools.csv', 'school')]:
+            path = os.path.join(self.directory.name, name)
+            pd.DataFrame(data={'id': range(10), 'name': ['a'] * 10, f'{"school" if key == "student" else "city"}_id': [1, 2] * 5}).to_csv(path, index=False)
+            to_rdf(path, self.config, key, self.output_dir, export_rdf=True, manifest=True, chunk_size=5)
+
+    def tearDown(self):
+        self.environ.stop()
+        self.directory.cleanup()
+
+    def _command(self, fail_first: int = 0, seconds: float = 0) -> str:
+        return f'{sys.executable} -m dgraphpandas.loader_stub --format {{format}} --files {{file}} --log {self.log} --fail_first {fail_first} --seconds {seconds}'
+
+    def _attempts(self):
+        with open(self.log, 'r') as f:
+            return [json.loads(line) for line in f]
+
+    def test_manifest(self):
+        '''
+        Ensures every export written is recorded in the manifest
+        with the statements it holds
+        '''
+        entries = read_manifest(self.output_dir)
+
+        self.assertEqual(len(entries), 8)
+        self.assertEqual(sorted(set(entry['kind'] for entry in entries)), ['edges', 'intrinsic'])
+        self.assertEqual(sum(entry['statements'] for entry in entries), 2 * 10 * 3)
+        self.assertIn({
+            'path': 'students_intrinsic_2.gz', 'kind': 'intrinsic', 'format': 'rdf',
+            'statements': 10, 'source': 'students', 'chunk': 1, 'shard': None, 'run': entries[0]['run']
+        }, entries)
+
+    def test_manifest_rewritten(self):
+        '''
+        Ensures when an export is written again only its last entry is read
+        '''
+        append_manifest(self.output_dir, [{'path': 'students_edges.gz', 'kind': 'edges', 'format': 'rdf', 'statements': 1}])
+
+        entries = read_manifest(self.output_dir)
+
+        self.assertEqual(len(entries), 8)
+        self.assertEqual(entries[-1]['statements'], 1)
+
+    def test_manifest_latest_run(self):
+        '''
+        Ensures when a file is converted again only the exports of its
+        latest run are read, not those the earlier run wrote beyond them
+        '''
+        path = os.path.join(self.directory.name, 'students.csv')
+        pd.DataFrame(data={'id': range(5), 'name': ['a'] * 5, 'school_id': [1, 2, 1, 2, 1]}).to_csv(path, index=False)
+        to_rdf(path, self.config, 'student', self.output_dir, export_rdf=True, manifest=True, chunk_size=5)
+
+        entries = read_manifest(self.output_dir)
+
+        self.assertEqual(sorted(entry['path'] for entry in entries if entry['source'] == 'students'), ['students_edges.gz', 'students_intrinsic.gz'])
+        self.assertEqual(len([entry for entry in entries if entry['source'] == 'schools']), 4)
+        self.assertEqual(len(set(entry['run'] for entry in entries)), 2)
+
+    def test_manifest_missing(self):
+        '''
+        Ensures when there is no manifest, an exception is raised
+        '''
+        with self.assertRaises(FileNotFoundError):
+            read_manifest(self.directory.name)
+
+    def test_load(self):
+        '''
+        Ensures the schema is applied first, every export is loaded
+        once and the intrinsic exports are all loaded before the edges
+        '''
+        schema_file = os.path.join(self.directory.name, 'schema.txt')
+        with open(schema_file, 'w') as f:
+            f.write('xid: string @index(exact) @upsert .')
+
+        with DgraphStub() as stub:
+            report = load(self.output_dir, self._command(seconds=0.05), workers=3, schema_files=[schema_file], dgraph_address=stub.address)
+
+            self.assertEqual(stub.schemas, ['xid: string @index(exact) @upsert .'])
+
+        attempts = self._attempts()
+        self.assertEqual(len(attempts), 8)
+        self.assertEqual(sorted(os.path.basename(attempt['file']) for attempt in attempts), sorted(report['path']))
+        self.assertEqual(sum(attempt['statements'] for attempt in attempts), 60)
+
+        intrinsic_ended = max(attempt['ended'] for attempt in attempts if '_intrinsic' in attempt['file'])
+        edges_started = min(attempt['started'] for attempt in attempts if '_edges' in attempt['file'])
+        self.assertLessEqual(intrinsic_ended, edges_started)
+
+        self.assertTrue(report['succeeded'].all())
+        self.assertEqual(report['phase'].tolist(), [1] * 4 + [2] * 4)
+        self.assertTrue((report['statements_per_second'] > 0).all())
+
+    def test_load_retries(self):
+        '''
+        Ensures an export which fails is retried
+        '''
+        report = load(self.output_dir, self._command(fail_first=1), retries=1, backoff=0)
+
+        self.assertTrue(report['succeeded'].all())
+        self.assertEqual(report['attempts'].tolist(), [2] * 8)
+        self.assertEqual(len(self._attempts()), 16)
+
+    def test_load_fails(self):
+        '''
+        Ensures when an export fails beyond the retries then the edges
+        are not loaded and an exception is raised with the report
+        '''
+        with self.assertRaises(LoadError) as context:
+            load(self.output_dir, self._command(fail_first=2), retries=1, backoff=0)
+
+        self.assertEqual(len(context.exception.report), 4)
+        self.assertFalse(context.exception.report['succeeded'].any())
+        self.assertFalse(any('_edges' in attempt['file'] for attempt in self._attempts()))
+
+    @parameterized.expand([
+        ('bulk', {'kind': 'bulk', 'format': 'bulk'}, {}),
+        ('dql', {'kind': 'upserts', 'format': 'dql'}, {}),
+        ('deletes_without_address', {'kind': 'deletes', 'format': 'rdf'}, {}),
+        ('schema_without_address', {'kind': 'intrinsic', 'format': 'rdf'}, {'schema_files': ['schema.txt']}),
+    ])
+    def test_load_invalid(self, name, entry, options):
+        '''
+        Ensures when an export cannot be loaded with dgraph live or
+        there is no dgraph_address to apply to, an exception is raised
+        '''
+        append_manifest(self.output_dir, [{'path': 'other.gz', 'statements': 1, **entry}])
+
+        with self.assertRaises(ValueError):
+            load(self.output_dir, self._command(), **(options))
+
+    def test_load_json(self):
+        '''
+        Ensures the arrays of a JSON export are given to the loader as a
+        single array, as dgraph live reads one JSON value from a file
+        '''
+        output_dir = os.path.join(self.directory.name, 'json')
+        path = os.path.join(self.directory.name, 'students.csv')
+        to_rdf(path, self.config, 'student', output_dir, export_rdf=True, manifest=True, output_format='json', json_batch_size=3)
+
+        report = load(output_dir, self._command())
+
+        self.assertTrue(report['succeeded'].all())
+        self.assertEqual([(attempt['format'], attempt['statements']) for attempt in self._attempts()], [('json', 10)])
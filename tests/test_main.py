@@ -1,7 +1,10 @@
+import os
+import json
 from unittest.mock import patch, Mock
 from typing import List
 
 import pytest
+import pandas as pd
 from parameterized import parameterized
 
 from dgraphpandas import __version__
@@ -38,7 +41,7 @@ def test_missing_required_arguments(argv_mock: Mock, capsys):
 
 
 @patch('dgraphpandas.__main__.logging')
-@patch('dgraphpandas.__main__.to_rdf')
+@patch('dgraphpandas.rdf.to_rdf')
 @patch('dgraphpandas.__main__.sys')
 def test_bad_operation(
         argv_mock: Mock,
@@ -62,7 +65,7 @@ def test_bad_operation(
 
 
 @patch('dgraphpandas.__main__.logging')
-@patch('dgraphpandas.__main__.to_rdf')
+@patch('dgraphpandas.rdf.to_rdf')
 @patch('dgraphpandas.__main__.sys')
 def test_upsert_missing_config_file_key(
         argv_mock: Mock,
@@ -84,7 +87,7 @@ def test_upsert_missing_config_file_key(
 
 
 @patch('dgraphpandas.__main__.logging')
-@patch('dgraphpandas.__main__.to_rdf')
+@patch('dgraphpandas.rdf.to_rdf')
 @patch('dgraphpandas.__main__.sys')
 def test_upsert_missing_file(
         argv_mock: Mock,
@@ -106,7 +109,7 @@ def test_upsert_missing_file(
 
 
 @patch('dgraphpandas.__main__.logging')
-@patch('dgraphpandas.__main__.to_rdf')
+@patch('dgraphpandas.rdf.to_rdf')
 @patch('dgraphpandas.__main__.sys')
 def test_upsert(
         argv_mock: Mock,
@@ -143,8 +146,99 @@ def test_upsert(
 
 
 @patch('dgraphpandas.__main__.logging')
-@patch('dgraphpandas.__main__.generate_schema')
-@patch('dgraphpandas.__main__.create_schema')
+@patch('dgraphpandas.rdf.to_rdf')
+@patch('dgraphpandas.__main__.sys')
+def test_upsert_metrics(
+        argv_mock: Mock,
+        to_rdf_mock: Mock,
+        logger_mock: Mock):
+    '''
+    Ensures when metrics files are passed then they are passed to to_rdf
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'upserts',
+        '-c', 'config.json',
+        '-ck', 'my_key',
+        '-f', 'my_file',
+        '--metrics_file', 'metrics.jsonl',
+        '--metrics_prometheus_file', 'metrics.prom'
+    ]
+
+    main()
+
+    _, kwargs = to_rdf_mock.call_args_list[0]
+    assert kwargs['metrics_file'] == 'metrics.jsonl'
+    assert kwargs['metrics_prometheus_file'] == 'metrics.prom'
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.rdf.to_rdf')
+@patch('dgraphpandas.__main__.sys')
+def test_upsert_dgraph_address(
+        argv_mock: Mock,
+        to_rdf_mock: Mock,
+        logger_mock: Mock):
+    '''
+    Ensures when a dgraph_address is passed then it is passed to to_rdf
+    and exports are not written
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'upserts',
+        '-c', 'config.json',
+        '-ck', 'my_key',
+        '-f', 'my_file',
+        '--dgraph_address', 'http://localhost:8080',
+        '--dgraph_concurrency', '8'
+    ]
+
+    main()
+
+    _, kwargs = to_rdf_mock.call_args_list[0]
+    assert kwargs['export_rdf'] is False
+    assert kwargs['dgraph_address'] == 'http://localhost:8080'
+    assert kwargs['dgraph_concurrency'] == 8
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.rdf.to_rdf')
+@patch('dgraphpandas.__main__.sys')
+def test_upsert_profile(
+        argv_mock: Mock,
+        to_rdf_mock: Mock,
+        logger_mock: Mock,
+        capsys,
+        tmpdir):
+    '''
+    Ensures when profile is passed then a table of the stages
+    is printed and the stage profiles are written to the profile_dir
+    '''
+    from dgraphpandas.hooks import _run_stage, _registered
+    to_rdf_mock.side_effect = lambda *args, **kwargs: _run_stage('melt', pd.DataFrame.melt, pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']}), id_vars=['id'])
+    profile_dir = os.path.join(tmpdir, 'profiles')
+    argv_mock.argv = [
+        'script',
+        '-x', 'upserts',
+        '-c', 'config.json',
+        '-ck', 'my_key',
+        '-f', 'my_file',
+        '--profile',
+        '--profile_dir', profile_dir
+    ]
+
+    main()
+
+    out = capsys.readouterr().out
+    assert 'rows_per_second' in out
+    assert 'melt' in out
+    assert os.listdir(profile_dir) == ['melt.prof']
+    assert _registered == []
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.writers.schema.generate_schema')
+@patch('dgraphpandas.strategies.schema.create_schema')
 @patch('dgraphpandas.__main__.sys')
 def test_schema(
         argv_mock: Mock,
@@ -205,8 +299,8 @@ def test_schema(
     (['--verbosity', 'NOTSET'], 'NOTSET'),
 ])
 @patch('dgraphpandas.__main__.logging')
-@patch('dgraphpandas.__main__.generate_schema')
-@patch('dgraphpandas.__main__.create_schema')
+@patch('dgraphpandas.writers.schema.generate_schema')
+@patch('dgraphpandas.strategies.schema.create_schema')
 @patch('dgraphpandas.__main__.sys')
 def test_logging_verbosity_set(
         logging_options: List[str],
@@ -251,8 +345,8 @@ def test_version(
 
 
 @patch('dgraphpandas.__main__.logging')
-@patch('dgraphpandas.__main__.generate_types')
-@patch('dgraphpandas.__main__.create_schema')
+@patch('dgraphpandas.writers.types.generate_types')
+@patch('dgraphpandas.strategies.schema.create_schema')
 @patch('dgraphpandas.__main__.sys')
 def test_types(
         argv_mock: Mock,
@@ -302,3 +396,302 @@ def test_types(
         'chunk_size': 10000000,
         'export_schema': True
     }
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.diff.diff_rdf')
+@patch('dgraphpandas.__main__.sys')
+def test_diff(
+        argv_mock: Mock,
+        diff_rdf_mock: Mock,
+        logger_mock: Mock,
+        capsys):
+    '''
+    Ensures when diff is called with both snapshots
+    then diff_rdf is called
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'diff',
+        '-c', 'config.json',
+        '-ck', 'my_key',
+        '-f', 'my_file',
+        '--previous_file', 'my_previous_file'
+    ]
+
+    main()
+
+    args, kwargs = diff_rdf_mock.call_args_list[0]
+    assert args == ('my_previous_file', 'my_file', 'config.json', 'my_key', '.')
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.diff.diff_rdf')
+@patch('dgraphpandas.__main__.sys')
+def test_diff_missing_previous_file(
+        argv_mock: Mock,
+        diff_rdf_mock: Mock,
+        logger_mock: Mock,
+        capsys):
+    '''
+    Ensures when previous_file is not provided in diff mode then an error is raised
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'diff',
+        '-c', 'config.json',
+        '-ck', 'my_key',
+        '-f', 'my_file'
+    ]
+
+    with pytest.raises(ValueError, match='file and previous_file must be provided in diff mode'):
+        main()
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.validation.validate_edges')
+@patch('dgraphpandas.__main__.sys')
+def test_validate(
+        argv_mock: Mock,
+        validate_edges_mock: Mock,
+        logger_mock: Mock,
+        capsys):
+    '''
+    Ensures when validate is called, a config is not required
+    and validate_edges is called against the output directory
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'validate',
+        '-o', 'output',
+        '--filter_dangling_edges'
+    ]
+
+    main()
+
+    args, kwargs = validate_edges_mock.call_args_list[0]
+    assert args == ('output',)
+    assert kwargs['filter_dangling_edges']
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.loader.load')
+@patch('dgraphpandas.__main__.sys')
+def test_load(
+        argv_mock: Mock,
+        load_mock: Mock,
+        logger_mock: Mock,
+        capsys):
+    '''
+    Ensures when load is called, the exports in the output directory
+    are loaded with the loader options and the report is printed
+    '''
+    load_mock.return_value = pd.DataFrame({'path': ['students_intrinsic.gz'], 'succeeded': [True]})
+    argv_mock.argv = [
+        'script',
+        '-x', 'load',
+        '-o', 'output',
+        '--loader_workers', '8',
+        '--schema_file', 'schema.txt',
+        '--schema_file', 'types.txt',
+        '--dgraph_address', 'http://localhost:8080'
+    ]
+
+    main()
+
+    args, kwargs = load_mock.call_args_list[0]
+    assert args == ('output',)
+    assert kwargs == {'workers': 8, 'schema_files': ['schema.txt', 'types.txt'], 'dgraph_address': 'http://localhost:8080'}
+    assert 'students_intrinsic.gz' in capsys.readouterr().out
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.strategies.inference.infer_schema')
+@patch('dgraphpandas.__main__.sys')
+def test_infer(
+        argv_mock: Mock,
+        infer_schema_mock: Mock,
+        logger_mock: Mock,
+        capsys):
+    '''
+    Ensures when infer is called, then the inferred configuration
+    is exported next to the outputs
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'infer',
+        '-c', 'config/config.json',
+        '-ck', 'my_key',
+        '-f', 'my_file',
+        '-o', 'output'
+    ]
+
+    main()
+
+    args, kwargs = infer_schema_mock.call_args_list[0]
+    assert args == ({'my_key': 'my_file'}, 'config/config.json')
+    assert kwargs['export_config'] == 'output/inferred_config.json'
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.strategies.index_advisor.advise_options')
+@patch('dgraphpandas.__main__._get_config')
+@patch('dgraphpandas.__main__.sys')
+def test_advise(
+        argv_mock: Mock,
+        get_config_mock: Mock,
+        advise_options_mock: Mock,
+        logger_mock: Mock,
+        tmpdir,
+        capsys):
+    '''
+    Ensures when advise is called, then the advice is printed
+    and the suggested options are exported next to the outputs
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'advise',
+        '-c', 'config/config.json',
+        '-ck', 'my_key',
+        '-f', 'my_file',
+        '-o', str(tmpdir)
+    ]
+    get_config_mock.return_value = {'files': {'my_key': {'subject_fields': ['id']}}}
+    advise_options_mock.return_value = ({'name': ['@index(exact)']}, pd.DataFrame(data={'predicate': ['name'], 'suggested': ['@index(exact)']}))
+
+    main()
+
+    args, _ = advise_options_mock.call_args_list[0]
+    assert args == ('my_file', get_config_mock.return_value, 'my_key')
+    assert '@index(exact)' in capsys.readouterr().out
+
+    with open(os.path.join(str(tmpdir), 'advised_config.json'), 'r') as f:
+        assert json.load(f) == {'files': {'my_key': {'subject_fields': ['id'], 'options': {'name': ['@index(exact)']}}}}
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.writers.schema.generate_schema_diff')
+@patch('dgraphpandas.writers.schema.generate_schema')
+@patch('dgraphpandas.strategies.schema.create_schema')
+@patch('dgraphpandas.__main__.sys')
+def test_schema_existing_schema(
+        argv_mock: Mock,
+        create_schema_mock: Mock,
+        generate_schema_mock: Mock,
+        generate_schema_diff_mock: Mock,
+        logger_mock: Mock):
+    '''
+    Ensures when an existing schema is passed in schema mode
+    then a schema diff is generated against it
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'schema',
+        '-c', 'config.json',
+        '--existing_schema', 'existing.txt'
+    ]
+
+    create_schema_mock.return_value = 'fake_schema'
+
+    main()
+
+    args, kwargs = generate_schema_diff_mock.call_args_list[0]
+    assert args == ('fake_schema', 'existing.txt')
+    assert kwargs['export_schema']
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.server.serve')
+@patch('dgraphpandas.__main__.sys')
+def test_serve(
+        argv_mock: Mock,
+        serve_mock: Mock,
+        logger_mock: Mock):
+    '''
+    Ensures when serve is called, then the server is started
+    on the given address without needing a configuration
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'serve',
+        '--address', 'jobs.sock',
+        '--serve_workers', '2'
+    ]
+
+    main()
+
+    args, _ = serve_mock.call_args_list[0]
+    assert args == ('jobs.sock', 2)
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.watch.watch')
+@patch('dgraphpandas.__main__.sys')
+def test_watch(
+        argv_mock: Mock,
+        watch_mock: Mock,
+        logger_mock: Mock):
+    '''
+    Ensures when watch is called, then the landing directory
+    is watched with the watch options
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'watch',
+        '-c', 'config.json',
+        '--watch_dir', 'landing',
+        '--watch_workers', '2',
+        '-o', 'output'
+    ]
+
+    main()
+
+    args, kwargs = watch_mock.call_args_list[0]
+    assert args == ('landing', 'config.json', 'output')
+    assert kwargs['watch_workers'] == 2
+
+
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.__main__.sys')
+def test_watch_no_directory(argv_mock: Mock, logger_mock: Mock):
+    '''
+    Ensures when watch is called without a directory, then an exception is raised
+    '''
+    argv_mock.argv = ['script', '-x', 'watch', '-c', 'config.json']
+
+    with pytest.raises(ValueError):
+        main()
+
+
+@pytest.mark.parametrize('file_arguments, expected_source', [
+    ([], None),
+    (['-f', '-'], '-'),
+    (['-f', 'cdc.fifo'], 'cdc.fifo'),
+])
+@patch('dgraphpandas.__main__.logging')
+@patch('dgraphpandas.stream.stream_rdf')
+@patch('dgraphpandas.__main__.sys')
+def test_stream(
+        argv_mock: Mock,
+        stream_rdf_mock: Mock,
+        logger_mock: Mock,
+        file_arguments: List[str],
+        expected_source: str):
+    '''
+    Ensures when stream is called, then stdin or the given
+    file is streamed with the stream options
+    '''
+    argv_mock.argv = [
+        'script',
+        '-x', 'stream',
+        '-c', 'config.json',
+        '-ck', 'my_key',
+        '--stream_batch_rows', '100',
+        '-o', 'output'
+    ] + file_arguments
+
+    main()
+
+    args, kwargs = stream_rdf_mock.call_args_list[0]
+    assert args == (expected_source, 'config.json', 'my_key', 'output')
+    assert kwargs['stream_batch_rows'] == 100
@@ -0,0 +1,92 @@
+import io
+import os
+import tempfile
+import unittest
+import tracemalloc
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.memory import AdaptiveChunker
+from dgraphpandas.rdf import to_rdf
+
+
+class AdaptiveChunkerTests(unittest.TestCase):
+
+    @parameterized.expand([
+        ('memory_limit', None, 10),
+        ('negative_memory_limit', -1, 10),
+        ('max_rows', 100, None),
+    ])
+    def test_null_parameters(self, name, memory_limit, max_rows):
+        '''
+        Ensures when parameters are null or negative, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            AdaptiveChunker(memory_limit, max_rows)
+
+    @parameterized.expand([
+        ('grows_at_most_by_growth', 1_000_000, 1000, 1000, None, 2000),
+        ('shrinks_to_budget', 1_000_000, 1000, 10_000_000, None, 100),
+        ('subtracts_resident', 1_000_000, 1000, 100_000, 700_000, 1000),
+        ('capped_at_max_rows', 10_000_000_000, 40_000, 1000, None, 50_000),
+        ('no_allocations', 1_000_000, 1000, 0, None, 2000),
+    ])
+    def test_next_rows(self, name, memory_limit, rows, peak, rss, expected):
+        '''
+        Ensures the next chunk is sized from the bytes per row of the last chunk
+        within the budget, growth and max_rows
+        '''
+        chunker = AdaptiveChunker(memory_limit, 50_000, initial_rows=rows, min_rows=100)
+        self.assertEqual(chunker.next_rows(rows, peak, rss), expected)
+
+    def test_chunks(self):
+        '''
+        Ensures chunks are read with the adapted rows
+        and tracing is stopped afterwards
+        '''
+        reader = pd.read_csv(io.StringIO('id\n' + '\n'.join(str(i) for i in range(500))), iterator=True)
+        chunker = AdaptiveChunker(10_000_000_000, 1000, initial_rows=100)
+
+        sizes = [len(frame) for frame in chunker.chunks(reader)]
+
+        self.assertEqual(sizes, [100, 200, 200])
+        self.assertGreater(chunker.peak, 0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_chunks_concurrent(self):
+        '''
+        Ensures when chunkers overlap then tracing continues until
+        the last of them has finished
+        '''
+        def reader():
+            return pd.read_csv(io.StringIO('id\n' + '\n'.join(str(i) for i in range(500))), iterator=True)
+
+        first = AdaptiveChunker(10_000_000_000, 1000, initial_rows=100).chunks(reader())
+        second = AdaptiveChunker(10_000_000_000, 1000, initial_rows=100).chunks(reader())
+        next(first)
+        next(second)
+
+        self.assertEqual(sum(len(frame) for frame in first), 400)
+        self.assertTrue(tracemalloc.is_tracing())
+
+        self.assertEqual(sum(len(frame) for frame in second), 400)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_to_rdf_memory_limit(self):
+        '''
+        Ensures when a memory_limit is passed then chunks are
+        no larger than chunk_size and every row is exported
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'students.csv')
+            pd.DataFrame(data={'id': range(500), 'name': ['a'] * 500}).to_csv(path, index=False)
+            config = {'files': {'student': {'subject_fields': ['id']}}}
+            sizes = []
+
+            to_rdf(
+                path, config, 'student', directory, export_rdf=True, chunk_size=300, memory_limit=10_000_000_000,
+                on_chunk=lambda index, upserts: sizes.append(len(upserts[0]) // 2))
+
+            self.assertEqual(sizes, [300, 200])
+            self.assertTrue(os.path.exists(os.path.join(directory, 'students_intrinsic_2.gz')))
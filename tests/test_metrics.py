@@ -0,0 +1,98 @@
+import os
+import json
+import tempfile
+import unittest
+
+import pandas as pd
+
+from dgraphpandas.rdf import to_rdf
+from dgraphpandas.metrics import RunMetrics
+
+
+class MetricsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.metrics_file = os.path.join(self.directory.name, 'metrics.jsonl')
+        self.prometheus_file = os.path.join(self.directory.name, 'metrics.prom')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_chunk_metrics(self):
+        '''
+        Ensures counters and stage timings are recorded for the chunk
+        and appended to the metrics file
+        '''
+        metrics = RunMetrics(self.metrics_file)
+        metrics.start_chunk('students', 0, 10, read_seconds=0.5)
+        with metrics.stage('transform'):
+            pass
+        with metrics.stage('transform'):
+            pass
+        metrics.count('intrinsic', 20)
+        chunk = metrics.end_chunk()
+
+        self.assertFalse(metrics.in_chunk)
+        self.assertEqual(chunk['rows'], 10)
+        self.assertEqual(chunk['intrinsic'], 20)
+        self.assertEqual(sorted(chunk['seconds'].keys()), ['read', 'transform'])
+        self.assertGreater(chunk['rows_per_second'], 0)
+
+        with open(self.metrics_file, 'r') as f:
+            self.assertEqual(json.loads(f.readline())['source'], 'students')
+
+    def test_stage_outside_chunk(self):
+        '''
+        Ensures stages and counters outside of a chunk are ignored
+        '''
+        metrics = RunMetrics()
+        with metrics.stage('transform'):
+            metrics.count('rows', 1)
+
+        self.assertIsNone(metrics.end_chunk())
+        self.assertEqual(metrics.totals, {})
+
+    def test_write_prometheus(self):
+        '''
+        Ensures totals across chunks are written in the prometheus text format
+        '''
+        metrics = RunMetrics(prometheus_file=self.prometheus_file)
+        for index in range(2):
+            metrics.start_chunk('students', index, 5, read_seconds=1.0)
+            metrics.count('edges', 3)
+            metrics.end_chunk()
+        metrics.write_prometheus()
+
+        with open(self.prometheus_file, 'r') as f:
+            lines = f.read().splitlines()
+
+        self.assertIn('dgraphpandas_rows_total{source="students"} 10', lines)
+        self.assertIn('dgraphpandas_triples_total{source="students",kind="edges"} 6', lines)
+        self.assertIn('dgraphpandas_stage_seconds_total{source="students",stage="read"} 2.000000', lines)
+        self.assertIn('dgraphpandas_rows_per_second{source="students"} 5.000', lines)
+        self.assertIn('# TYPE dgraphpandas_rows_per_second gauge', lines)
+
+    def test_to_rdf_metrics(self):
+        '''
+        Ensures when metrics are configured then every chunk
+        of a file is recorded with its stages and bytes written
+        '''
+        path = os.path.join(self.directory.name, 'students.csv')
+        pd.DataFrame(data={'id': [1, 2, 3], 'name': ['a', 'b', 'c'], 'school_id': [1, 1, 2]}).to_csv(path, index=False)
+        config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']}}}
+
+        to_rdf(
+            path, config, 'student', os.path.join(self.directory.name, 'output'), export_rdf=True, chunk_size=2,
+            metrics_file=self.metrics_file, metrics_prometheus_file=self.prometheus_file)
+
+        with open(self.metrics_file, 'r') as f:
+            chunks = [json.loads(line) for line in f]
+
+        self.assertEqual([chunk['chunk'] for chunk in chunks], [0, 1])
+        self.assertEqual([chunk['rows'] for chunk in chunks], [2, 1])
+        self.assertEqual([chunk['intrinsic'] for chunk in chunks], [4, 2])
+        self.assertEqual([chunk['edges'] for chunk in chunks], [2, 1])
+        self.assertEqual(sorted(chunks[0]['seconds'].keys()), ['read', 'transform', 'upserts', 'write'])
+        self.assertTrue(all(chunk['bytes_uncompressed'] > 0 and chunk['bytes_compressed'] > 0 for chunk in chunks))
+        self.assertTrue(os.path.exists(self.prometheus_file))
@@ -0,0 +1,67 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+import pandas as pd
+
+from dgraphpandas.hooks import stage_hooks
+from dgraphpandas.profiling import StageProfiler
+from dgraphpandas.rdf import to_rdf
+
+
+class ProfilingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_report(self):
+        '''
+        Ensures every stage is totalled across calls in the report
+        '''
+        profiler = StageProfiler()
+        for rows in [10, 20]:
+            profiler.on_stage_start('melt', rows)
+            profiler.on_stage_end('melt', rows * 2)
+
+        report = profiler.report()
+
+        self.assertEqual(list(report.columns), ['stage', 'calls', 'seconds', 'percent', 'rows_in', 'rows_out', 'rows_per_second'])
+        self.assertEqual(report.loc[0, 'stage'], 'melt')
+        self.assertEqual(report.loc[0, 'calls'], 2)
+        self.assertEqual(report.loc[0, 'rows_in'], 30)
+        self.assertEqual(report.loc[0, 'rows_out'], 60)
+
+    def test_dump_null_directory(self):
+        '''
+        Ensures when the directory is null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            StageProfiler(cprofile=True).dump(None)
+
+    def test_to_rdf_profile(self):
+        '''
+        Ensures when to_rdf is profiled then the transform, upserts
+        and write stages are reported and dumped as pstats files
+        '''
+        path = os.path.join(self.directory.name, 'students.csv')
+        pd.DataFrame(data={'id': [1, 2, 3], 'name': ['a', 'b', 'c'], 'school_id': [1, 1, 2]}).to_csv(path, index=False)
+        config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']}}}
+        profiler = StageProfiler(cprofile=True)
+
+        with stage_hooks(profiler):
+            to_rdf(path, config, 'student', os.path.join(self.directory.name, 'output'), export_rdf=True)
+
+        report = profiler.report().set_index('stage')
+        self.assertEqual(report.loc['melt', 'rows_in'], 3)
+        self.assertEqual(report.loc['melt', 'rows_out'], 6)
+        self.assertEqual(report.loc['generate_upserts', 'rows_out'], 9)
+        self.assertEqual(report.loc['write_gz', 'calls'], 2)
+        self.assertAlmostEqual(report['percent'].sum(), 100, delta=0.1)
+
+        paths = profiler.dump(os.path.join(self.directory.name, 'profiles'))
+        self.assertIn(os.path.join(self.directory.name, 'profiles', 'write_gz.prof'), paths)
+        pstats.Stats(paths[0])
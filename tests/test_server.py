@@ -0,0 +1,187 @@
+import os
+import json
+import queue
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch, Mock
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas import server
+from dgraphpandas.server import _parse_address, create_server, submit_job
+
+
+class ServerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, 'students.csv')
+        pd.DataFrame(data={'id': [1, 2, 3], 'name': ['a', 'b', 'c']}).to_csv(self.input_path, index=False)
+
+        self.config_path = os.path.join(self.directory.name, 'config.json')
+        with open(self.config_path, 'w') as f:
+            json.dump({'files': {'student': {'subject_fields': ['id']}}}, f)
+
+        self.job = {
+            'config': self.config_path,
+            'config_file_key': 'student',
+            'file': self.input_path,
+            'output_dir': os.path.join(self.directory.name, 'output'),
+            'options': {'chunk_size': 2}
+        }
+
+        server._config_cache.clear()
+        server._transformer_cache.clear()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _start(self, address: str, workers: int = 0):
+        job_server = create_server(address, workers)
+        thread = threading.Thread(target=job_server.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            job_server.shutdown()
+            job_server.server_close()
+            thread.join()
+
+        self.addCleanup(stop)
+        return job_server
+
+    @parameterized.expand([
+        ('unix', 'jobs.sock', 'jobs.sock'),
+        ('tcp', 'localhost:8765', ('localhost', 8765)),
+        ('port', ':8765', ('127.0.0.1', 8765)),
+    ])
+    def test_parse_address(self, name, address, expected):
+        '''
+        Ensures host:port addresses are TCP and anything else is a socket path
+        '''
+        self.assertEqual(_parse_address(address), expected)
+
+    @parameterized.expand([
+        ('address', None, 0),
+        ('workers', 'jobs.sock', -1),
+    ])
+    def test_create_server_bad_parameters(self, name, address, workers):
+        '''
+        Ensures when parameters are invalid, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            create_server(address, workers)
+
+    def test_submit_job_unix_socket(self):
+        '''
+        Ensures a job streams progress for every chunk and a result summary
+        and the compiled transformer is reused by the next job
+        '''
+        address = os.path.join(self.directory.name, 'jobs.sock')
+        self._start(address)
+
+        events = list(submit_job(address, self.job))
+        list(submit_job(address, self.job))
+
+        self.assertEqual([event['event'] for event in events], ['progress', 'progress', 'result'])
+        self.assertEqual(events[-1]['chunks'], 2)
+        self.assertEqual(events[-1]['intrinsic'], 6)
+        self.assertEqual(events[-1]['edges'], 0)
+        self.assertTrue(os.path.exists(os.path.join(self.job['output_dir'], 'students_intrinsic.gz')))
+        self.assertTrue(os.path.exists(os.path.join(self.job['output_dir'], 'students_intrinsic_2.gz')))
+        self.assertEqual(len(server._transformer_cache), 1)
+
+    def test_submit_job_tcp(self):
+        '''
+        Ensures jobs can also be submitted over local TCP
+        '''
+        job_server = self._start('127.0.0.1:0')
+        address = '127.0.0.1:' + str(job_server.server_address[1])
+
+        events = list(submit_job(address, self.job))
+
+        self.assertEqual(events[-1]['status'], 'ok')
+
+    def test_submit_job_worker_pool(self):
+        '''
+        Ensures when workers are used then jobs run in the pool
+        and still stream their events back
+        '''
+        address = os.path.join(self.directory.name, 'jobs.sock')
+        self._start(address, workers=1)
+
+        events = list(submit_job(address, self.job))
+
+        self.assertEqual([event['event'] for event in events], ['progress', 'progress', 'result'])
+
+    @parameterized.expand([
+        ('missing_file', {'file': None}),
+        ('missing_key', {'config_file_key': 'unknown'}),
+    ])
+    def test_submit_job_failed(self, name, overrides):
+        '''
+        Ensures when a job fails then an error event is returned
+        and the server keeps accepting jobs
+        '''
+        address = os.path.join(self.directory.name, 'jobs.sock')
+        self._start(address)
+
+        failed = list(submit_job(address, {**self.job, **overrides}))
+        succeeded = list(submit_job(address, self.job))
+
+        self.assertEqual(failed[-1]['event'], 'error')
+        self.assertEqual(succeeded[-1]['event'], 'result')
+
+    @parameterized.expand([
+        ('system_exit', SystemExit(1)),
+        ('keyboard_interrupt', KeyboardInterrupt()),
+    ])
+    def test_run_job_base_exception(self, name, error):
+        '''
+        Ensures when a job raises something other than an Exception
+        then an error event is still put on the events
+        '''
+        events = queue.Queue()
+        with patch('dgraphpandas.server._cached_transformer', side_effect=error):
+            try:
+                server._run_job(self.job, events)
+            except KeyboardInterrupt:
+                pass
+
+        event = events.get_nowait()
+        self.assertEqual(event['event'], 'error')
+        self.assertEqual(event['message'].split(':')[0], type(error).__name__)
+
+    def test_submit_job_worker_died(self):
+        '''
+        Ensures when a worker process dies during a job then an error
+        event is returned rather than waiting forever, and the pool is
+        replaced so the server keeps accepting jobs
+        '''
+        address = os.path.join(self.directory.name, 'jobs.sock')
+        job_server = self._start(address, workers=1)
+        job_server.poll_interval = 0.05
+
+        with patch('dgraphpandas.server._cached_transformer', side_effect=lambda *args: os._exit(1)):
+            failed = list(submit_job(address, self.job))
+        succeeded = list(submit_job(address, self.job))
+
+        self.assertEqual(failed[-1]['event'], 'error')
+        self.assertIn('BrokenProcessPool', failed[-1]['message'])
+        self.assertEqual(succeeded[-1]['event'], 'result')
+
+    @patch('dgraphpandas.server.os.stat')
+    def test_config_cache_invalidated_on_change(self, stat_mock: Mock):
+        '''
+        Ensures the configuration is read again when it has been modified
+        '''
+        stat_mock.return_value.st_mtime_ns = 1
+        first, _ = server._cached_config(self.config_path)
+        again, _ = server._cached_config(self.config_path)
+
+        stat_mock.return_value.st_mtime_ns = 2
+        changed, _ = server._cached_config(self.config_path)
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, changed)
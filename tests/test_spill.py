@@ -0,0 +1,134 @@
+import os
+import gzip
+import json
+import tempfile
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.rdf import to_rdf
+from dgraphpandas.spill import FrameSpiller, _estimate_rows
+
+
+class SpillTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.horizontal_config = {'files': {'title': {'subject_fields': ['id'], 'csv_edges': ['cast']}}}
+        self.vertical_config = {'transform': 'vertical', 'files': {'title': {'subject_fields': ['id'], 'csv_edges': ['cast']}}}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_spill_rows_null(self):
+        '''
+        Ensures when spill_rows is null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            FrameSpiller(None)
+
+    def test_estimate_rows_horizontal(self):
+        '''
+        Ensures the horizontal estimate counts every melted
+        field and every extra csv_edges value
+        '''
+        frame = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b'], 'cast': ['x,y,z', 'x']})
+        self.assertEqual(_estimate_rows(frame, self.horizontal_config, 'title'), 6)
+
+    @parameterized.expand([
+        ('csv_edges', {}, 4),
+        ('no_csv_edges', {'csv_edges': []}, 2),
+    ])
+    def test_estimate_rows_vertical(self, name, options, expected):
+        '''
+        Ensures the vertical estimate counts every row
+        and every extra csv_edges value
+        '''
+        frame = pd.DataFrame({'id': [1, 1], 'predicate': ['name', 'cast'], 'object': ['a', 'x,y,z']})
+        self.assertEqual(_estimate_rows(frame, self.vertical_config, 'title', **(options)), expected)
+
+    def test_split_partitions_by_subject(self):
+        '''
+        Ensures a frame over spill_rows is split so every subject
+        is in exactly one partition and the spill directory is removed
+        '''
+        frame = pd.DataFrame({'id': [1, 1, 2, 3, 4, 5] * 10, 'predicate': ['name'] * 60, 'object': ['a'] * 60})
+
+        parts = list(FrameSpiller(10, self.directory.name).split(frame, self.vertical_config, 'title'))
+
+        self.assertGreater(len(parts), 1)
+        self.assertEqual(sum(len(part) for part in parts), 60)
+        subjects = [set(part['id']) for part in parts]
+        self.assertEqual(sum(len(s) for s in subjects), 5)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_split_under_spill_rows(self):
+        '''
+        Ensures a frame under spill_rows is passed through as it is
+        '''
+        frame = pd.DataFrame({'id': [1], 'name': ['a']})
+        parts = list(FrameSpiller(10).split(frame, self.horizontal_config, 'title'))
+        self.assertEqual(len(parts), 1)
+        self.assertIs(parts[0], frame)
+
+    def _read(self, output_dir, name):
+        with gzip.open(os.path.join(output_dir, name), 'rt') as f:
+            return sorted(line for line in f.read().split('\n') if line)
+
+    def test_to_rdf_spill_same_statements(self):
+        '''
+        Ensures when a chunk is spilled then the exports
+        have the same statements as when it is not
+        '''
+        path = os.path.join(self.directory.name, 'titles.csv')
+        pd.DataFrame({
+            'id': range(20),
+            'name': [f'title {i}' for i in range(20)],
+            'cast': ['actor 1, actor 2, actor 3'] * 20
+        }).to_csv(path, index=False)
+
+        expected_dir = os.path.join(self.directory.name, 'expected')
+        spilled_dir = os.path.join(self.directory.name, 'spilled')
+        to_rdf(path, self.horizontal_config, 'title', expected_dir, export_rdf=True, export_csv=True)
+        to_rdf(path, self.horizontal_config, 'title', spilled_dir, export_rdf=True, export_csv=True, spill_rows=10)
+
+        for name in ['titles_intrinsic.gz', 'titles_edges.gz']:
+            self.assertEqual(self._read(spilled_dir, name), self._read(expected_dir, name))
+
+        expected_csv = pd.read_csv(os.path.join(expected_dir, 'titles_edges.csv'))
+        spilled_csv = pd.read_csv(os.path.join(spilled_dir, 'titles_edges.csv'))
+        self.assertEqual(len(spilled_csv), len(expected_csv))
+
+    @parameterized.expand([
+        ('no_shards', {}, ['']),
+        ('shards', {'shards': 2}, ['shard_0', 'shard_1']),
+    ])
+    def test_to_rdf_spill_writes_partitions(self, name, options, directories):
+        '''
+        Ensures when a chunk is spilled then the statements of each partition
+        are written to the exports (and manifest) rather than being returned
+        '''
+        path = os.path.join(self.directory.name, 'titles.csv')
+        pd.DataFrame({
+            'id': range(20),
+            'name': [f'title {i}' for i in range(20)],
+            'cast': ['actor 1, actor 2, actor 3'] * 20
+        }).to_csv(path, index=False)
+
+        expected_dir = os.path.join(self.directory.name, 'expected')
+        spilled_dir = os.path.join(self.directory.name, 'spilled')
+        expected = to_rdf(path, self.horizontal_config, 'title', expected_dir, export_rdf=True, **(options))
+        spilled = to_rdf(path, self.horizontal_config, 'title', spilled_dir, export_rdf=True, manifest=True, spill_rows=10, **(options))
+
+        self.assertEqual(spilled, [([], [])])
+        for directory in directories:
+            for export in ['titles_intrinsic.gz', 'titles_edges.gz']:
+                name = os.path.join(directory, export)
+                self.assertEqual(self._read(spilled_dir, name), self._read(expected_dir, name))
+
+        intrinsic, edges = expected[0]
+        with open(os.path.join(spilled_dir, 'manifest.jsonl'), 'r') as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(sum(entry['statements'] for entry in entries if entry['kind'] == 'intrinsic'), len(intrinsic))
+        self.assertEqual(sum(entry['statements'] for entry in entries if entry['kind'] == 'edges'), len(edges))
@@ -0,0 +1,176 @@
+import io
+import os
+import gzip
+import time
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from dgraphpandas.stream import stream_rdf
+
+
+class _SlowSource:
+    '''
+    Yields lines with a pause before some of them, like an idle pipe.
+    '''
+
+    def __init__(self, lines, pauses):
+        self.lines = lines
+        self.pauses = pauses
+
+    def __iter__(self):
+        for index, line in enumerate(self.lines):
+            if index in self.pauses:
+                time.sleep(self.pauses[index])
+            yield line
+
+
+class StreamTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, 'output')
+        self.config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']}}}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read_exports(self, name: str):
+        lines = []
+        for file_name in sorted(os.listdir(self.output)):
+            if file_name.startswith(name):
+                with gzip.open(os.path.join(self.output, file_name), 'rt') as f:
+                    lines.extend(line for line in f.read().split('\n') if line)
+        return lines
+
+    @parameterized.expand([
+        ('config', None, 'student', 'output'),
+        ('config_key', {'files': {}}, None, 'output'),
+        ('output_dir', {'files': {}}, 'student', None),
+    ])
+    def test_stream_rdf_null_parameters(self, name, config, config_key, output_dir):
+        '''
+        Ensures when parameters are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            stream_rdf(io.StringIO(''), config, config_key, output_dir)
+
+    def test_stream_rdf_bad_format(self):
+        '''
+        Ensures when the stream format is unknown, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            stream_rdf(io.StringIO('id,name\n1,a\n'), self.config, 'student', self.output, stream_format='xml')
+
+    @parameterized.expand([
+        ('output_format', {'output_format': 'json'}),
+        ('shards', {'shards': 2}),
+        ('manifest', {'manifest': True}),
+        ('dgraph_address', {'dgraph_address': 'http://localhost:8080'}),
+        ('vertical_incremental_state', {'transform': 'vertical', 'incremental_state': 'state.db'}),
+    ])
+    def test_stream_rdf_unsupported_options(self, name, options):
+        '''
+        Ensures when options the stream cannot honour are passed, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            stream_rdf(io.StringIO('id,name\n1,a\n'), self.config, 'student', self.output, **(options))
+
+    def test_stream_rdf_csv_batches_by_rows(self):
+        '''
+        Ensures the stream is cut into batches of stream_batch_rows
+        and every row is exported
+        '''
+        source = io.StringIO('id,name,school_id\n1,a,1\n2,b,1\n3,c,2\n4,d,2\n5,e,3\n')
+
+        summary = stream_rdf(source, self.config, 'student', self.output, stream_batch_rows=2)
+
+        self.assertEqual(summary['batches'], 3)
+        self.assertEqual(summary['rows'], 5)
+        self.assertEqual(summary['exports'], 1)
+        self.assertEqual(len(self._read_exports('student_intrinsic')), 10)
+        self.assertIn('<student_5> <school> <school_3> .', self._read_exports('student_edges'))
+
+    def test_stream_rdf_keeps_first_batch_dtypes(self):
+        '''
+        Ensures a later batch whose values look numeric keeps
+        the text type of the first batch
+        '''
+        source = io.StringIO('id,code\n1,x1\n2,007\n')
+
+        stream_rdf(source, self.config, 'student', self.output, stream_batch_rows=1)
+
+        intrinsic = self._read_exports('student_intrinsic')
+        self.assertIn('<student_2> <code> "007"^^<xs:string> .', intrinsic)
+
+    def test_stream_rdf_jsonl(self):
+        '''
+        Ensures JSON lines are converted and later batches keep the first batch columns
+        '''
+        source = io.StringIO('{"id": 1, "name": "a"}\n{"id": 2, "name": "b", "extra": 1}\n')
+
+        summary = stream_rdf(source, self.config, 'student', self.output, stream_format='jsonl', stream_batch_rows=1)
+
+        intrinsic = self._read_exports('student_intrinsic')
+        self.assertEqual(summary['rows'], 2)
+        self.assertIn('<student_2> <name> "b"^^<xs:string> .', intrinsic)
+        self.assertFalse(any('<extra>' in line for line in intrinsic))
+
+    def test_stream_rdf_batches_by_deadline(self):
+        '''
+        Ensures when the source goes quiet then a batch is cut
+        at the deadline rather than waiting for more rows
+        and exports are flushed on the schedule
+        '''
+        source = _SlowSource(['id,name\n', '1,a\n', '2,b\n', '3,c\n'], {3: 0.5})
+
+        summary = stream_rdf(
+            source, self.config, 'student', self.output,
+            stream_batch_rows=100, stream_batch_seconds=0.1, stream_flush_seconds=0)
+
+        self.assertEqual(summary['batches'], 2)
+        self.assertEqual(summary['exports'], 2)
+        self.assertEqual(sorted(f for f in os.listdir(self.output) if 'intrinsic' in f), ['student_intrinsic_1.gz', 'student_intrinsic_2.gz'])
+
+    def test_stream_rdf_continues_part_numbers(self):
+        '''
+        Ensures a second run into the same output directory carries on
+        numbering the exports rather than overwriting the first run
+        '''
+        stream_rdf(io.StringIO('id,name\n1,a\n'), self.config, 'student', self.output)
+        summary = stream_rdf(io.StringIO('id,name\n2,b\n'), self.config, 'student', self.output)
+
+        self.assertEqual(summary['exports'], 1)
+        self.assertEqual(sorted(f for f in os.listdir(self.output) if 'intrinsic' in f), ['student_intrinsic_1.gz', 'student_intrinsic_2.gz'])
+        self.assertIn('<student_1> <name> "a"^^<xs:string> .', self._read_exports('student_intrinsic'))
+
+    def test_stream_rdf_source_error_raised(self):
+        '''
+        Ensures when reading the source fails then the error is raised
+        after the batches converted so far have been exported
+        '''
+        def source():
+            yield 'id,name\n'
+            yield '1,a\n'
+            time.sleep(0.2)
+            raise OSError('pipe broke')
+
+        with self.assertRaisesRegex(OSError, 'pipe broke'):
+            stream_rdf(source(), self.config, 'student', self.output, stream_batch_seconds=0.05, stream_flush_seconds=60)
+
+        self.assertIn('<student_1> <name> "a"^^<xs:string> .', self._read_exports('student_intrinsic'))
+
+    def test_stream_rdf_incremental_state_deletes(self):
+        '''
+        Ensures with incremental_state only changes are exported
+        and predicates which were removed are exported as deletes
+        '''
+        state = os.path.join(self.directory.name, 'state.db')
+
+        stream_rdf(io.StringIO('id,name,age\n1,a,3\n'), self.config, 'student', self.output, incremental_state=state)
+        summary = stream_rdf(io.StringIO('id,name,age\n1,a,\n'), self.config, 'student', self.output, incremental_state=state)
+
+        self.assertEqual(summary['intrinsic'], 0)
+        self.assertEqual(summary['deletes'], 1)
+        self.assertEqual(self._read_exports('student_deletes'), ['<student_1> <age> * .'])
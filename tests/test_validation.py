@@ -0,0 +1,138 @@
+import os
+import gzip
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.rdf import to_rdf
+from dgraphpandas.manifest import read_manifest
+from dgraphpandas.validation import build_xid_index, find_dangling_edges, validate_edges
+
+
+def _write(path, lines):
+    with gzip.open(path, mode='wb') as f:
+        f.write('\n'.join(lines).encode('utf-8'))
+
+
+class ValidationTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        _write(os.path.join(self.directory.name, 'customer_intrinsic.gz'), [
+            '<customer_1> <age> "23"^^<xs:int> .',
+            '<customer_2> <age> "40"^^<xs:int> .',
+        ])
+        _write(os.path.join(self.directory.name, 'location_intrinsic.gz'), [
+            '<location_1> <name> "London"^^<xs:string> .',
+        ])
+        _write(os.path.join(self.directory.name, 'customer_edges.gz'), [
+            '<customer_1> <location> <location_1> .',
+            '<customer_2> <location> <location_2> .',
+            '<customer_2> <knows> <customer_1> .',
+        ])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build_xid_index_null_paths(self):
+        '''
+        Ensures when paths is null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            build_xid_index(None)
+
+    @parameterized.expand([
+        (None, np.array([], dtype=np.uint64)),
+        (pd.Series([], dtype=object), None),
+    ])
+    def test_find_dangling_edges_null_parameters(self, edges, index):
+        '''
+        Ensures when parameters are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            find_dangling_edges(edges, index)
+
+    @parameterized.expand([
+        ('in_memory', False),
+        ('memory_mapped', True),
+    ])
+    def test_find_dangling_edges(self, name, memory_mapped):
+        '''
+        Ensures edges which target an xid that is not indexed are detected
+        '''
+        index_path = os.path.join(self.directory.name, 'xids.npy') if memory_mapped else None
+        index = build_xid_index([os.path.join(self.directory.name, 'customer_intrinsic.gz')], index_path)
+
+        edges = pd.Series([
+            '<customer_1> <knows> <customer_2> .',
+            '<customer_1> <knows> <customer_9> .',
+            '<customer_2> <knows> <customer_1> .',
+        ])
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(find_dangling_edges(edges, index).tolist(), [False, True, False])
+
+    def test_find_dangling_edges_empty_index(self):
+        '''
+        Ensures when nothing is indexed, every edge is dangling
+        '''
+        edges = pd.Series(['<customer_1> <knows> <customer_2> .'])
+        self.assertEqual(find_dangling_edges(edges, np.array([], dtype=np.uint64)).tolist(), [True])
+
+    def test_validate_edges_null_output_dir(self):
+        '''
+        Ensures when the output_dir is null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            validate_edges(None)
+
+    @parameterized.expand([
+        ('report_only', False),
+        ('filter', True),
+    ])
+    def test_validate_edges(self, name, filter_dangling_edges):
+        '''
+        Ensures dangling edges are reported and optionally removed
+        '''
+        report = validate_edges(self.directory.name, filter_dangling_edges=filter_dangling_edges)
+
+        self.assertEqual(report.to_dict(orient='records'), [{
+            'file': os.path.join(self.directory.name, 'customer_edges.gz'),
+            'edges': 3,
+            'dangling': 1
+        }])
+
+        with gzip.open(os.path.join(self.directory.name, 'customer_edges.gz'), mode='rt') as f:
+            lines = f.read().split('\n')
+
+        self.assertEqual('<customer_2> <location> <location_2> .' in lines, not filter_dangling_edges)
+        self.assertEqual(len(lines), 2 if filter_dangling_edges else 3)
+
+    @parameterized.expand([
+        ('shards', {'shards': 2}, False),
+        ('shards_manifest', {'shards': 2}, True),
+        ('subject_batches', {'subject_batches': True, 'subject_batch_workers': 2}, False),
+        ('subject_batches_manifest', {'subject_batches': True, 'subject_batch_workers': 2}, True),
+    ])
+    def test_validate_edges_layouts(self, name, options, manifest):
+        '''
+        Ensures the edges within shard directories and subject
+        batches are checked, with or without a manifest
+        '''
+        output_dir = os.path.join(self.directory.name, 'output')
+        config = {'files': {'customer': {'subject_fields': ['id'], 'edge_fields': ['location_id']}}}
+        frame = pd.DataFrame({'id': [1, 2, 3], 'age': [20, 30, 40], 'location_id': [1, 2, 3]})
+        to_rdf(frame, config, 'customer', output_dir, export_rdf=True, manifest=manifest, **(options))
+        statements = sum(entry['statements'] for entry in read_manifest(output_dir)) if manifest else None
+
+        report = validate_edges(output_dir, filter_dangling_edges=True)
+
+        self.assertEqual(report['edges'].sum(), 3)
+        self.assertEqual(report['dangling'].sum(), 3)
+        self.assertTrue(all(os.path.exists(path) for path in report['file']))
+        self.assertEqual(validate_edges(output_dir)['edges'].sum(), 0)
+        if manifest:
+            self.assertEqual(sum(entry['statements'] for entry in read_manifest(output_dir)), statements - 3)
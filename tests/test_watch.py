@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.watch import DirectoryWatcher, _match_config_key
+
+
+class WatchTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.landing = os.path.join(self.directory.name, 'landing')
+        self.output = os.path.join(self.directory.name, 'output')
+        os.makedirs(self.landing)
+
+        self.config = {
+            'files': {
+                'student': {'subject_fields': ['id'], 'watch_pattern': 'students_*.csv'},
+                'school': {'subject_fields': ['id']}
+            }
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _land(self, name: str, ids):
+        path = os.path.join(self.landing, name)
+        pd.DataFrame(data={'id': ids, 'name': ['a'] * len(ids)}).to_csv(path, index=False)
+        return path
+
+    def _watcher(self, **kwargs):
+        watcher = DirectoryWatcher(self.landing, self.config, self.output, **{'watch_settle': 0, 'watch_workers': 2, **kwargs})
+        self.addCleanup(watcher.close)
+        return watcher
+
+    def _statuses(self, watcher):
+        return watcher.ledger.execute('SELECT path, status FROM processed ORDER BY path').fetchall()
+
+    @parameterized.expand([
+        ('directory', None, {'files': {}}, 'output'),
+        ('config', 'landing', None, 'output'),
+        ('output_dir', 'landing', {'files': {}}, None),
+    ])
+    def test_watcher_null_parameters(self, name, directory, config, output_dir):
+        '''
+        Ensures when parameters are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            DirectoryWatcher(directory, config, output_dir)
+
+    def test_watcher_no_patterns(self):
+        '''
+        Ensures when no file has a watch_pattern, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            DirectoryWatcher(self.landing, {'files': {'student': {'subject_fields': ['id']}}}, self.output)
+
+    @parameterized.expand([
+        ('match', 'students_1.csv', 'student'),
+        ('no_match', 'schools_1.csv', None),
+    ])
+    def test_match_config_key(self, name, file_name, expected):
+        '''
+        Ensures file names are mapped to the config key of the matching pattern
+        '''
+        self.assertEqual(_match_config_key(file_name, [('students_*.csv', 'student')]), expected)
+
+    def test_poll_processes_files_once(self):
+        '''
+        Ensures every matching file is converted and recorded once
+        and unmatched files are ignored
+        '''
+        first = self._land('students_1.csv', [1, 2])
+        second = self._land('students_2.csv', [3])
+        self._land('schools_1.csv', [1])
+
+        watcher = self._watcher()
+        self.assertEqual(watcher.poll(), 2)
+        watcher.drain()
+        self.assertEqual(watcher.poll(), 0)
+
+        self.assertEqual(self._statuses(watcher), [(first, 'done'), (second, 'done')])
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'students_1_intrinsic.gz')))
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'students_2_intrinsic.gz')))
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'schools_1_intrinsic.gz')))
+
+    def test_poll_files_differing_after_a_dot(self):
+        '''
+        Ensures files whose names only differ after a dot
+        are written to exports of their own
+        '''
+        self.config['files']['student']['watch_pattern'] = 'students.*.csv'
+        self._land('students.2021-01-01.csv', [1, 2])
+        self._land('students.2021-01-02.csv', [3])
+
+        watcher = self._watcher()
+        self.assertEqual(watcher.poll(), 2)
+        watcher.drain()
+
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'students.2021-01-01_intrinsic.gz')))
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'students.2021-01-02_intrinsic.gz')))
+
+    def test_poll_waits_for_file_to_settle(self):
+        '''
+        Ensures a file is only picked up once it has stopped changing
+        '''
+        self._land('students_1.csv', [1])
+        watcher = self._watcher(watch_settle=60)
+
+        self.assertEqual(watcher.poll(), 0)
+        self.assertEqual(watcher.poll(), 0)
+
+    def test_poll_reprocesses_changed_file(self):
+        '''
+        Ensures when a file is replaced with new content, it is processed again
+        '''
+        path = self._land('students_1.csv', [1])
+        watcher = self._watcher()
+        watcher.poll()
+        watcher.drain()
+
+        self._land('students_1.csv', [1, 2, 3])
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        self.assertEqual(watcher.poll(), 1)
+        watcher.drain()
+
+        self.assertEqual(watcher.ledger.execute('SELECT COUNT(*) FROM processed').fetchone()[0], 2)
+
+    def test_ledger_persists_across_watchers(self):
+        '''
+        Ensures files processed by a previous watcher are not processed again
+        '''
+        self._land('students_1.csv', [1])
+        watcher = self._watcher()
+        watcher.poll()
+        watcher.close()
+
+        self.assertEqual(self._watcher().poll(), 0)
+
+    def test_failed_file_recorded(self):
+        '''
+        Ensures when a conversion fails then it is recorded as failed
+        and is not retried until it changes
+        '''
+        path = os.path.join(self.landing, 'students_1.csv')
+        pd.DataFrame(data={'name': ['a']}).to_csv(path, index=False)
+
+        watcher = self._watcher()
+        watcher.poll()
+        watcher.drain()
+
+        self.assertEqual(self._statuses(watcher), [(path, 'failed')])
+        self.assertEqual(self._watcher().poll(), 0)
@@ -0,0 +1,146 @@
+import os
+import gzip
+import tempfile
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.dgraph_stub import DgraphStub
+from dgraphpandas.rdf import to_rdf
+from dgraphpandas.writers.batching import group_by_subject, subject_batches, subject_worker
+from dgraphpandas.writers.dgraph_http import DgraphHttpSink
+
+
+def _statements(subjects: int, per_subject: int):
+    '''
+    Interleaves the statements of the subjects, as the
+    separate intrinsic and edge exports would be
+    '''
+    return [f'<s_{subject}> <p_{i}> "{i}"^^<xs:int> .' for i in range(per_subject) for subject in range(subjects)]
+
+
+class BatchingTests(unittest.TestCase):
+
+    @parameterized.expand([
+        ('statements', None, 10, 1),
+        ('batch_size', [], 0, 1),
+        ('workers', [], 10, 0),
+    ])
+    def test_bad_parameters(self, name, statements, batch_size, workers):
+        '''
+        Ensures when parameters are null or invalid, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            subject_batches(statements, batch_size, workers)
+
+    def test_group_by_subject(self):
+        '''
+        Ensures statements are grouped by subject in the order they first appeared
+        '''
+        groups = group_by_subject(['<b> <p> <c> .', '<a> <p> "1"^^<xs:int> .', '<b> <q> "2"^^<xs:int> .'])
+
+        self.assertEqual(list(groups.keys()), ['b', 'a'])
+        self.assertEqual(groups['b'], ['<b> <p> <c> .', '<b> <q> "2"^^<xs:int> .'])
+
+    @parameterized.expand([
+        ('one_worker', 1),
+        ('many_workers', 3),
+    ])
+    def test_subject_batches(self, name, workers):
+        '''
+        Ensures batches are cut only between subjects, are no larger than batch_size
+        and every subject is in exactly one batch of one worker
+        '''
+        statements = _statements(subjects=20, per_subject=3)
+
+        worker_batches = subject_batches(statements, batch_size=7, workers=workers)
+
+        self.assertEqual(len(worker_batches), workers)
+        seen = {}
+        for worker, batches in enumerate(worker_batches):
+            for batch_index, batch in enumerate(batches):
+                self.assertLessEqual(len(batch), 7)
+                for statement in batch:
+                    subject = statement.split(' ')[0]
+                    self.assertEqual(seen.setdefault(subject, (worker, batch_index)), (worker, batch_index))
+                    self.assertEqual(subject_worker(subject[1:-1], workers), worker)
+
+        self.assertEqual(len(seen), 20)
+        self.assertEqual(sum(len(batch) for batches in worker_batches for batch in batches), 60)
+
+    def test_subject_batches_large_subject(self):
+        '''
+        Ensures a subject with more statements than batch_size gets a batch of its own
+        '''
+        statements = _statements(subjects=1, per_subject=5) + ['<s_1> <p> <s_0> .']
+
+        batches, = subject_batches(statements, batch_size=2)
+
+        self.assertEqual([len(batch) for batch in batches], [5, 1])
+
+    def test_sink_group_by_subject(self):
+        '''
+        Ensures the sink sends batches grouped by subject
+        '''
+        with DgraphStub() as stub:
+            with DgraphHttpSink(stub.address, batch_size=7, concurrency=3, group_by_subject=True) as sink:
+                sink.send(_statements(subjects=20, per_subject=3))
+
+            self.assertEqual(sink.batches, stub.requests)
+            self.assertEqual(len([triple for triple in stub.triples() if triple[1] != 'xid']), 60)
+
+    def test_to_rdf_subject_batches(self):
+        '''
+        Ensures when subject_batches is set then an export is written for every worker
+        with the intrinsic and edge statements of each subject together
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'students.csv')
+            pd.DataFrame(data={'id': range(10), 'name': ['a'] * 10, 'school_id': [1, 2] * 5}).to_csv(path, index=False)
+            config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']}}}
+
+            to_rdf(path, config, 'student', directory, export_rdf=True, subject_batches=True, subject_batch_size=4, subject_batch_workers=2)
+
+            exports = sorted(name for name in os.listdir(directory) if name.endswith('.gz'))
+            self.assertEqual(exports, ['students_subjects_worker_0.gz', 'students_subjects_worker_1.gz'])
+
+            subjects = []
+            for export in exports:
+                with gzip.open(os.path.join(directory, export), 'rt') as f:
+                    subjects.extend(line.split(' ')[0] for line in f.read().split('\n'))
+
+        self.assertEqual(len(subjects), 30)
+        changes = sum(1 for previous, current in zip(subjects, subjects[1:]) if previous != current)
+        self.assertEqual(changes, 9)
+
+    @parameterized.expand([
+        ('fewer_workers', 4, 2),
+        ('same', 4, 4),
+    ])
+    def test_to_rdf_subject_batches_shards(self, name, shards, workers):
+        '''
+        Ensures when subject_batches is combined with shards then the subjects
+        of every shard are still spread over every worker
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'students.csv')
+            pd.DataFrame(data={'id': range(200), 'name': ['a'] * 200, 'school_id': [1, 2] * 100}).to_csv(path, index=False)
+            config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']}}}
+
+            to_rdf(path, config, 'student', directory, export_rdf=True, shards=shards,
+                   subject_batches=True, subject_batch_size=4, subject_batch_workers=workers)
+
+            subjects = set()
+            for shard in range(shards):
+                shard_directory = os.path.join(directory, f'shard_{shard}')
+                exports = sorted(name for name in os.listdir(shard_directory) if name.endswith('.gz'))
+                self.assertEqual(exports, [f'students_subjects_worker_{worker}.gz' for worker in range(workers)])
+
+                for export in exports:
+                    with gzip.open(os.path.join(shard_directory, export), 'rt') as f:
+                        lines = [line for line in f.read().split('\n') if line]
+                    self.assertTrue(lines, f'{export} in shard {shard} is empty')
+                    subjects.update(line.split(' ')[0] for line in lines)
+
+        self.assertEqual(len(subjects), 200)
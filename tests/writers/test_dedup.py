@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.rdf import to_rdf
+from dgraphpandas.writers.dedup import TripleDeduplicator
+
+
+class DedupTests(unittest.TestCase):
+
+    @parameterized.expand([
+        ('memory_limit_none', {'memory_limit': None}),
+        ('memory_limit_zero', {'memory_limit': 0}),
+    ])
+    def test_bad_parameters(self, name, options):
+        '''
+        Ensures when the memory limit is invalid, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            TripleDeduplicator(**(options))
+
+    def test_deduplicate_null_lines(self):
+        '''
+        Ensures when lines are null, an exception is raised
+        '''
+        deduplicator = TripleDeduplicator()
+        with self.assertRaises(ValueError):
+            deduplicator.deduplicate(None)
+        deduplicator.close()
+
+    @parameterized.expand([
+        ('in_memory', 1024 * 1024),
+        ('spilled', 8),
+    ])
+    def test_deduplicate_across_calls(self, name, memory_limit):
+        '''
+        Ensures duplicates are removed within and across calls
+        whether the seen hashes are in memory or spilled to disk
+        '''
+        deduplicator = TripleDeduplicator(memory_limit=memory_limit)
+
+        first = deduplicator.deduplicate(['<a> <p> <b> .', '<a> <p> <c> .', '<a> <p> <b> .'])
+        second = deduplicator.deduplicate(['<a> <p> <c> .', '<a> <p> <d> .'])
+        third = deduplicator.deduplicate(['<a> <p> <b> .', '<a> <p> <d> .', '<a> <p> <e> .'])
+        deduplicator.close()
+
+        self.assertEqual(first, ['<a> <p> <b> .', '<a> <p> <c> .'])
+        self.assertEqual(second, ['<a> <p> <d> .'])
+        self.assertEqual(third, ['<a> <p> <e> .'])
+        self.assertEqual(deduplicator.duplicates, 4)
+        self.assertEqual(deduplicator.seen, 8)
+
+    def test_deduplicate_partitions_follow_volume(self):
+        '''
+        Ensures the spilled partitions are split as the hashes grow
+        so none of them holds more than half of the memory limit
+        '''
+        memory_limit = 1024
+        lines = [f'<a> <p> "{i}" .' for i in range(2000)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            deduplicator = TripleDeduplicator(memory_limit=memory_limit, spill_dir=directory)
+            for start in range(0, len(lines), 100):
+                self.assertEqual(deduplicator.deduplicate(lines[start:start + 100]), lines[start:start + 100])
+            self.assertEqual(deduplicator.deduplicate(lines[::7]), [])
+            deduplicator.close()
+
+            sizes = [os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)]
+
+        self.assertEqual(len(sizes), deduplicator.partitions)
+        self.assertGreater(deduplicator.partitions, 1)
+        self.assertEqual(sum(sizes), len(lines) * 8)
+        self.assertLessEqual(max(sizes), memory_limit // 2)
+        self.assertEqual(deduplicator.duplicates, len(lines[::7]))
+
+    def test_deduplicate_persistent_spill_dir(self):
+        '''
+        Ensures when a spill directory is provided, the seen statements
+        persist into a new deduplicator
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            deduplicator = TripleDeduplicator(spill_dir=directory)
+            deduplicator.deduplicate(['<a> <p> <b> .'])
+            deduplicator.close()
+
+            deduplicator = TripleDeduplicator(spill_dir=directory)
+            result = deduplicator.deduplicate(['<a> <p> <b> .', '<a> <p> <c> .'])
+            deduplicator.close()
+
+            self.assertEqual(result, ['<a> <p> <c> .'])
+            self.assertTrue(os.listdir(directory))
+
+    def test_to_rdf_dedup_across_chunks(self):
+        '''
+        Ensures when dedup is enabled then repeated rows
+        across chunks of a file are only emitted once
+        '''
+        config = {'files': {'director': {'subject_fields': ['id']}}}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'directors.csv')
+            pd.DataFrame(data={'id': [1, 2, 1, 2], 'name': ['a', 'b', 'a', 'b']}).to_csv(path, index=False)
+
+            result = to_rdf(path, config, 'director', chunk_size=2, dedup=True)
+
+        self.assertEqual(len(result[0][0]), 4)
+        self.assertEqual(result[1][0], [])
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.dgraph_stub import DgraphStub
+from dgraphpandas.rdf import to_rdf
+from dgraphpandas.writers.dgraph_http import DgraphHttpSink, MutationError
+
+
+class DgraphHttpTests(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = DgraphStub().start()
+
+    def tearDown(self):
+        self.stub.stop()
+
+    @parameterized.expand([
+        ('address', {'address': None}),
+        ('batch_size', {'batch_size': 0}),
+        ('concurrency', {'concurrency': 0}),
+    ])
+    def test_bad_parameters(self, name, options):
+        '''
+        Ensures when the address, batch size or concurrency are invalid, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            DgraphHttpSink(**{'address': 'http://localhost:8080', **options})
+
+    def test_send_batches(self):
+        '''
+        Ensures statements are sent in batches of batch_size
+        and applied to the nodes matched by xid
+        '''
+        statements = [f'<student_{i}> <school> <school_{i % 2}> .' for i in range(10)]
+
+        with DgraphHttpSink(self.stub.address, batch_size=3, concurrency=2) as sink:
+            self.assertEqual(sink.send(statements), 10)
+            self.assertEqual(sink.send(['<student_1> <school> * .'], delete=True), 1)
+
+        self.assertEqual(sink.batches, 5)
+        self.assertEqual(self.stub.requests, 5)
+        triples = self.stub.triples()
+        self.assertIn(('student_0', 'school', '<school_0>'), triples)
+        self.assertIn(('school_1', 'xid', '"school_1"'), triples)
+        self.assertNotIn(('student_1', 'school', '<school_1>'), triples)
+
+    def test_send_retries_aborted(self):
+        '''
+        Ensures aborted transactions are retried with backoff
+        '''
+        self.stub.abort_first = 2
+
+        with DgraphHttpSink(self.stub.address, backoff=0.001) as sink:
+            sink.send(['<student_1> <name> "a"^^<xs:string> .'])
+
+        self.assertEqual(sink.retried, 2)
+        self.assertIn(('student_1', 'name', '"a"^^<xs:string>'), self.stub.triples())
+
+    def test_send_gives_up(self):
+        '''
+        Ensures when transactions keep being aborted beyond the retries, an exception is raised
+        '''
+        self.stub.abort_first = 10
+
+        with DgraphHttpSink(self.stub.address, retries=2, backoff=0.001) as sink:
+            with self.assertRaises(MutationError):
+                sink.send(['<student_1> <name> "a"^^<xs:string> .'])
+
+        self.assertEqual(self.stub.requests, 3)
+
+    def test_send_unreachable(self):
+        '''
+        Ensures when Dgraph cannot be reached, an exception is raised after the retries
+        '''
+        address = self.stub.address
+        self.stub.stop()
+
+        with DgraphHttpSink(address, retries=1, backoff=0.001) as sink:
+            with self.assertRaises(MutationError):
+                sink.send(['<student_1> <name> "a"^^<xs:string> .'])
+
+        self.stub = DgraphStub().start()
+
+    def test_to_rdf_dgraph_address(self):
+        '''
+        Ensures when a dgraph_address is configured then the
+        upserts of every chunk are sent to Dgraph
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'students.csv')
+            pd.DataFrame(data={'id': [1, 2, 3], 'name': ['a', 'b', 'c'], 'school_id': [1, 1, 2]}).to_csv(path, index=False)
+            config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']}}}
+
+            to_rdf(path, config, 'student', directory, chunk_size=2, dgraph_address=self.stub.address, dgraph_batch_size=2)
+
+            self.assertFalse(any(name.endswith('.gz') for name in os.listdir(directory)))
+
+        triples = self.stub.triples()
+        self.assertIn(('student_3', 'school', '<school_2>'), triples)
+        self.assertIn(('student_2', 'name', '"b"^^<xs:string>'), triples)
+        self.assertIn(('student_1', 'dgraph.type', '"student"^^<xs:string>'), triples)
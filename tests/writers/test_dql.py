@@ -0,0 +1,120 @@
+import os
+import gzip
+import tempfile
+import unittest
+
+import pandas as pd
+
+from dgraphpandas.dgraph_stub import DgraphStub
+from dgraphpandas.rdf import to_rdf
+from dgraphpandas.writers.dgraph_http import DgraphHttpSink
+from dgraphpandas.writers.dql import generate_upsert_block, generate_upsert_blocks, write_upsert_blocks
+
+
+class DqlTests(unittest.TestCase):
+
+    def test_upsert_block(self):
+        '''
+        Ensures subjects and edge targets are matched by the upsert predicate
+        and the upsert predicate is set on them
+        '''
+        block = generate_upsert_block(['<student_1> <school> <school_1> .', '<student_1> <name> "a b"^^<xs:string> .'], 'xid')
+
+        self.assertIn('v0 as var(func: eq(xid, "student_1"))', block)
+        self.assertIn('v1 as var(func: eq(xid, "school_1"))', block)
+        self.assertIn('uid(v0) <school> uid(v1) .', block)
+        self.assertIn('uid(v0) <name> "a b"^^<xs:string> .', block)
+        self.assertIn('uid(v1) <xid> "school_1" .', block)
+        self.assertIn('set {', block)
+
+    def test_upsert_block_delete(self):
+        '''
+        Ensures deletes do not set the upsert predicate
+        '''
+        block = generate_upsert_block(['<student_1> <name> * .'], 'xid', delete=True)
+
+        self.assertIn('uid(v0) <name> * .', block)
+        self.assertIn('delete {', block)
+        self.assertNotIn('<xid> "student_1"', block)
+
+    def test_upsert_block_bad_statement(self):
+        '''
+        Ensures when a statement cannot be parsed, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            generate_upsert_block(['not a statement'])
+
+    def test_upsert_blocks_bad_batch_size(self):
+        '''
+        Ensures when the batch_size is invalid, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            generate_upsert_blocks([], 0)
+
+    def test_upsert_blocks(self):
+        '''
+        Ensures a block is built for every batch_size subjects
+        with all of the statements of a subject in one block
+        '''
+        statements = [f'<student_{i % 5}> <p_{i}> "{i}"^^<xs:int> .' for i in range(20)]
+
+        blocks = generate_upsert_blocks(statements, batch_size=2)
+
+        self.assertEqual(len(blocks), 3)
+        self.assertEqual([block.count('as var(') for block in blocks], [2, 2, 1])
+        self.assertEqual(sum(block.count('<p_') for block in blocks), 20)
+        self.assertEqual(sum('eq(xid, "student_0")' in block for block in blocks), 1)
+
+    def test_write_upsert_blocks(self):
+        '''
+        Ensures blocks are written separated by a blank line
+        '''
+        blocks = generate_upsert_blocks(['<a> <p> <b> .', '<c> <p> <d> .'], batch_size=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'upserts.dql.gz')
+            written = write_upsert_blocks(path, blocks)
+
+            with gzip.open(path, 'rt') as f:
+                content = f.read()
+
+        self.assertEqual(content.strip().split('\n\n'), blocks)
+        self.assertEqual(len(content), written)
+
+    def _write_students(self, directory):
+        path = os.path.join(directory, 'students.csv')
+        pd.DataFrame(data={'id': range(10), 'name': ['a'] * 10, 'school_id': [1, 2] * 5}).to_csv(path, index=False)
+        config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']}}}
+        return path, config
+
+    def test_to_rdf_output_format_dql(self):
+        '''
+        Ensures when the output_format is dql then an export of upsert
+        blocks is written in place of the intrinsic and edge exports
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path, config = self._write_students(directory)
+
+            to_rdf(path, config, 'student', directory, export_rdf=True, output_format='dql', dql_batch_size=4)
+
+            self.assertEqual(sorted(name for name in os.listdir(directory) if name.endswith('.gz')), ['students_upserts.dql.gz'])
+            with gzip.open(os.path.join(directory, 'students_upserts.dql.gz'), 'rt') as f:
+                blocks = f.read().strip().split('\n\n')
+
+        self.assertEqual(len(blocks), 3)
+        self.assertTrue(all(block.startswith('upsert {') for block in blocks))
+
+    def test_to_rdf_output_format_dql_sink(self):
+        '''
+        Ensures when the output_format is dql and a sink is passed
+        then a block is sent for every dql_batch_size subjects
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path, config = self._write_students(directory)
+
+            with DgraphStub() as stub:
+                with DgraphHttpSink(stub.address, concurrency=2) as sink:
+                    to_rdf(path, config, 'student', output_format='dql', dql_batch_size=4, sink=sink)
+
+                self.assertEqual(stub.requests, 3)
+                self.assertEqual(sink.batches, 3)
+                self.assertIn(('student_1', 'school', '<school_2>'), stub.triples())
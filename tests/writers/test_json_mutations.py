@@ -0,0 +1,188 @@
+import os
+import gzip
+import json
+import tempfile
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.rdf import to_rdf
+from dgraphpandas.manifest import read_manifest
+from dgraphpandas.strategies.horizontal import horizontal_transform
+from dgraphpandas.writers.upserts import generate_upserts
+from dgraphpandas.writers.json_mutations import generate_json_mutations, generate_json_mutations_from_frames, write_json_mutations
+
+
+class JsonMutationsTests(unittest.TestCase):
+
+    def test_statements_null(self):
+        '''
+        Ensures when statements are null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            generate_json_mutations(None)
+
+    def test_unparsable_statement(self):
+        '''
+        Ensures when a statement cannot be parsed, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            generate_json_mutations(['not a statement'])
+
+    def test_generate_json_mutations(self):
+        '''
+        Ensures statements are grouped by subject with typed values and edges as lists
+        '''
+        statements = [
+            '<sloth> <dgraph.type> "Animal"^^<xs:string> .',
+            '<sloth> <legs> "4"^^<xs:int> .',
+            '<bear> <legs> "4.0"^^<xs:int> .',
+            '<sloth> <weight> "5.5"^^<xs:float> .',
+            '<sloth> <slow> "True"^^<xs:boolean> .',
+            '<sloth> <seen> "2021-01-01T00:00:00"^^<xs:dateTime> .',
+            '<sloth> <species> <mammal> .',
+            '<sloth> <country> <africa> .',
+            '<sloth> <country> <america> .',
+        ]
+
+        mutations = generate_json_mutations(statements)
+
+        self.assertEqual(mutations, [
+            {
+                'uid': '_:sloth',
+                'dgraph.type': 'Animal',
+                'legs': 4,
+                'weight': 5.5,
+                'slow': True,
+                'seen': '2021-01-01T00:00:00',
+                'species': [{'uid': '_:mammal'}],
+                'country': [{'uid': '_:africa'}, {'uid': '_:america'}]
+            },
+            {'uid': '_:bear', 'legs': 4}
+        ])
+        self.assertIs(type(mutations[0]['legs']), int)
+
+    @parameterized.expand([
+        ('not_a_number', '"abc"^^<xs:int>', 'abc'),
+        ('quoted', '"say "hi""^^<xs:string>', 'say "hi"'),
+        ('repeated', None, ['a', 'b']),
+    ])
+    def test_values(self, name, obj, expected):
+        '''
+        Ensures values which cannot be converted stay strings and repeated predicates become lists
+        '''
+        if obj is None:
+            statements = ['<s> <p> "a"^^<xs:string> .', '<s> <p> "b"^^<xs:string> .']
+        else:
+            statements = [f'<s> <p> {obj} .']
+
+        mutation, = generate_json_mutations(statements)
+
+        self.assertEqual(mutation['p'], expected)
+
+    @parameterized.expand([
+        ('intrinsic', None, pd.DataFrame(columns=['subject', 'predicate', 'object'])),
+        ('edges', pd.DataFrame(columns=['subject', 'predicate', 'object', 'type']), None),
+        ('intrinsic_type', pd.DataFrame(columns=['subject', 'predicate', 'object']), pd.DataFrame(columns=['subject', 'predicate', 'object'])),
+    ])
+    def test_from_frames_bad_parameters(self, name, intrinsic, edges):
+        '''
+        Ensures when the frames are null or missing columns, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            generate_json_mutations_from_frames(intrinsic, edges)
+
+    def test_from_frames_same_as_statements(self):
+        '''
+        Ensures the mutations built from the frames are the
+        same as those built from the statements of the frames
+        '''
+        frame = pd.DataFrame(data={
+            'id': [1, 2, 3, 4],
+            'age': [10, None, 12, 13],
+            'weight': [1.5, 2.0, None, 3.25],
+            'slow': [True, False, True, None],
+            'name': ['a', 'b "quoted"', None, 'd'],
+            'school_id': [1, 2, 1, None],
+        })
+        config = {'files': {'student': {
+            'subject_fields': ['id'],
+            'edge_fields': ['school_id'],
+            'type_overrides': {'age': 'Int64', 'weight': 'float64', 'slow': 'boolean', 'name': 'object'}}}}
+        intrinsic, edges = horizontal_transform(frame, config, 'student')
+
+        mutations = generate_json_mutations_from_frames(intrinsic, edges)
+        intrinsic_upserts, edges_upserts = generate_upserts(intrinsic.copy(), edges.copy())
+
+        self.assertEqual(mutations, generate_json_mutations(intrinsic_upserts + edges_upserts))
+        self.assertEqual(len(mutations), 4)
+
+    def test_write_json_mutations(self):
+        '''
+        Ensures mutations are written as one JSON array per batch
+        '''
+        mutations = [{'uid': f'_:{i}'} for i in range(5)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mutations.json.gz')
+            written = write_json_mutations(path, mutations, batch_size=2)
+
+            with gzip.open(path, 'rt') as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual([len(json.loads(line)) for line in lines], [2, 2, 1])
+        self.assertEqual(sum(len(line) + 1 for line in lines), written)
+
+    def test_to_rdf_output_format_json(self):
+        '''
+        Ensures when the output_format is json then a mutations export is
+        written in place of the intrinsic and edge exports
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'students.csv')
+            pd.DataFrame(data={'id': [1, 2], 'age': [10, 11], 'school_id': [1, 2]}).to_csv(path, index=False)
+            config = {'files': {'student': {
+                'subject_fields': ['id'],
+                'edge_fields': ['school_id'],
+                'type_overrides': {'age': 'int32'}}}}
+
+            to_rdf(path, config, 'student', directory, export_rdf=True, output_format='json')
+
+            self.assertEqual(sorted(name for name in os.listdir(directory) if name.endswith('.gz')), ['students_mutations.json.gz'])
+            with gzip.open(os.path.join(directory, 'students_mutations.json.gz'), 'rt') as f:
+                mutations = json.loads(f.read())
+
+        self.assertEqual(mutations[0], {
+            'uid': '_:student_1',
+            'age': 10,
+            'dgraph.type': 'student',
+            'school': [{'uid': '_:school_1'}]
+        })
+
+    def test_to_rdf_output_format_invalid(self):
+        '''
+        Ensures when the output_format is not known, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            to_rdf(pd.DataFrame({'id': [1]}), {'files': {'student': {'subject_fields': ['id']}}}, 'student', output_format='xml')
+
+    def test_to_rdf_output_format_json_shards(self):
+        '''
+        Ensures when the json exports are sharded then every subject is
+        in one shard and the manifest counts the statements of each
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            frame = pd.DataFrame(data={'id': range(20), 'age': range(20), 'school_id': [1, 2] * 10})
+            config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']}}}
+
+            intrinsic, edges = to_rdf(frame, config, 'student')
+            to_rdf(frame, config, 'student', directory, export_rdf=True, output_format='json', shards=3, manifest=True)
+
+            mutations = []
+            for shard in range(3):
+                with gzip.open(os.path.join(directory, f'shard_{shard}', 'student_mutations.json.gz'), 'rt') as f:
+                    mutations.extend(mutation for line in f.read().splitlines() for mutation in json.loads(line))
+            entries = read_manifest(directory)
+
+        self.assertEqual(sorted(mutation['uid'] for mutation in mutations), sorted(f'_:student_{i}' for i in range(20)))
+        self.assertEqual(sum(entry['statements'] for entry in entries), len(intrinsic) + len(edges))
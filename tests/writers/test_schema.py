@@ -1,7 +1,7 @@
 import pytest
 import pandas as pd
 from parameterized import parameterized
-from dgraphpandas.writers.schema import generate_schema
+from dgraphpandas.writers.schema import generate_schema, generate_schema_diff, _parse_schema, _classify_change
 from unittest.mock import patch, mock_open, Mock
 
 
@@ -143,3 +143,127 @@ def test_generate_schema_export_schema(mock_file_open: Mock):
     assert ('./schema.txt', 'w') == args
     assert not kwargs
     assert schema == expected_schema
+
+
+@patch('builtins.open', new_callable=mock_open)
+def test_generate_schema_two_phase(mock_file_open: Mock):
+    '''
+    Ensures when two_phase_schema is passed then indexes and reverse edges
+    are removed from the load schema (except the xid index and @upsert) and written
+    into a separate post load schema
+    '''
+    frame = pd.DataFrame(
+        columns=['column', 'type', 'table', 'options'],
+        data=[
+            ('title', 'string', 'title', '@index(exact, fulltext) @count'),
+            ('year', 'int', 'title', '@index'),
+            ('name', 'string', 'title', '@lang'),
+            ('age', 'int', 'customer', None),
+            ('director', '[uid]', 'title', '@reverse'),
+            ('xid', 'string', None, '@index(exact) @upsert'),
+        ]
+    )
+
+    schema = generate_schema(frame, export_schema=True, two_phase_schema=True)
+
+    assert schema == '\n'.join([
+        'title: string .',
+        'year: int .',
+        'name: string @lang .',
+        'age: int .',
+        'director: [uid] .',
+        'xid: string @index(exact) @upsert .',
+    ])
+
+    assert mock_file_open.call_args_list[0][0] == ('./schema.txt', 'w')
+    assert mock_file_open.call_args_list[1][0] == ('./schema_post_load.txt', 'w')
+    mock_file_open().write.assert_called_with('\n'.join([
+        'title: string @index(exact, fulltext) @count .',
+        'year: int @index .',
+        'director: [uid] @reverse .',
+    ]))
+
+
+@pytest.mark.parametrize('previous_type, previous_options, current_type, current_options, expected', [
+    ('string', '@index(exact)', 'string', '@index(exact)', 'none'),
+    ('string', '@index(exact, term)', 'string', '@index(term,exact)', 'none'),
+    ('string', None, 'string', '@index(exact)', 'index'),
+    ('string', '@index(exact)', 'string', '@index(exact, trigram)', 'index'),
+    ('uid', None, 'uid', '@reverse', 'index'),
+    ('string', '@index(exact) @count', 'string', '@index(exact)', 'drop'),
+    ('string', '@index(exact)', 'int', '@index(exact)', 'full'),
+    ('uid', None, '[uid]', None, 'full'),
+    ('string', None, 'string', '@lang', 'full'),
+])
+def test_classify_change(previous_type, previous_options, current_type, current_options, expected):
+    '''
+    Ensures schema changes are classified by the reindex they require
+    '''
+    assert _classify_change(previous_type, previous_options, current_type, current_options) == expected
+
+
+def test_parse_schema():
+    '''
+    Ensures predicates are parsed from generated and exported schemas
+    while types and internal predicates are skipped
+    '''
+    schema = '\n'.join([
+        'title: string @index(exact) .',
+        '<director>:[uid] @reverse .',
+        '<dgraph.type>:[string] @index(exact) .',
+        'type <title> {',
+        '  title',
+        '}',
+        'year: int .',
+    ])
+
+    frame = _parse_schema(schema)
+    assert frame.values.tolist() == [
+        ['title', 'string', '@index(exact)'],
+        ['director', '[uid]', '@reverse'],
+        ['year', 'int', None],
+    ]
+
+
+@pytest.mark.parametrize('frame, existing_schema', [
+    (None, 'schema.txt'),
+    (pd.DataFrame(columns=['column', 'type', 'options']), None),
+])
+def test_generate_schema_diff_null_parameters(frame, existing_schema):
+    '''
+    Ensures when parameters are null, an exception is raised
+    '''
+    with pytest.raises(ValueError):
+        generate_schema_diff(frame, existing_schema)
+
+
+def test_generate_schema_diff(tmp_path):
+    '''
+    Ensures only changed predicates are returned and exported
+    '''
+    existing_schema = tmp_path / 'existing.txt'
+    existing_schema.write_text('\n'.join([
+        'title: string @index(exact) .',
+        'year: string .',
+        'director: [uid] .',
+        'removed: string .',
+    ]))
+
+    frame = pd.DataFrame(
+        columns=['column', 'type', 'table', 'options'],
+        data=[
+            ('title', 'string', 'title', '@index(exact)'),
+            ('year', 'int', 'title', '@index(int)'),
+            ('director', '[uid]', 'title', '@reverse'),
+            ('rating', 'float', 'title', None),
+        ]
+    )
+
+    changed = generate_schema_diff(frame, str(existing_schema), export_schema=True, output_dir=str(tmp_path))
+
+    assert changed[['column', 'reindex', 'alter']].values.tolist() == [
+        ['year', 'full', 'year: int @index(int) .'],
+        ['director', 'index', 'director: [uid] @reverse .'],
+        ['rating', 'new', 'rating: float .'],
+    ]
+    assert (tmp_path / 'schema_diff.txt').read_text() == '\n'.join(changed['alter'])
@@ -0,0 +1,147 @@
+import os
+import gzip
+import tempfile
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.rdf import to_rdf
+from dgraphpandas.writers.sharding import even_shards, shard_of, shard_statements
+
+
+class ShardingTests(unittest.TestCase):
+
+    @parameterized.expand([
+        ('statements', None, 2),
+        ('shards_none', [], None),
+        ('shards_zero', [], 0),
+    ])
+    def test_bad_parameters(self, name, statements, shards):
+        '''
+        Ensures when parameters are null or invalid, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            shard_statements(statements, shards)
+
+    def test_empty(self):
+        '''
+        Ensures no statements gives an empty list for every shard
+        '''
+        self.assertEqual(shard_statements([], 3), [[], [], []])
+
+    def test_shard_of_stable(self):
+        '''
+        Ensures the same subject is always given the same shard
+        '''
+        subjects = [f'student_{i}' for i in range(50)]
+        first = shard_of(subjects, 4)
+        second = shard_of(list(reversed(subjects)), 4)
+
+        self.assertEqual(list(first), list(reversed(list(second))))
+        self.assertTrue(all(0 <= shard < 4 for shard in first))
+        self.assertGreater(len(set(first)), 1)
+
+    def test_shard_statements(self):
+        '''
+        Ensures every statement is kept, in order, in the shard of its subject
+        '''
+        statements = [f'<s_{i % 10}> <p_{i}> "{i}"^^<xs:int> .' for i in range(40)] + ['<s_1> <knows> <s_2> .']
+
+        shards = shard_statements(statements, 3)
+
+        self.assertEqual(len(shards), 3)
+        self.assertEqual(sorted(s for shard in shards for s in shard), sorted(statements))
+        for index, shard in enumerate(shards):
+            self.assertEqual(shard, [s for s in statements if s in shard])
+            for statement in shard:
+                self.assertEqual(shard_of([statement[1:statement.index('>')]], 3)[0], index)
+
+    def test_to_rdf_shards(self):
+        '''
+        Ensures when shards is set then exports are written for every shard
+        and a subject is in the same shard across files and chunks
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            config = {'files': {
+                'student': {'subject_fields': ['id'], 'edge_fields': ['school_id']},
+                'grade': {'subject_fields': ['id']}}}
+
+            students_path = os.path.join(directory, 'students.csv')
+            pd.DataFrame(data={'id': range(20), 'name': ['a'] * 20, 'school_id': [1, 2] * 10}).to_csv(students_path, index=False)
+            grades_path = os.path.join(directory, 'grades.csv')
+            pd.DataFrame(data={'id': range(20), 'grade': range(20)}).to_csv(grades_path, index=False)
+
+            output_dir = os.path.join(directory, 'output')
+            to_rdf(students_path, config, 'student', output_dir, export_rdf=True, shards=3, chunk_size=7)
+            to_rdf(grades_path, config, 'grade', output_dir, export_rdf=True, shards=3)
+
+            self.assertEqual(sorted(os.listdir(output_dir)), ['shard_0', 'shard_1', 'shard_2'])
+
+            subject_shards = {}
+            total = 0
+            for shard in range(3):
+                shard_dir = os.path.join(output_dir, f'shard_{shard}')
+                for name in os.listdir(shard_dir):
+                    with gzip.open(os.path.join(shard_dir, name), 'rt') as f:
+                        lines = [line for line in f.read().split('\n') if line]
+                    total += len(lines)
+                    for line in lines:
+                        subject = line.split(' ')[0]
+                        self.assertEqual(subject_shards.setdefault(subject, shard), shard)
+
+        self.assertEqual(total, 20 * 3 + 20 * 2)
+        self.assertEqual(len(subject_shards), 40)
+
+    @parameterized.expand([
+        ('even', ['a' * 10] * 12, 3, [4, 4, 4]),
+        ('uneven_sizes', ['a' * 30] + ['a'] * 30, 2, [1, 30]),
+        ('more_shards_than_statements', ['a'], 3, [0, 0, 1]),
+        ('empty', [], 2, [0, 0]),
+    ])
+    def test_even_shards(self, name, statements, shards, expected):
+        '''
+        Ensures statements are cut in order into shards of about the same bytes
+        '''
+        result = even_shards(statements, shards)
+
+        self.assertEqual([len(shard) for shard in result], expected)
+        self.assertEqual([s for shard in result for s in shard], statements)
+
+    def test_to_rdf_bulk(self):
+        '''
+        Ensures when the output_format is bulk then blank node statements are
+        cut into evenly sized rdf files and the schema is written with them
+        '''
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'students.csv')
+            pd.DataFrame(data={'id': range(30), 'age': range(30), 'school_id': [1, 2, 3] * 10}).to_csv(path, index=False)
+            config = {'files': {'student': {'subject_fields': ['id'], 'edge_fields': ['school_id'], 'type_overrides': {'age': 'int32'}}}}
+            output_dir = os.path.join(directory, 'output')
+
+            to_rdf(path, config, 'student', output_dir, export_rdf=True, output_format='bulk', shards=3)
+
+            self.assertEqual(sorted(os.listdir(output_dir)), [
+                'students_bulk.schema', 'students_bulk_0.rdf.gz', 'students_bulk_1.rdf.gz', 'students_bulk_2.rdf.gz'])
+
+            lines = []
+            for shard in range(3):
+                with gzip.open(os.path.join(output_dir, f'students_bulk_{shard}.rdf.gz'), 'rt') as f:
+                    lines.append(f.read().split('\n'))
+            with open(os.path.join(output_dir, 'students_bulk.schema')) as f:
+                schema = f.read()
+
+        self.assertEqual(sum(len(shard) for shard in lines), 90)
+        sizes = [len('\n'.join(shard)) for shard in lines]
+        self.assertLess(max(sizes) - min(sizes), 0.1 * max(sizes))
+        self.assertIn('_:student_1 <school> _:school_2 .', [line for shard in lines for line in shard])
+        self.assertIn('age: int', schema)
+        self.assertIn('xid: string', schema)
+
+    def test_to_rdf_bulk_sink(self):
+        '''
+        Ensures when the output_format is bulk and upserts are sent to Dgraph, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            to_rdf(pd.DataFrame({'id': [1]}), {'files': {'student': {'subject_fields': ['id']}}}, 'student',
+                   output_format='bulk', dgraph_address='http://localhost:1')
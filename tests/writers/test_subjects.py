@@ -0,0 +1,59 @@
+import unittest
+
+import pandas as pd
+from parameterized import parameterized
+
+from dgraphpandas.writers.batching import subject_worker
+from dgraphpandas.writers.subjects import shard_of, statement_subject, statement_subjects, worker_of
+
+
+class SubjectsTests(unittest.TestCase):
+
+    @parameterized.expand([
+        ('intrinsic', '<student_1> <name> "a > b"^^<xs:string> .', 'student_1'),
+        ('edge', '<student_1> <school> <school_1> .', 'student_1'),
+        ('delete', '<student_1> <name> * .', 'student_1'),
+    ])
+    def test_statement_subject(self, name, statement, expected):
+        '''
+        Ensures the subject xid is taken from the statement
+        '''
+        self.assertEqual(statement_subject(statement), expected)
+        self.assertEqual(statement_subjects([statement]).tolist(), [expected])
+
+    def test_statement_subjects_not_statements(self):
+        '''
+        Ensures lines which are not statements have no subject
+        '''
+        subjects = statement_subjects(pd.Series(['', '<student_1> <name> "a"^^<xs:string> .'], dtype=object))
+        self.assertTrue(pd.isna(subjects[0]))
+        self.assertEqual(subjects[1], 'student_1')
+
+    def test_statement_subjects_null(self):
+        '''
+        Ensures when statements is null, an exception is raised
+        '''
+        with self.assertRaises(ValueError):
+            statement_subjects(None)
+
+    def test_subject_worker_same_as_worker_of(self):
+        '''
+        Ensures subject batch workers are routed by worker_of
+        '''
+        subjects = [f'student_{i}' for i in range(50)]
+        self.assertEqual([subject_worker(subject, 4) for subject in subjects], worker_of(subjects, 4).tolist())
+
+    @parameterized.expand([
+        ('fewer_workers', 4, 2),
+        ('same', 4, 4),
+    ])
+    def test_worker_of_independent_of_shard(self, name, shards, workers):
+        '''
+        Ensures the subjects of every shard are spread over every worker
+        '''
+        subjects = [f'student_{i}' for i in range(2000)]
+        subject_shards = shard_of(subjects, shards)
+        subject_workers = worker_of(subjects, workers)
+
+        for shard in range(shards):
+            self.assertEqual(sorted(set(subject_workers[subject_shards == shard].tolist())), list(range(workers)))
@@ -235,3 +235,14 @@ class UpsertTests(unittest.TestCase):
         dql_intrinsic, dql_edges = generate_upserts(intrinsic, edges)
         all_dql = dql_intrinsic + dql_edges
         self.assertEqual(all_dql, expected_output)
+
+    def test_generate_upsert_blank_nodes(self):
+        '''
+        Ensures when blank_nodes is set, subjects and objects are written as blank nodes
+        '''
+        intrinsic = pd.DataFrame(data={'subject': ['customer_1'], 'predicate': ['age'], 'object': [23], 'type': ['<xs:int>']})
+        edges = pd.DataFrame(data={'subject': ['customer_1'], 'predicate': ['location'], 'object': ['loc_32'], 'type': [None]})
+
+        dql_intrinsic, dql_edges = generate_upserts(intrinsic, edges, blank_nodes=True)
+
+        self.assertEqual(dql_intrinsic + dql_edges, ['_:customer_1 <age> "23"^^<xs:int> .', '_:customer_1 <location> _:loc_32 .'])